@@ -7,11 +7,20 @@ PROJECT_REPO_ROOT="$HOME/development/my-repos/trello-backup/"
 
 # --- Functions ---
 
-# Function to find the most recently modified directory starting with "session-"
+# Function to find the latest session dir.
+# Reads the latest backup of each board written by trello-backup, falls back to the most recently modified "session-" dir.
 find_latest_session_dir() {
     local base_path="$HOME/trello-backup-output"
-    # Find the latest session dir, handling case where none is found
-    LATEST_SESSION=$(find "$base_path" -maxdepth 1 -type d -name "session-*" -exec stat -f "%m %N" {} \; | sort -nr | head -n 1 | awk '{print $NF}' | xargs basename)
+    local latest_file="$base_path/backup-index-latest.json"
+    local LATEST_SESSION=""
+
+    if [[ -s "$latest_file" ]]; then
+        LATEST_SESSION=$(python3 -c 'import json, sys; boards = json.load(open(sys.argv[1]))["boards"].values(); print(max(boards, key=lambda e: e["created"])["session"] if boards else "")' "$latest_file")
+    fi
+    if [[ -z "$LATEST_SESSION" ]]; then
+        # Find the latest session dir, handling case where none is found
+        LATEST_SESSION=$(find "$base_path" -maxdepth 1 -type d -name "session-*" -exec stat -f "%m %N" {} \; | sort -nr | head -n 1 | awk '{print $NF}' | xargs basename)
+    fi
 
     if [[ -z "$LATEST_SESSION" ]]; then
         echo "Error: No 'session-' directory found in $base_path." >&2
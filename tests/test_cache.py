@@ -0,0 +1,203 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from trello_backup.trello.api import NetworkStatusService, TrelloRepository, OfflineTrelloApi
+from trello_backup.trello.cache import ParsedBoardCache, BoardDirectoryCache
+from trello_backup.trello.filter import TrelloFilters, ListFilter, CardFilters
+from trello_backup.trello.model import TrelloLists, TrelloChecklists, TrelloCards
+from trello_backup.trello.service import TrelloOperations
+
+
+class Object(object):
+    pass
+
+
+def _board_json():
+    lists = [{"id": "l1", "name": "To Do", "closed": False, "idBoard": "board_1", "pos": 1},
+             {"id": "l2", "name": "Done", "closed": True, "idBoard": "board_1", "pos": 2}]
+    cards = [{"id": f"c{idx}", "name": f"Card {idx}", "shortUrl": f"https://trello.com/c/c{idx}",
+              "idList": "l1" if idx < 3 else "l2", "desc": "Description" if idx % 2 else "", "labels": [],
+              "idChecklists": ["cl1"] if idx == 0 else [], "closed": idx == 2, "due": None} for idx in range(5)]
+    checklists = [{"id": "cl1", "name": "Steps", "idBoard": "board_1", "idCard": "c0", "pos": 1,
+                   "checkItems": [{"id": "i1", "name": "https://example.com", "state": "complete", "pos": 1}]}]
+    return {"id": "board_1", "name": "Board", "lists": lists, "cards": cards, "checklists": checklists}
+
+
+class TestParsedBoardCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ParsedBoardCache(self.tmp_dir.name)
+        board_json = _board_json()
+        self.trello_lists = TrelloLists(board_json)
+        _ = TrelloCards(board_json, self.trello_lists, TrelloChecklists(board_json)).all
+        self.trello_lists.get_by_id("l1").cards[0].checklists[0].items[0].url_title = "Example"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_roundtrip(self):
+        self.cache.save("board_1", "fp1", self.trello_lists.get(), {"l1", "l2"})
+        with self.cache.load("board_1", "fp1") as cached_board:
+            self.assertEqual(["l1", "l2"], [l.id for l in cached_board.lists])
+            self.assertEqual([], cached_board.lists[0].cards)
+            trello_list = cached_board.lists[0]
+            cards = cached_board.load_cards(trello_list)
+        self.assertEqual(["c0", "c1", "c2"], [c.id for c in cards])
+        self.assertTrue(all(c.list is trello_list for c in cards))
+        self.assertEqual("Example", cards[0].checklists[0].items[0].url_title)
+
+    def test_lists_are_added_to_the_cache(self):
+        self.cache.save("board_1", "fp1", self.trello_lists.get(), {"l2"})
+        with self.cache.load("board_1", "fp1") as cached_board:
+            self.assertEqual(["l1", "l2"], [l.id for l in cached_board.lists])
+            self.assertEqual([False, True], [cached_board.has_cards(l) for l in cached_board.lists])
+            self.cache.save("board_1", "fp1", self.trello_lists.get(), {"l1"}, previous=cached_board)
+        with self.cache.load("board_1", "fp1") as cached_board:
+            self.assertEqual([["c0", "c1", "c2"], ["c3", "c4"]],
+                             [[c.id for c in cached_board.load_cards(l)] for l in cached_board.lists])
+
+    def test_stale_or_invalid_cache_is_not_loaded(self):
+        self.assertIsNone(self.cache.load("board_1", "fp1"))
+        self.cache.save("board_1", "fp1", self.trello_lists.get(), {"l1", "l2"})
+        self.assertIsNone(self.cache.load("board_1", "fp2"))
+        with open(os.path.join(self.tmp_dir.name, "board_1.bin"), "wb") as f:
+            f.write(b"garbage")
+        self.assertIsNone(self.cache.load("board_1", "fp1"))
+
+
+class TestTrelloOperationsWithParsedBoardCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.api = Mock()
+        self.api.get_board_id.return_value = "board_1"
+        self.api.get_board_details.side_effect = lambda board_id, profile=None: _board_json()
+        self.api.get_board_fingerprint.return_value = "activity_1"
+        self.title_service = Mock()
+        ctx = Object()
+        ctx.offline = False
+        trello_repository = TrelloRepository(self.api, OfflineTrelloApi(), NetworkStatusService(ctx))
+        self.trello_ops = TrelloOperations(trello_repository, Mock(), self.title_service, Mock(),
+                                           parsed_board_cache=ParsedBoardCache(self.tmp_dir.name))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _card_ids(self, filters: TrelloFilters):
+        board, trello_lists = self.trello_ops.get_lists_and_cards("Board", filters)
+        return {l.id: [c.id for c in l.cards] for l in board.lists}
+
+    def test_board_is_parsed_once(self):
+        self.assertEqual({"l1": ["c0", "c1", "c2"], "l2": ["c3", "c4"]}, self._card_ids(TrelloFilters.create_default()))
+        self.assertEqual(2, self.title_service.process_list_checklist_titles.call_count)
+
+        # A new operations object reads the cache without downloading the board
+        self.trello_ops._board_id_to_board_json.clear()
+        self.api.get_board_details.reset_mock()
+        with unittest.mock.patch('trello_backup.trello.service.TrelloCards') as mock_trello_cards:
+            self.assertEqual({"l1": ["c0", "c1"]},
+                             self._card_ids(TrelloFilters([], ListFilter.OPEN, CardFilters.OPEN)))
+            self.assertEqual({"l1": ["c1"], "l2": ["c3"]},
+                             self._card_ids(TrelloFilters([], ListFilter.ALL, CardFilters.ONLY_DESCRIPTION)))
+        mock_trello_cards.assert_not_called()
+        self.api.get_board_details.assert_not_called()
+        self.assertEqual(2, self.title_service.process_list_checklist_titles.call_count)
+
+    def test_only_selected_lists_are_parsed(self):
+        self.assertEqual({"l1": ["c0", "c1"]}, self._card_ids(TrelloFilters([], ListFilter.OPEN, CardFilters.OPEN)))
+        resolved = [c.args[0].id for c in self.title_service.process_list_checklist_titles.call_args_list]
+        self.assertEqual(["l1"], resolved)
+
+        # The other list is parsed and added to the cache when it is printed
+        self.assertEqual({"l2": ["c3", "c4"]}, self._card_ids(TrelloFilters(["Done"], ListFilter.ALL, CardFilters.ALL)))
+        resolved = [c.args[0].id for c in self.title_service.process_list_checklist_titles.call_args_list]
+        self.assertEqual(["l1", "l2"], resolved)
+        self.api.get_board_details.reset_mock()
+        self.trello_ops._board_id_to_board_json.clear()
+        self.assertEqual({"l1": ["c0", "c1", "c2"], "l2": ["c3", "c4"]}, self._card_ids(TrelloFilters.create_default()))
+        self.api.get_board_details.assert_not_called()
+
+    def test_changed_board_is_parsed_again(self):
+        self._card_ids(TrelloFilters.create_default())
+        self.api.get_board_fingerprint.return_value = "activity_2"
+        self.trello_ops._board_id_to_board_json.clear()
+        self._card_ids(TrelloFilters.create_default())
+        self.assertEqual(2, self.api.get_board_details.call_count)
+
+    def test_without_fingerprint_the_cache_is_not_used(self):
+        self.api.get_board_fingerprint.return_value = None
+        self.assertEqual({"l1": ["c0", "c1", "c2"], "l2": ["c3", "c4"]}, self._card_ids(TrelloFilters.create_default()))
+        self.assertEqual([], os.listdir(self.tmp_dir.name))
+
+
+class TestBoardDirectoryCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, "board-directory.json")
+        self.boards = {"Board": "board_1", "Other board": "board_2"}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_persisted_until_expired(self):
+        self.assertIsNone(BoardDirectoryCache(self.file_path).get_all())
+        BoardDirectoryCache(self.file_path).put_all(self.boards)
+
+        cache = BoardDirectoryCache(self.file_path, ttl_seconds=60)
+        self.assertEqual(self.boards, dict(cache.get_all()))
+        with self.assertRaises(TypeError):
+            cache.get_all()["New board"] = "board_3"
+        self.assertEqual("board_2", cache.get_id("Other board"))
+        self.assertIsNone(cache.get_id("Unknown"))
+        with patch('trello_backup.trello.cache.time.time', return_value=cache._updated_at + 61):
+            self.assertIsNone(cache.get_all())
+            self.assertIsNone(cache.get_id("Board"))
+
+    def test_invalid_file_is_ignored(self):
+        with open(self.file_path, "w") as f:
+            f.write("{not json")
+        self.assertIsNone(BoardDirectoryCache(self.file_path).get_all())
+
+
+class TestTrelloOperationsWithBoardDirectoryCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, "board-directory.json")
+        self.api = Mock()
+        self.api.list_boards.return_value = {"Board": "board_1"}
+        ctx = Object()
+        ctx.offline = False
+        self.trello_repository = TrelloRepository(self.api, OfflineTrelloApi(), NetworkStatusService(ctx))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _create_trello_ops(self):
+        return TrelloOperations(self.trello_repository, Mock(), Mock(), Mock(),
+                                board_directory_cache=BoardDirectoryCache(self.file_path))
+
+    def test_board_ids_are_reused_between_runs(self):
+        self.assertEqual("board_1", self._create_trello_ops()._get_board_id("Board"))
+        self.assertEqual("board_1", self._create_trello_ops()._get_board_id("Board"))
+        self.api.list_boards.assert_called_once()
+        self.api.get_board_id.assert_not_called()
+
+    def test_listed_boards_are_cached(self):
+        self._create_trello_ops().get_board_names_and_ids()
+        self.assertEqual("board_1", self._create_trello_ops()._get_board_id("Board"))
+        self.api.list_boards.assert_called_once()
+
+    def test_miss_refreshes_the_directory(self):
+        trello_ops = self._create_trello_ops()
+        trello_ops._get_board_id("Board")
+        self.api.list_boards.return_value = {"Board": "board_1", "New board": "board_2"}
+        self.assertEqual("board_2", trello_ops._get_board_id("New board"))
+        self.assertEqual(2, self.api.list_boards.call_count)
+        with self.assertRaises(KeyError):
+            trello_ops._get_board_id("Unknown")
+        self.assertEqual(3, self.api.list_boards.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch, Mock
+
+from click.testing import CliRunner
+
+from trello_backup.cli.cli import cli, register_commands
+from trello_backup.constants import LATEST_BACKUP
+
+
+class TestCliOptions(unittest.TestCase):
+    def setUp(self):
+        register_commands()
+        self.handler = Mock()
+        self.from_backup_values = []
+        self.parsed_board_cache_values = []
+        patchers = [patch('trello_backup.cli.cli.setup_dirs'),
+                    patch('trello_backup.cli.commands.print.get_handler_and_setup_ctx', side_effect=self._get_handler)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _get_handler(self, ctx):
+        self.from_backup_values.append(ctx.from_backup)
+        self.parsed_board_cache_values.append(ctx.parsed_board_cache)
+        return self.handler
+
+    def _invoke(self, args):
+        result = CliRunner().invoke(cli, args)
+        self.assertEqual(0, result.exit_code, result.output)
+        self.handler.print_cards.assert_called_once_with("X", [], query=None, split_fetch=False)
+
+    def test_from_backup_before_command(self):
+        self._invoke(["--from-backup", "print", "board", "X"])
+        self.assertEqual([LATEST_BACKUP], self.from_backup_values)
+        # Backed up boards are always read from the parsed board cache
+        self.assertEqual([True], self.parsed_board_cache_values)
+
+    def test_backup_session(self):
+        self._invoke(["--backup-session", "session-1", "print", "board", "X"])
+        self.assertEqual(["session-1"], self.from_backup_values)
+        self.assertEqual([True], self.parsed_board_cache_values)
+
+    def test_without_backup(self):
+        self._invoke(["print", "board", "X"])
+        self.assertEqual([None], self.from_backup_values)
+        self.assertEqual([False], self.parsed_board_cache_values)
+
+
+if __name__ == '__main__':
+    unittest.main()
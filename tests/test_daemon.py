@@ -0,0 +1,96 @@
+import io
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import click
+
+from trello_backup.cli.cli import main as cli_main, cli
+from trello_backup.daemon import DaemonClient, TrelloDaemon, GLOBAL_OPTIONS_WITH_VALUE
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp_dir.name, "daemon.sock")
+        self.client = DaemonClient(self.socket_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_should_forward(self):
+        self.assertTrue(DaemonClient.should_forward(["print", "board", "Cloudera"]))
+        self.assertTrue(DaemonClient.should_forward(["--from-backup", "print", "board", "Cloudera"]))
+        self.assertTrue(DaemonClient.should_forward(["search", "hadoop"]))
+        self.assertFalse(DaemonClient.should_forward(["cleanup", "board", "Cloudera"]))
+        self.assertFalse(DaemonClient.should_forward(["backup", "board", "print"]))
+        self.assertFalse(DaemonClient.should_forward(["daemon", "start"]))
+        self.assertFalse(DaemonClient.should_forward([]))
+        # Values of options are not commands
+        self.assertTrue(DaemonClient.should_forward(["--backup-session", "session-1", "print", "board", "X"]))
+        self.assertFalse(DaemonClient.should_forward(["--backup-session", "print", "backup", "board", "X"]))
+
+    def test_global_options_with_value(self):
+        options = [opt for param in cli.params if isinstance(param, click.Option) and not param.is_flag
+                   for opt in param.opts if opt.startswith("--")]
+        self.assertEqual(sorted(options), sorted(GLOBAL_OPTIONS_WITH_VALUE))
+
+    @patch('trello_backup.cli.cli.cli')
+    @patch.object(DaemonClient, 'run', return_value=(3, "forwarded output\n"))
+    def test_cli_main_forwards_to_daemon(self, mock_run, mock_cli):
+        args = ["print", "board", "Cloudera"]
+        with patch.object(sys, 'argv', ["cli.py"] + args), self.assertRaises(SystemExit) as exit_ctx, \
+                patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            cli_main()
+        self.assertEqual(3, exit_ctx.exception.code)
+        self.assertEqual("forwarded output\n", stdout.getvalue())
+        mock_run.assert_called_once_with(args)
+        mock_cli.assert_not_called()
+
+    def test_client_without_daemon(self):
+        self.assertFalse(self.client.is_running())
+        self.assertIsNone(self.client.run(["print", "board", "Cloudera"]))
+        self.assertFalse(self.client.stop())
+
+    @patch.object(TrelloDaemon, 'run_command', side_effect=lambda args, cwd=None: (0, " ".join(args + [cwd])))
+    def test_commands_are_forwarded(self, _):
+        daemon = TrelloDaemon(self.socket_path)
+        thread = threading.Thread(target=daemon.serve)
+        thread.start()
+        try:
+            for _ in range(100):
+                if self.client.is_running():
+                    break
+                threading.Event().wait(0.05)
+            # The working directory of the client is sent with the command
+            self.assertEqual((0, f"print board Cloudera {os.getcwd()}"), self.client.run(["print", "board", "Cloudera"]))
+            self.assertEqual((0, f"search hadoop {os.getcwd()}"), self.client.run(["search", "hadoop"]))
+        finally:
+            self.client.stop()
+            thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_run_command_captures_output(self):
+        exit_code, output = TrelloDaemon.run_command(["usage"])
+        self.assertEqual(0, exit_code)
+        self.assertIn("Trello CLI", output)
+
+        exit_code, output = TrelloDaemon.run_command(["no-such-command"])
+        self.assertEqual(2, exit_code)
+        self.assertIn("No such command", output)
+
+    def test_run_command_in_client_working_dir(self):
+        cwd = os.getcwd()
+        command_cwds = []
+        with patch('trello_backup.cli.cli.cli.main', side_effect=lambda **kwargs: command_cwds.append(os.getcwd())):
+            TrelloDaemon.run_command(["usage"], cwd=self.tmp_dir.name)
+        self.assertEqual([os.path.realpath(self.tmp_dir.name)], [os.path.realpath(d) for d in command_cwds])
+        self.assertEqual(cwd, os.getcwd())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import copy
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from trello_backup.cmd_handler import MainCommandHandler
+from trello_backup.snapshot import SnapshotStore
+from trello_backup.trello.diff import BoardDiffer
+
+
+class TestBoardDiffer(unittest.TestCase):
+    def setUp(self):
+        self.old_json = {
+            "id": "board_1",
+            "lists": [self._list("l1", "To Do", 1), self._list("l2", "Done", 2)],
+            "cards": [self._card("c1", "Card 1", "l1", checklists=["cl1"]),
+                      self._card("c2", "Card 2", "l1"),
+                      self._card("c3", "Card 3", "l2")],
+            "checklists": [{"id": "cl1", "name": "Steps", "idBoard": "board_1", "idCard": "c1", "pos": 1,
+                            "checkItems": [{"id": "i1", "name": "Step 1", "state": "incomplete", "pos": 1},
+                                           {"id": "i2", "name": "Step 2", "state": "complete", "pos": 2}]}],
+        }
+        self.new_json = copy.deepcopy(self.old_json)
+
+    @staticmethod
+    def _list(list_id, name, pos):
+        return {"id": list_id, "name": name, "closed": False, "idBoard": "board_1", "pos": pos}
+
+    @staticmethod
+    def _card(card_id, name, list_id, checklists=None):
+        return {"id": card_id, "name": name, "shortUrl": f"https://trello.com/c/{card_id}", "idList": list_id,
+                "desc": "", "labels": [], "idChecklists": checklists if checklists else [], "closed": False, "due": None}
+
+    def test_no_changes(self):
+        self.assertTrue(BoardDiffer.diff(self.old_json, self.new_json).is_empty)
+
+    def test_structural_changes(self):
+        cards = {c["id"]: c for c in self.new_json["cards"]}
+        cards["c1"]["idList"] = "l2"
+        cards["c1"]["desc"] = "New description"
+        cards["c2"]["name"] = "Card 2 renamed"
+        cards["c2"]["closed"] = True
+        self.new_json["cards"].remove(cards["c3"])
+        self.new_json["cards"].append(self._card("c4", "Card 4", "l1"))
+        items = self.new_json["checklists"][0]["checkItems"]
+        items[0]["state"] = "complete"
+        items[1]["state"] = "incomplete"
+
+        diff = BoardDiffer.diff(self.old_json, self.new_json)
+        self.assertEqual(["c4"], [c.id for c in diff.added])
+        self.assertEqual(["c3"], [c.id for c in diff.removed])
+        self.assertEqual([("c1", "To Do", "Done")], [(m.card.id, m.from_list, m.to_list) for m in diff.moved])
+        self.assertEqual([("Card 2", "Card 2 renamed")], [(e.old.name, e.new.name) for e in diff.renamed])
+        self.assertEqual(["c1"], [e.new.id for e in diff.description_edited])
+        self.assertEqual(["c2"], [c.id for c in diff.closed])
+        self.assertEqual([], diff.reopened)
+        self.assertEqual([("c1", "Steps", "Step 1")], [(ch.card.id, ch.checklist, ch.item.value) for ch in diff.items_checked])
+        self.assertEqual(["Step 2"], [ch.item.value for ch in diff.items_unchecked])
+
+
+    @patch('trello_backup.cmd_handler.BoardDiffPrinter')
+    def test_board_json_file_is_compared_to_latest_snapshot(self, mock_printer):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            handler = MainCommandHandler(MagicMock(), MagicMock(), MagicMock(), MagicMock())
+            handler._snapshot_store = SnapshotStore(tmp_dir)
+            handler.snapshot_store.put_board("session-1", "Board", self.old_json)
+            self.new_json["cards"].append(self._card("c4", "Card 4", "l1"))
+            board_json_file = os.path.join(tmp_dir, "board.json")
+            with open(board_json_file, "w") as f:
+                json.dump(self.new_json, f)
+
+            diff = handler.diff_board("Board", to_source=board_json_file)
+        self.assertEqual(["c4"], [c.id for c in diff.added])
+        mock_printer.print_plain_text.assert_called_once_with("Board", "session-1", board_json_file, diff)
+
+
+if __name__ == '__main__':
+    unittest.main()
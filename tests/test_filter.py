@@ -1 +1,52 @@
-# TODO ASAP Filtering add test class
\ No newline at end of file
+import unittest
+
+from tests.test_utils import TestUtils
+from trello_backup.trello.filter import CardFilterer, CardFilters, TrelloFilters, ListFilter
+from trello_backup.trello.model import TrelloCard, TrelloList
+
+tu = TestUtils
+
+
+class TestCardFilterer(unittest.TestCase):
+    def setUp(self):
+        self.trello_list = TrelloList(closed=False, id='101', name='To Do', board_id='board_1', pos=11111)
+        self.open_card = self._create_card('1', closed=False)
+        self.closed_card = self._create_card('2', closed=True)
+        self.closed_card_with_desc = self._create_card('3', closed=True, description='desc')
+        self.trello_list.cards = [self.open_card, self.closed_card, self.closed_card_with_desc]
+
+    def _create_card(self, card_id, closed, description=''):
+        return TrelloCard(id=card_id, name=f'Card {card_id}', short_url=tu.generate_short_url(), list=self.trello_list,
+                          description=description, attachments=[], checklists=[], labels=[], closed=closed,
+                          comments=[], due_date="", activities=[])
+
+    def test_all_filter_compiles_to_none(self):
+        self.assertIsNone(CardFilterer.compile(CardFilters.ALL))
+        self.assertIsNone(CardFilterer.compile_card_json_predicate(CardFilters.ALL))
+        self.assertIs(self.trello_list.cards, CardFilterer.filter_cards(self.trello_list, CardFilters.ALL))
+
+    def test_compiled_predicates_are_cached(self):
+        self.assertIs(CardFilterer.compile(CardFilters.OPEN), CardFilterer.compile(CardFilters.OPEN))
+        filters = TrelloFilters([], ListFilter.OPEN, CardFilters.OPEN)
+        self.assertIs(CardFilterer.compile(CardFilters.OPEN), filters.card_predicate)
+
+    def test_open_filter(self):
+        self.assertEqual([self.open_card], CardFilterer.filter_cards(self.trello_list, CardFilters.OPEN))
+
+    def test_only_description_filter(self):
+        self.assertEqual([self.closed_card_with_desc],
+                         CardFilterer.filter_cards(self.trello_list, CardFilters.ONLY_DESCRIPTION))
+
+    def test_json_predicate_matches_model_predicate(self):
+        card_json = {"closed": True, "desc": "desc", "idChecklists": [], "attachments": []}
+        json_predicate = CardFilterer.compile_card_json_predicate(CardFilters.DESC_AND_CHECKLIST)
+        self.assertTrue(json_predicate(card_json))
+        self.assertTrue(CardFilterer.compile(CardFilters.DESC_AND_CHECKLIST)(self.closed_card_with_desc))
+
+        card_json["desc"] = ""
+        self.assertFalse(json_predicate(card_json))
+        self.assertFalse(CardFilterer.compile(CardFilters.DESC_AND_CHECKLIST)(self.closed_card))
+
+
+if __name__ == '__main__':
+    unittest.main()
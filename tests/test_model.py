@@ -3,7 +3,10 @@ from typing import List
 from unittest.mock import MagicMock, patch
 
 from tests.test_utils import TestUtils
-from trello_backup.trello.model import TrelloList, TrelloCard, TrelloLists, TrelloChecklistItem, TrelloBoard
+from trello_backup.trello.filter import ListFilter
+from trello_backup.trello.model import TrelloList, TrelloCard, TrelloLists, TrelloChecklistItem, TrelloBoard, \
+    TrelloCards, TrelloChecklists
+from trello_backup.trello.parser import TrelloObjectParser
 
 
 # Mocking the external dependency 'trello_backup.trello.parser'
@@ -157,6 +160,19 @@ class TestTrelloLists(unittest.TestCase):
         # Check that the _filtered flag is set in the new instance (implicitly tested by trello_lists_param usage)
         self.assertTrue(filtered_lists._filtered)
 
+    @patch('trello_backup.trello.parser.TrelloObjectParser')
+    def test_filtered_views_do_not_reparse(self, mock_parser_cls):
+        open_lists = self.trello_lists.filter_by_list_filter(ListFilter.OPEN)
+        named_lists = open_lists.filter_by_list_names(['In Progress', 'To Do'])
+
+        mock_parser_cls.parse_trello_lists.assert_not_called()
+        # Views share the same TrelloList objects and keep the position ordering
+        self.assertEqual((self.list_a, self.list_b), open_lists.get())
+        self.assertEqual((self.list_a, self.list_b), named_lists.get())
+        self.assertIs(self.list_a, named_lists.get_by_id('101'))
+        self.assertTrue(open_lists._filtered)
+        self.assertIs(self.trello_lists, self.trello_lists.filter_by_list_filter(ListFilter.ALL))
+
     def test_filter_list_not_found(self):
         filter_names = ['To Do', 'Non-Existent List', 'Another Missing']
 
@@ -181,6 +197,35 @@ class TestTrelloChecklistItem(unittest.TestCase):
         # Should return just the value
         self.assertEqual(item.get_html(), 'Do task')
 
+class TestTrelloCards(unittest.TestCase):
+    """Tests for the lazy materialization of TrelloCards."""
+
+    def setUp(self):
+        self.board_json = {
+            "lists": [{"id": "l1", "name": "To Do", "closed": False, "idBoard": "b1", "pos": 1},
+                      {"id": "l2", "name": "Done", "closed": False, "idBoard": "b1", "pos": 2}],
+            "cards": [{"id": card_id, "name": card_id, "shortUrl": f"https://trello.com/c/{card_id}", "idList": list_id,
+                       "desc": "", "labels": [], "idChecklists": [], "closed": False, "due": None}
+                      for card_id, list_id in (("c1", "l2"), ("c2", "l1"), ("c3", "l2"))],
+            "checklists": [],
+        }
+        self.trello_lists = TrelloLists(self.board_json)
+        self.trello_cards = TrelloCards(self.board_json, self.trello_lists, TrelloChecklists(self.board_json))
+
+    @patch('trello_backup.trello.parser.TrelloObjectParser.parse_trello_card', wraps=TrelloObjectParser.parse_trello_card)
+    def test_cards_are_materialized_per_list(self, mock_parse_card):
+        mock_parse_card.assert_not_called()
+        done = self.trello_lists.get_by_id("l2")
+        self.assertEqual(["c1", "c3"], [c.id for c in self.trello_cards.get_cards(done)])
+        self.assertEqual(2, mock_parse_card.call_count)
+        self.assertEqual([], self.trello_lists.get_by_id("l1").cards)
+
+        # Already materialized cards are reused and not added to the list again
+        self.assertEqual(["c1", "c2", "c3"], [c.id for c in self.trello_cards.all])
+        self.assertEqual(3, mock_parse_card.call_count)
+        self.assertEqual(["c1", "c3"], [c.id for c in done.cards])
+
+
 class TestTrelloBoard(unittest.TestCase):
     """Tests for the TrelloBoard __post_init__ logic."""
 
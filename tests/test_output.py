@@ -0,0 +1,266 @@
+import gzip
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+from tests.test_utils import TestUtils
+from trello_backup.display.output import TrelloBoardHtmlFileGenerator, TrelloCardHtmlGeneratorMode, OutputHandler, \
+    TrelloDataConverter, MarkdownFormatter, BackupReport, OutputType, OutputWriterPool, _run_output_writer
+from trello_backup.exception import TrelloException
+from trello_backup.session import SessionManifest
+from trello_backup.trello.filter import TrelloFilters
+from trello_backup.trello.model import TrelloList, TrelloCard, TrelloBoard, TrelloChecklist, TrelloChecklistItem, \
+    TrelloComment
+
+tu = TestUtils
+
+
+class OutputTestBase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.trello_list = TrelloList(closed=False, id='101', name='To Do', board_id='board_1', pos=1)
+        checklist = TrelloChecklist(id='cl1', name='Steps', board_id='board_1', card_id='c1', pos=1,
+                                    items=[TrelloChecklistItem(id='i1', value='Step 1', checked=True, pos=1),
+                                           TrelloChecklistItem(id='i2', value='http://example.com', checked=False,
+                                                               pos=2, url='http://example.com', url_title='Example')])
+        for idx in range(3):
+            card = TrelloCard(id=f'c{idx}', name=f'Card {idx}', short_url=tu.generate_short_url(),
+                              list=self.trello_list, description=f'Description {idx}', attachments=[],
+                              checklists=[checklist], labels=['Bug'], closed=False, comments=[],
+                              due_date=None, activities=[])
+            self.trello_list.cards.append(card)
+        self.board = TrelloBoard(id='board_1', json={"id": "board_1"}, name='Test Board', lists=[self.trello_list])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _read(self, file_name):
+        with open(os.path.join(self.tmp_dir.name, file_name)) as f:
+            return f.read()
+
+
+class TestTrelloBoardHtmlFileGenerator(OutputTestBase):
+    def test_write_file_streams_all_cards(self):
+        generator = TrelloBoardHtmlFileGenerator(self.board, TrelloCardHtmlGeneratorMode.BASIC.value)
+        generator.write_file(os.path.join(self.tmp_dir.name, "board.html"))
+
+        html = self._read("board.html")
+        self.assertEqual("".join(generator.iter_html()), html)
+        self.assertIn("<h1>LIST: To Do (3 cards)</h1>", html)
+        for idx in range(3):
+            self.assertIn(f"<h2>CARD: Card {idx}</h2>", html)
+        self.assertIn("[x] Step 1<br>", html)
+        self.assertIn("[] <a href=http://example.com>Example</a><br>", html)
+        self.assertNotIn("COMMENTS", html)
+
+
+class TestOutputHandler(OutputTestBase):
+    def _write_outputs(self, max_workers, output_types=None):
+        handler = OutputHandler(TrelloDataConverter(MarkdownFormatter(), 8000), self.tmp_dir.name, self.board,
+                                TrelloCardHtmlGeneratorMode.BASIC.value, TrelloFilters.create_default(),
+                                output_types=output_types, max_workers=max_workers)
+        report = BackupReport()
+        handler.write_outputs(self.board.name, report.file_write_callback)
+        return report
+
+    def _assert_all_outputs_written(self, report):
+        for output_type in OutputType.defaults():
+            files = list(report.get_files(output_type))
+            self.assertEqual(1, len(files), msg=output_type)
+            self.assertTrue(os.path.getsize(files[0]) > 0, msg=output_type)
+            self.assertIn(files[0], report._elapsed_by_file)
+        self.assertIn("Card 2", self._read("board-test-board.csv"))
+        self.assertIn("TRELLO EXPORT OF BOARD: Test Board", self._read("board-test-board-rich-table.html"))
+
+    def test_write_outputs_in_process(self):
+        self._assert_all_outputs_written(self._write_outputs(max_workers=1))
+
+    def test_write_outputs_with_process_pool(self):
+        self._assert_all_outputs_written(self._write_outputs(max_workers=2))
+
+    def test_writer_pool_is_shared_by_boards(self):
+        with patch('trello_backup.display.output.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as mock_executor, \
+                OutputWriterPool(max_workers=2) as writer_pool:
+            for session in ("session1", "session2"):
+                output_dir = os.path.join(self.tmp_dir.name, session)
+                os.makedirs(output_dir)
+                handler = OutputHandler(TrelloDataConverter(MarkdownFormatter(), 8000), output_dir, self.board,
+                                        TrelloCardHtmlGeneratorMode.BASIC.value, TrelloFilters.create_default(),
+                                        max_workers=2, writer_pool=writer_pool)
+                handler.write_outputs(self.board.name, BackupReport().file_write_callback)
+                self.assertTrue(os.path.exists(os.path.join(output_dir, "board-test-board-rich-table.html")))
+        mock_executor.assert_called_once_with(max_workers=2)
+
+    def test_board_json_is_only_passed_to_its_writer(self):
+        with patch('trello_backup.display.output._run_output_writer', wraps=_run_output_writer) as mock_writer:
+            self._write_outputs(max_workers=1)
+        args_by_type = {c.args[0]: c.args[2] for c in mock_writer.call_args_list}
+        self.assertEqual((self.board.json, ), args_by_type[OutputType.BOARD_JSON])
+        self.assertIsNone(args_by_type[OutputType.HTML_FILE][0].json)
+        self.assertEqual(self.board.name, args_by_type[OutputType.RICH_HTML_TABLE][0])
+        self.assertEqual(self.board.name, args_by_type[OutputType.CUSTOM_HTML_TABLE][0])
+
+    def test_write_selected_outputs_skips_table_rows(self):
+        output_types = OutputType.from_names(["board_json", "html_file"])
+        with patch.object(TrelloDataConverter, 'convert_to_table_rows') as mock_convert:
+            report = self._write_outputs(max_workers=1, output_types=output_types)
+        mock_convert.assert_not_called()
+        self.assertEqual(1, len(list(report.get_files(OutputType.HTML_FILE))))
+        self.assertEqual(1, len(list(report.get_files(OutputType.BOARD_JSON))))
+        for output_type in (OutputType.CSV, OutputType.RICH_HTML_TABLE, OutputType.CUSTOM_HTML_TABLE):
+            self.assertEqual([], list(report.get_files(output_type)))
+
+    def test_large_rich_table_falls_back_to_plain_html_table(self):
+        with patch('trello_backup.display.output.RICH_TABLE_MAX_ROWS', 1):
+            report = self._write_outputs(max_workers=1, output_types=[OutputType.RICH_HTML_TABLE])
+        html = self._read("board-test-board-rich-table.html")
+        self.assertEqual(6, html.count('<tr class="row">'))
+        self.assertIn('<tr class="section"><th colspan="13">To Do</th></tr>', html)
+        # Recorded with the type it was written as
+        self.assertEqual([], list(report.get_files(OutputType.RICH_HTML_TABLE)))
+        self.assertEqual([os.path.join(self.tmp_dir.name, "board-test-board-rich-table.html")],
+                         list(report.get_files(OutputType.CUSTOM_HTML_TABLE)))
+
+    def test_single_csv_output_consumes_rows_lazily(self):
+        with patch.object(TrelloDataConverter, 'convert_to_table_rows') as mock_convert:
+            self._write_outputs(max_workers=2, output_types=[OutputType.CSV, OutputType.BOARD_JSON])
+        mock_convert.assert_not_called()
+        lines = self._read("board-test-board.csv").splitlines()
+        # Header + 2 checklist items for each card
+        self.assertEqual(7, len(lines))
+        self.assertTrue(lines[0].startswith("Board;List;Card;Labels"))
+        self.assertEqual("Test Board;To Do;Card 0;Bug;;Description 0;;;;;Step 1;;", lines[1])
+
+    def test_gzipped_csv_has_same_contents(self):
+        self._write_outputs(max_workers=1, output_types=[OutputType.CSV, OutputType.CSV_GZIP])
+        with gzip.open(os.path.join(self.tmp_dir.name, "board-test-board.csv.gz")) as gz, \
+                open(os.path.join(self.tmp_dir.name, "board-test-board.csv"), "rb") as f:
+            self.assertEqual(f.read(), gz.read())
+
+
+class TestReuseUnchangedBoardOutputs(OutputTestBase):
+    def _write_outputs(self, session, previous_session=None):
+        output_dir = os.path.join(self.tmp_dir.name, session)
+        os.makedirs(output_dir)
+        handler = OutputHandler(TrelloDataConverter(MarkdownFormatter(), 8000), output_dir, self.board,
+                                TrelloCardHtmlGeneratorMode.BASIC.value, TrelloFilters.create_default(),
+                                output_types=[OutputType.HTML_FILE, OutputType.CSV], max_workers=1,
+                                previous_session=previous_session)
+        report = BackupReport()
+        handler.write_outputs(self.board.name, report.file_write_callback)
+        manifest = SessionManifest(output_dir)
+        files = [(t.cli_name, path, report.get_elapsed(path), report.is_reused(path))
+                 for t, path in report.get_board_files(self.board.name)]
+        manifest.add_board(manifest.create_board_record(self.board.name, self.board.id, handler.fingerprint, files,
+                                                        previous=previous_session))
+        return manifest, report
+
+    def test_unchanged_board_is_reused(self):
+        previous, _ = self._write_outputs("session1")
+        with patch('trello_backup.display.output._run_output_writer') as mock_writer:
+            _, report = self._write_outputs("session2", previous_session=previous)
+        mock_writer.assert_not_called()
+        files = report.get_board_files(self.board.name)
+        self.assertEqual(2, len(files))
+        for _, file_path in files:
+            self.assertTrue(report.is_reused(file_path))
+            self.assertTrue(file_path.startswith(os.path.join(self.tmp_dir.name, "session2")))
+            self.assertTrue(os.path.exists(file_path))
+
+    def test_changed_board_is_written(self):
+        previous, _ = self._write_outputs("session1")
+        self.trello_list.cards[0].comments.append(TrelloComment(id="cm1", author="me", date="2025-01-01", contents="hi"))
+        _, report = self._write_outputs("session2", previous_session=previous)
+        for _, file_path in report.get_board_files(self.board.name):
+            self.assertFalse(report.is_reused(file_path))
+
+
+class TestShardedOutput(OutputTestBase):
+    def setUp(self):
+        super().setUp()
+        self.done_list = TrelloList(closed=False, id='102', name='Done / 2025', board_id='board_1', pos=2)
+        self.done_list.cards.append(TrelloCard(id='d1', name='Done card', short_url=tu.generate_short_url(),
+                                               list=self.done_list, description='', attachments=[], checklists=[],
+                                               labels=[], closed=False, comments=[], due_date=None, activities=[]))
+        self.board.lists = [self.trello_list, self.done_list]
+        self.manifest_dir = os.path.join(self.tmp_dir.name, "manifests")
+        self.output_types = [OutputType.HTML_FILE, OutputType.CSV, OutputType.BOARD_JSON]
+
+    def _write_sharded(self, session, max_workers=2):
+        output_dir = os.path.join(self.tmp_dir.name, session)
+        os.makedirs(output_dir)
+        handler = OutputHandler(TrelloDataConverter(MarkdownFormatter(), 8000), output_dir, self.board,
+                                TrelloCardHtmlGeneratorMode.BASIC.value, TrelloFilters.create_default(),
+                                output_types=self.output_types, max_workers=max_workers, shard_by_list=True,
+                                shard_manifest_dir=self.manifest_dir)
+        report = BackupReport()
+        handler.write_outputs(self.board.name, report.file_write_callback)
+        return os.path.join(output_dir, "board-test-board"), report
+
+    def test_one_file_per_list_and_index(self):
+        shard_dir, report = self._write_sharded("session1")
+        self.assertEqual(["index.html", "list-000-to-do.csv", "list-000-to-do.html",
+                          "list-001-done-2025.csv", "list-001-done-2025.html"], sorted(os.listdir(shard_dir)))
+        with open(os.path.join(shard_dir, "list-001-done-2025.html")) as f:
+            html = f.read()
+        self.assertIn("Done card", html)
+        self.assertNotIn("Card 0", html)
+        with open(os.path.join(shard_dir, "index.html")) as f:
+            index = f.read()
+        self.assertIn('<a href="list-000-to-do.html">html file</a>', index)
+        self.assertIn("<td>Done / 2025</td><td>1</td>", index)
+        self.assertEqual(1, len(list(report.get_files(OutputType.BOARD_JSON))))
+        self.assertEqual(3, len(list(report.get_files(OutputType.HTML_FILE))))
+
+    def test_unchanged_lists_are_reused(self):
+        self._write_sharded("session1")
+        self.done_list.cards[0].name = "Done card renamed"
+        with patch('trello_backup.display.output._run_output_writer', wraps=_run_output_writer) as mock_writer:
+            shard_dir, _ = self._write_sharded("session2", max_workers=1)
+        written_files = sorted(os.path.basename(c.args[1]) for c in mock_writer.call_args_list)
+        self.assertEqual(["board-test-board.json", "list-001-done-2025.csv", "list-001-done-2025.html"], written_files)
+        with open(os.path.join(shard_dir, "list-000-to-do.html")) as f:
+            self.assertIn("Card 0", f.read())
+        with open(os.path.join(shard_dir, "list-001-done-2025.html")) as f:
+            self.assertIn("Done card renamed", f.read())
+
+    def test_large_rich_table_fallback_is_recorded_for_reused_shards(self):
+        self.output_types = [OutputType.RICH_HTML_TABLE]
+        with patch('trello_backup.display.output.RICH_TABLE_MAX_ROWS', 1):
+            _, report = self._write_sharded("session1", max_workers=1)
+            _, reused_report = self._write_sharded("session2", max_workers=1)
+        for r in (report, reused_report):
+            # The To Do list has 6 rows, the Done list 1 row
+            self.assertEqual(["list-000-to-do-rich-table.html"],
+                             [os.path.basename(f) for f in r.get_files(OutputType.CUSTOM_HTML_TABLE)])
+            self.assertEqual(["list-001-done-2025-rich-table.html"],
+                             [os.path.basename(f) for f in r.get_files(OutputType.RICH_HTML_TABLE)])
+        self.assertTrue(all(reused_report.is_reused(f) for f in reused_report.get_files(OutputType.CUSTOM_HTML_TABLE)))
+
+
+class TestTrelloDataConverter(OutputTestBase):
+    def test_table_rows(self):
+        converter = TrelloDataConverter(MarkdownFormatter(), 8000)
+        self.trello_list.cards[0].checklists[0].items[1].url_title = None
+        rows, header = converter.convert_to_table_rows(self.board, TrelloFilters.create_default(), MarkdownFormatter())
+        self.assertEqual(13, len(header))
+        self.assertEqual(6, len(rows))
+        self.assertEqual(["Test Board", "To Do", "Card 0", "Bug", "", "Description 0", "", "", "", "", "", "",
+                          "http://example.com"], rows[1])
+
+
+class TestOutputType(unittest.TestCase):
+    def test_from_names(self):
+        self.assertEqual([OutputType.HTML_FILE, OutputType.BOARD_JSON],
+                         OutputType.from_names(["board_json", " HTML_FILE", "html_file"]))
+
+    def test_from_names_invalid(self):
+        for names in (["html"], [], [""]):
+            with self.assertRaises(TrelloException, msg=names):
+                OutputType.from_names(names)
+
+
+if __name__ == '__main__':
+    unittest.main()
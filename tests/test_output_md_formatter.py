@@ -1,5 +1,10 @@
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
+
 from trello_backup.display.output import MarkdownFormatter
+from trello_backup.trello.cache import MarkdownCache
 
 
 class TestMarkdownFormatter(unittest.TestCase):
@@ -86,5 +91,57 @@ Paragraph with **bold**, *italic*, and [link](http://example.com).
         self.assertIn("Item B", out)
 
 
+class TestMarkdownFormatterCaching(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmp_dir.name, "md_cache")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_conversions_are_memoized(self):
+        fmt = MarkdownFormatter()
+        with patch.object(MarkdownFormatter, '_convert', autospec=True, return_value="Hello world") as mock_convert:
+            for _ in range(3):
+                self.assertEqual("Hello world", fmt.to_plain_text("Hello **world**"))
+        mock_convert.assert_called_once()
+
+    def test_memo_is_bounded(self):
+        fmt = MarkdownFormatter(memo_max_size=2)
+        with patch.object(MarkdownFormatter, '_convert', autospec=True, side_effect=lambda _, t: t.strip("*")) as mock_convert:
+            for text in ["**a**", "**b**", "**a**", "**c**", "**a**", "**b**"]:
+                fmt.to_plain_text(text)
+        self.assertEqual(["**a**", "**b**"], list(fmt._memo.keys()))
+        # The recently used "**a**" is kept, "**b**" is converted again after it was evicted by "**c**"
+        self.assertEqual(4, mock_convert.call_count)
+
+    def test_plain_text_fast_path(self):
+        fmt = MarkdownFormatter()
+        texts = ["", "Hello world", "See http://example.com/a?b=c now.", "1.5 liters; 50% off"]
+        with patch.object(MarkdownFormatter, '_convert', autospec=True) as mock_convert:
+            results = [fmt.to_plain_text(t) for t in texts]
+        mock_convert.assert_not_called()
+        self.assertEqual(["", "Hello world", "See http://example.com/a?b=c now.", "1.5 liters; 50% off"], results)
+        # Same results as the full conversion
+        self.assertEqual(results, [MarkdownFormatter()._convert(t) for t in texts])
+
+    def test_markdown_syntax_is_not_fast_pathed(self):
+        for text in ["1. item", "snake_case", "# Title", "line1\nline2", " indented", "a & b"]:
+            self.assertFalse(MarkdownFormatter._is_plain_text(text), msg=text)
+
+    def test_conversions_are_persisted(self):
+        with MarkdownCache(self.cache_file) as cache:
+            fmt = MarkdownFormatter(cache)
+            self.assertEqual("Hello world", fmt.to_plain_text("Hello **world**"))
+            fmt.save()
+
+        with MarkdownCache(self.cache_file) as cache:
+            fmt = MarkdownFormatter(cache)
+            with patch.object(MarkdownFormatter, '_convert', autospec=True) as mock_convert:
+                self.assertEqual("Hello world", fmt.to_plain_text("Hello **world**"))
+            mock_convert.assert_not_called()
+            self.assertEqual(1, len(cache))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,10 @@
 import unittest
 from typing import Dict, Any, Set, List
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from tests.test_utils import TestUtils
-from trello_backup.trello.model import TrelloList, TrelloChecklist, TrelloAttachment
+from trello_backup.trello.filter import CardFilters
+from trello_backup.trello.model import TrelloList, TrelloChecklist, TrelloAttachment, TrelloChecklists, TrelloCards
 from trello_backup.trello.parser import TrelloObjectParser
 
 
@@ -14,6 +15,9 @@ class MockTrelloLists:
         self._filtered = is_filtered
 
     # TODO testing Duplicated logic from TrelloLists - Consider changing this?
+    def get(self):
+        return tuple(self.by_id.values())
+
     def get_ids(self):
         return set(self.by_id.keys())
 
@@ -168,12 +172,12 @@ class TrelloObjectParserTest(unittest.TestCase):
         self.assertEqual("Step 1_2", cl_2.items[1].value)
         self.assertFalse(cl_2.items[1].checked)
 
-    def test_parse_trello_cards_no_comments_no_attachments(self):
+    def test_trello_cards_no_comments_no_attachments(self):
         """Tests basic card parsing without comments or attachments."""
         # Setup mock lists and checklists containers
-        mock_list_1 = MagicMock(spec=TrelloList, id="list_id_1", cards=[])
-        mock_list_2 = MagicMock(spec=TrelloList, id="list_id_2", cards=[])
-        mock_trello_lists = MockTrelloLists(lists=[mock_list_1, mock_list_2])
+        trello_list_1 = TrelloList(False, "list_id_1", "List 1", "board_id_1", 1)
+        trello_list_2 = TrelloList(False, "list_id_2", "List 2", "board_id_1", 2)
+        mock_trello_lists = MockTrelloLists(lists=[trello_list_1, trello_list_2])
 
         mock_checklist_1 = MagicMock(spec=TrelloChecklist, id="checklist_id_1")
         mock_checklist_2 = MagicMock(spec=TrelloChecklist, id="checklist_id_2")
@@ -197,17 +201,17 @@ class TrelloObjectParserTest(unittest.TestCase):
 
         board_json = {"cards": simple_cards_json}
 
-        cards = TrelloObjectParser.parse_trello_cards(
+        cards = TrelloCards(
             board_json,
             mock_trello_lists,
             mock_trello_checklists
-        )
+        ).all
 
         self.assertEqual(1, len(cards))
         self.assertEqual("card_id_1", cards[0].id)
         self.assertEqual("Simple Card", cards[0].name)
         self.assertFalse(cards[0].closed)
-        self.assertEqual(mock_list_1, cards[0].list)
+        self.assertEqual(trello_list_1, cards[0].list)
         self.assertEqual("description", cards[0].description)
         self.assertEqual([], cards[0].attachments)
         self.assertEqual([], cards[0].checklists)
@@ -216,11 +220,11 @@ class TrelloObjectParserTest(unittest.TestCase):
         self.assertEqual("card_id_1", cards[0].id)
         self.assertIsNone(cards[0].due_date)
 
-    def test_parse_trello_cards_with_attachments(self):
+    def test_trello_cards_with_attachments(self):
         """Tests card parsing including attachment logic."""
         # Setup mock lists and checklists containers
-        mock_list_1 = MagicMock(spec=TrelloList, id="list_id_1", cards=[])
-        mock_trello_lists = MockTrelloLists(lists=[mock_list_1])
+        trello_list_1 = TrelloList(False, "list_id_1", "List 1", "board_id_1", 1)
+        mock_trello_lists = MockTrelloLists(lists=[trello_list_1])
 
         mock_checklist_1 = MagicMock(spec=TrelloChecklist, id="checklist_id_1")
         mock_checklist_2 = MagicMock(spec=TrelloChecklist, id="checklist_id_2")
@@ -228,13 +232,13 @@ class TrelloObjectParserTest(unittest.TestCase):
 
         board_json = {"cards": self.MOCK_CARDS_JSON[:1]} # Only the first card with an attachment
 
-        cards = TrelloObjectParser.parse_trello_cards(
+        cards = TrelloCards(
             board_json,
             mock_trello_lists,
             mock_trello_checklists
-        )
+        ).all
 
-        self._assert_card1_common(cards, mock_list_1)
+        self._assert_card1_common(cards, trello_list_1)
         self.assertEqual([], cards[0].comments)
 
         self.assertEqual(1, len(cards[0].attachments))
@@ -247,12 +251,12 @@ class TrelloObjectParserTest(unittest.TestCase):
         self.assertEqual("https://api.trello.com/1/cards/card_id_1/attachments/att_id_1/download/report.pdf", attachment.api_url)
         self.assertTrue(attachment.is_upload)
 
-    def _assert_card1_common(self, cards: list[Any], mock_list_1: MagicMock):
+    def _assert_card1_common(self, cards: list[Any], trello_list_1: TrelloList):
         self.assertEqual(1, len(cards))
         self.assertEqual("card_id_1", cards[0].id)
         self.assertEqual("Feature X", cards[0].name)
         self.assertFalse(cards[0].closed)
-        self.assertEqual(mock_list_1, cards[0].list)
+        self.assertEqual(trello_list_1, cards[0].list)
         self.assertEqual("Card description.", cards[0].description)
         self.assertEqual(2, len(cards[0].checklists))
         self.assertEqual(["P1", "Feature"], cards[0].labels)
@@ -260,24 +264,56 @@ class TrelloObjectParserTest(unittest.TestCase):
         self.assertIsNone(cards[0].due_date)
 
 
-    def test_parse_trello_cards_filtered_skip(self):
+    def test_trello_cards_filtered_skip(self):
         """Tests that cards for non-present lists are skipped when TrelloLists is filtered."""
         # Setup TrelloLists as filtered, only containing list_id_2
-        mock_list_2 = MagicMock(spec=TrelloList, id="list_id_2", cards=[])
-        mock_trello_lists = MockTrelloLists(lists=[mock_list_2], is_filtered=True) # Important flag
+        trello_list_2 = TrelloList(False, "list_id_2", "List 2", "board_id_1", 2)
+        mock_trello_lists = MockTrelloLists(lists=[trello_list_2], is_filtered=True) # Important flag
         mock_trello_checklists = MockTrelloChecklists(checklists=[])
 
         board_json = {"cards": self.MOCK_CARDS_JSON} # Card 1 is for list_id_1, Card 2 is for list_id_2
 
-        cards = TrelloObjectParser.parse_trello_cards(
+        cards = TrelloCards(
             board_json,
             mock_trello_lists,
             mock_trello_checklists
-        )
+        ).all
 
         self.assertEqual(1, len(cards))
         self.assertEqual("card_id_2", cards[0].id)
 
+    @patch('trello_backup.trello.parser.TrelloApi')
+    def test_trello_cards_filtered_before_object_creation(self, mock_trello_api):
+        """Tests that cards filtered out by lists or card filters are skipped before attachments are created."""
+        trello_list_1 = TrelloList(False, "list_id_1", "List 1", "board_id_1", 1)
+        trello_list_2 = TrelloList(False, "list_id_2", "List 2", "board_id_1", 2)
+        mock_trello_checklists = MockTrelloChecklists(checklists=[])
+        board_json = {"cards": self.MOCK_CARDS_JSON}
+
+        # Card 1 (with the attachment) belongs to list_id_1, which is filtered out
+        filtered_lists = MockTrelloLists(lists=[trello_list_2], is_filtered=True)
+        cards = TrelloCards(board_json, filtered_lists, mock_trello_checklists).all
+        self.assertEqual(["card_id_2"], [c.id for c in cards])
+        mock_trello_api.reformat_attachment_url.assert_not_called()
+
+        # Card 2 is closed, so it is dropped by the OPEN card filter
+        all_lists = MockTrelloLists(lists=[trello_list_1, trello_list_2])
+        cards = TrelloCards(board_json, all_lists, mock_trello_checklists, card_filters=CardFilters.OPEN).all
+        self.assertEqual(["card_id_1"], [c.id for c in cards])
+        # Only the card of the first TrelloCards was added to list_id_2
+        self.assertEqual(1, len(trello_list_2.cards))
+
+    def test_trello_checklists_get_by_ids(self):
+        """Tests that checklists are resolved by id and returned sorted by position."""
+        trello_checklists = TrelloChecklists(self.MOCK_BOARD_JSON)
+
+        result = trello_checklists.get_by_ids(["checklist_id_2", "checklist_id_1", "unknown"])
+
+        self.assertEqual(2, len(result))
+        self._assert_two_checklists(result[0], result[1])
+        # Parsed checklists are reused
+        self.assertIs(result[0], trello_checklists.get_by_ids(["checklist_id_1"])[0])
+
     def test_query_comments_for_card_success(self):
         """Tests successful parsing of a comment action."""
         mock_actions_json = [
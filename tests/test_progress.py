@@ -0,0 +1,60 @@
+import logging
+import unittest
+from unittest.mock import patch
+
+from trello_backup.display.progress import ProgressReporter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProgressReporter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    @patch('trello_backup.display.progress.CLI_LOG')
+    def test_info_report_is_throttled(self, mock_cli_log):
+        progress = ProgressReporter("Processing cards", 100, report_interval=2.0, clock=self.clock)
+        for _ in range(50):
+            progress.advance("card")
+        mock_cli_log.info.assert_not_called()
+
+        self.clock.now = 2.5
+        progress.advance("card")
+        self.assertEqual(1, mock_cli_log.info.call_count)
+        self.assertEqual(51, progress.count)
+
+    @patch('trello_backup.display.progress.CLI_LOG')
+    def test_finish_reports_once(self, mock_cli_log):
+        with ProgressReporter("Processing cards", 3, clock=self.clock) as progress:
+            for _ in range(3):
+                progress.advance()
+            progress.finish()
+        self.assertEqual(1, mock_cli_log.info.call_count)
+
+    @patch('trello_backup.display.progress.CLI_LOG')
+    def test_empty_loop_does_not_report(self, mock_cli_log):
+        with ProgressReporter("Processing cards", 0, clock=self.clock):
+            pass
+        mock_cli_log.info.assert_not_called()
+
+    @patch('trello_backup.display.progress.LOG')
+    def test_per_item_messages_only_at_debug_level(self, mock_log):
+        mock_log.isEnabledFor.side_effect = lambda level: level != logging.DEBUG
+        progress = ProgressReporter("Processing cards", 1, clock=self.clock)
+        progress.advance("card")
+        mock_log.debug.assert_not_called()
+
+        mock_log.isEnabledFor.side_effect = lambda level: True
+        progress = ProgressReporter("Processing cards", 1, clock=self.clock)
+        progress.advance("card")
+        mock_log.debug.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
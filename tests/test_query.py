@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import patch
+
+from tests.test_utils import TestUtils
+from trello_backup.exception import TrelloQueryException
+from trello_backup.trello.model import TrelloLists, TrelloCards, TrelloChecklists
+from trello_backup.trello.query import CardQueryParser
+
+tu = TestUtils
+
+
+class TestCardQuery(unittest.TestCase):
+    def setUp(self):
+        lists = [{"id": "101", "name": "To Do", "closed": False, "idBoard": "board_1", "pos": 1},
+                 {"id": "102", "name": "Done 2025", "closed": False, "idBoard": "board_1", "pos": 2}]
+        cards = [self._card_json('c1', 'Fix login bug', '101', labels=['Urgent', 'Bug'], due='2025-01-10T12:00:00.000Z'),
+                 self._card_json('c2', 'Write docs', '101', labels=['Docs'], desc='Some **markdown**'),
+                 self._card_json('c3', 'Release', '102', labels=['urgent'], closed=True, checklist_ids=['cl1'],
+                                 due='2025-02-01T08:00:00.000Z')]
+        checklists = [{"id": "cl1", "name": "Steps", "idBoard": "board_1", "idCard": "c3", "pos": 1,
+                       "checkItems": [{"id": "i1", "name": "Read the Manual", "state": "incomplete", "pos": 1}]}]
+        self.board_json = {"id": "board_1", "name": "Board", "lists": lists, "cards": cards, "checklists": checklists}
+
+    @staticmethod
+    def _card_json(card_id, name, list_id, labels, desc='', closed=False, checklist_ids=None, due=None):
+        return {"id": card_id, "name": name, "shortUrl": tu.generate_short_url(), "idList": list_id, "desc": desc,
+                "labels": [{"name": label} for label in labels], "idChecklists": checklist_ids if checklist_ids else [],
+                "closed": closed, "due": due}
+
+    def _create_trello_cards(self):
+        trello_lists = TrelloLists(self.board_json)
+        return TrelloCards(self.board_json, trello_lists, TrelloChecklists(self.board_json))
+
+    def _select_ids(self, query):
+        return [c.id for c in CardQueryParser.parse(query).select(self._create_trello_cards())]
+
+    def test_label_case_insensitive(self):
+        self.assertEqual(['c1', 'c3'], self._select_ids("label:URGENT"))
+        self.assertEqual(['c1', 'c2', 'c3'], self._select_ids("label:urgent,docs"))
+
+    def test_label_query_uses_index(self):
+        query = CardQueryParser.parse("label:urgent label:docs")
+        trello_cards = self._create_trello_cards()
+        with patch.object(type(query), 'matches', autospec=True, return_value=True) as mock_matches:
+            result = query.select(trello_cards)
+        # Only the cards of the smallest label term are materialized and evaluated
+        self.assertEqual(['c2'], [c.id for c in result])
+        self.assertEqual(1, mock_matches.call_count)
+        self.assertEqual(1, len(trello_cards._by_index))
+
+    def test_negation_and_state(self):
+        self.assertEqual(['c1'], self._select_ids("label:urgent -is:closed"))
+        self.assertEqual(['c3'], self._select_ids("is:closed"))
+
+    def test_list_glob(self):
+        self.assertEqual(['c3'], self._select_ids("list:done*"))
+        self.assertEqual(['c1', 'c2'], self._select_ids('"list:To Do"'))
+
+    def test_due_ranges(self):
+        self.assertEqual(['c2'], self._select_ids("due:none"))
+        self.assertEqual(['c1'], self._select_ids("due:<2025-02-01"))
+        self.assertEqual(['c1', 'c3'], self._select_ids("due:<=2025-02-01"))
+        self.assertEqual(['c3'], self._select_ids("due:>2025-01-10"))
+        self.assertEqual(['c1', 'c3'], self._select_ids("due:2025-01-10..2025-02-01"))
+        self.assertEqual(['c1'], self._select_ids("due:2025-01-10"))
+
+    def test_has_and_text_match(self):
+        self.assertEqual(['c3'], self._select_ids("has:checklist"))
+        self.assertEqual(['c2'], self._select_ids("has:description"))
+        self.assertEqual(['c3'], self._select_ids("manual"))
+        self.assertEqual(['c1'], self._select_ids('"login bug"'))
+
+    def test_invalid_queries(self):
+        for query in ["is:maybe", "has:nothing", "due:tomorrow", "label:", '"unterminated']:
+            with self.assertRaises(TrelloQueryException, msg=query):
+                CardQueryParser.parse(query)
+
+
+if __name__ == '__main__':
+    unittest.main()
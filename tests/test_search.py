@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from tests.test_utils import TestUtils
+from trello_backup.exception import TrelloException
+from trello_backup.trello.model import TrelloList, TrelloCard, TrelloBoard, TrelloChecklist, TrelloChecklistItem, \
+    TrelloComment
+from trello_backup.trello.search import SearchIndex
+
+tu = TestUtils
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index = SearchIndex(os.path.join(self.tmp_dir.name, "search-index.sqlite"))
+        self.todo = TrelloList(closed=False, id='101', name='To Do', board_id='board_1', pos=1)
+        checklist = TrelloChecklist(id='cl1', name='Links', board_id='board_1', card_id='c2', pos=1,
+                                    items=[TrelloChecklistItem(id='i1', value='https://example.com/x', checked=False,
+                                                               pos=1, url='https://example.com/x',
+                                                               url_title='Kubernetes operators explained')])
+        self.c1 = self._create_card('c1', 'Upgrade Hadoop cluster', description='Rolling upgrade of the nodes')
+        self.c2 = self._create_card('c2', 'Reading list', checklists=[checklist])
+        self.c3 = self._create_card('c3', 'Café notes', description='Mention hadoop once',
+                                    comments=[TrelloComment(id='cm1', author='me', date='2025-01-01', contents='Árvíztűrő tükörfúrógép')])
+        self.board = TrelloBoard(id='board_1', json={}, name='Test Board', lists=[self.todo])
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp_dir.cleanup()
+
+    def _create_card(self, card_id, name, description='', checklists=None, comments=None):
+        card = TrelloCard(id=card_id, name=name, short_url=tu.generate_short_url(), list=self.todo,
+                          description=description, attachments=[], checklists=checklists if checklists else [],
+                          labels=['Ops'], closed=False, comments=comments if comments else [], due_date=None,
+                          activities=[])
+        self.todo.cards.append(card)
+        return card
+
+    def _search_names(self, query, **kwargs):
+        return [hit.card_name for hit in self.index.search(query, **kwargs)]
+
+    def test_search_ranks_card_names_first(self):
+        self.assertTrue(self.index.index_board(self.board, session="session-1"))
+        self.assertEqual(['Upgrade Hadoop cluster', 'Café notes'], self._search_names("hadoop"))
+        hit = self.index.search("rolling upgrade")[0]
+        self.assertEqual(("Test Board", "To Do", "session-1"), (hit.board_name, hit.list_name, hit.session))
+        self.assertIn("[upgrade]", hit.snippet.lower())
+
+    def test_search_checklist_url_titles_comments_and_prefixes(self):
+        self.index.index_board(self.board)
+        self.assertEqual(['Reading list'], self._search_names("kubernetes"))
+        self.assertEqual(['Café notes'], self._search_names("arvizturo"))
+        self.assertEqual(['Café notes'], self._search_names("cafe"))
+        self.assertEqual(['Upgrade Hadoop cluster'], self._search_names("clus*"))
+        self.assertEqual([], self._search_names("hadoop", board_name="Other Board"))
+
+    def test_only_changed_boards_are_reindexed(self):
+        self.assertTrue(self.index.index_board(self.board))
+        self.assertFalse(self.index.index_board(self.board))
+        self.todo.cards.remove(self.c1)
+        self.c2.name = "Reading list about Hadoop"
+        self.assertTrue(self.index.index_board(self.board))
+        self.assertEqual(['Reading list about Hadoop', 'Café notes'], self._search_names("hadoop"))
+
+    def test_invalid_query(self):
+        self.index.index_board(self.board)
+        with self.assertRaises(TrelloException):
+            self.index.search(" * ")
+        self.assertEqual([], self._search_names('"OR" AND NOT('))
+
+
+if __name__ == '__main__':
+    unittest.main()
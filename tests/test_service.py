@@ -1,11 +1,13 @@
 import json
+import threading
 import unittest
 from string import Template
 from typing import Dict
 from unittest import mock
 from unittest.mock import Mock, patch, call, MagicMock
 
-from trello_backup.trello.api import NetworkStatusService, TrelloRepository, OfflineTrelloApi
+from trello_backup.trello.api import NetworkStatusService, TrelloRepository, OfflineTrelloApi, BoardDetailsProfile, \
+    TrelloApi, BOARD_DETAILS_PARAMS
 from trello_backup.trello.filter import CardFilters, ListFilter, TrelloFilters
 from trello_backup.trello.model import TrelloChecklist, TrelloBoard, TrelloList, TrelloComment, TrelloLists, \
     TrelloCards, TrelloCard
@@ -91,12 +93,11 @@ class TestTrelloOperations(unittest.TestCase):
         self.assertEqual(self._trello_ops._board_name_to_board_id, mock_api_response)
 
     # Patching TrelloApi and Model classes for _get_trello_board_and_lists
-    @patch('trello_backup.trello.service.CardFilterer')
     @patch('trello_backup.trello.service.TrelloCards')
     @patch('trello_backup.trello.service.TrelloChecklists')
     @patch('trello_backup.trello.service.TrelloLists')
     @patch('trello_backup.trello.service.TrelloBoard')
-    def test_get_trello_board_and_lists_full_flow(self, MockTrelloBoard, MockTrelloLists, MockTrelloChecklists, MockTrelloCards, MockCardFilterer):
+    def test_get_trello_board_and_lists_full_flow(self, MockTrelloBoard, MockTrelloLists, MockTrelloChecklists, MockTrelloCards):
         """Tests the full internal flow of fetching and processing board data."""
         # Setup mocks for internal methods
         self._trello_ops._get_board_id = Mock(return_value=MOCK_BOARD_ID)
@@ -113,10 +114,6 @@ class TestTrelloOperations(unittest.TestCase):
         mock_trello_board = Mock(spec=TrelloBoard, lists=[mock_trello_list])
         MockTrelloBoard.return_value = mock_trello_board
 
-        # Setup CardFilterer
-        mock_filtered_cards = [Mock()]
-        MockCardFilterer.filter_cards.return_value = mock_filtered_cards
-
         # Call the method under test
         board, trello_lists = self._trello_ops._get_trello_board_and_lists(
             name=MOCK_BOARD_NAME,
@@ -125,30 +122,27 @@ class TestTrelloOperations(unittest.TestCase):
 
         # Assertions
         self._trello_ops._get_board_id.assert_called_once_with(MOCK_BOARD_NAME)
-        self._trello_ops._get_board_json.assert_called_once_with(MOCK_BOARD_ID)
+        self._trello_ops._get_board_json.assert_called_once_with(MOCK_BOARD_ID, profile=BoardDetailsProfile.FULL)
 
         MockTrelloLists.assert_called_once_with(MOCK_BOARD_JSON)
         # Assert filtering was called
         mock_trello_lists.filter_by_list_names.assert_called_once_with(MOCK_LIST_NAMES)
         mock_trello_lists.filter_by_list_filter.assert_called_once_with(ListFilter.ALL)
 
-        MockTrelloCards.assert_called_once()
+        # Assert card filtering is pushed down to the parser
+        MockTrelloCards.assert_called_once_with(MOCK_BOARD_JSON, mock_trello_lists, MockTrelloChecklists.return_value,
+                                                card_filters=CardFilters.ALL)
         MockTrelloBoard.assert_called_once()
 
-        # Assert card filtering and list update
-        MockCardFilterer.filter_cards.assert_called_once()
-        self.assertEqual(mock_trello_list.cards, mock_filtered_cards) # Check if list.cards was overwritten
-
         # Assert title service and cache calls
         self.mock_title_service.process_board_checklist_titles.assert_called_once_with(mock_trello_board)
         self.mock_cache.save.assert_called_once()
 
-    @patch('trello_backup.trello.service.CardFilterer')
     @patch('trello_backup.trello.service.TrelloCards')
     @patch('trello_backup.trello.service.TrelloChecklists')
     @patch('trello_backup.trello.service.TrelloLists')
     @patch('trello_backup.trello.service.TrelloBoard')
-    def test_parse_trello_cards_with_comment_download(self, MockTrelloBoard, MockTrelloLists, MockTrelloChecklists, MockTrelloCards, MockCardFilterer):
+    def test_parse_trello_cards_with_comment_download(self, MockTrelloBoard, MockTrelloLists, MockTrelloChecklists, MockTrelloCards):
         """Tests that comment downloading is triggered when requested."""
         # Setup mock lists and checklists containers
         mock_api_response = {"My Board 1": "id1", "My Board 2": "id2"}
@@ -241,10 +235,155 @@ class TestTrelloOperations(unittest.TestCase):
         result = self._trello_ops._get_board_json(MOCK_BOARD_ID)
 
         self.assertEqual(result, MOCK_BOARD_JSON)
-        self.mock_trello_api.get_board_details.assert_called_once_with(MOCK_BOARD_ID)
+        self.mock_trello_api.get_board_details.assert_called_once_with(MOCK_BOARD_ID, profile=BoardDetailsProfile.FULL)
         # Check internal cache update
         self.assertEqual(self._trello_ops._board_id_to_board_json.get(MOCK_BOARD_ID), MOCK_BOARD_JSON)
 
+    def test_get_board_json_profiles(self):
+        """Tests that a board JSON with all fields is reused for the cards profile, but not the other way around."""
+        self.mock_trello_api.get_board_details.return_value = MOCK_BOARD_JSON
+
+        self._trello_ops._get_board_json(MOCK_BOARD_ID, profile=BoardDetailsProfile.CARDS)
+        self._trello_ops._get_board_json(MOCK_BOARD_ID, profile=BoardDetailsProfile.CARDS)
+        self.mock_trello_api.get_board_details.assert_called_once_with(MOCK_BOARD_ID, profile=BoardDetailsProfile.CARDS)
+
+        self._trello_ops._get_board_json(MOCK_BOARD_ID, profile=BoardDetailsProfile.FULL)
+        self._trello_ops._get_board_json(MOCK_BOARD_ID, profile=BoardDetailsProfile.CARDS)
+        self.assertEqual([call(MOCK_BOARD_ID, profile=BoardDetailsProfile.CARDS), call(MOCK_BOARD_ID, profile=BoardDetailsProfile.FULL)],
+                         self.mock_trello_api.get_board_details.call_args_list)
+
+    @patch('trello_backup.trello.service.TrelloCards')
+    @patch('trello_backup.trello.service.TrelloChecklists')
+    @patch('trello_backup.trello.service.TrelloLists')
+    @patch('trello_backup.trello.service.TrelloBoard')
+    def test_get_lists_and_cards_requests_cards_profile(self, *_):
+        self._trello_ops._get_board_id = Mock(return_value=MOCK_BOARD_ID)
+        self._trello_ops.get_lists_and_cards(MOCK_BOARD_NAME, TrelloFilters.create_default())
+        self.mock_trello_api.get_board_details.assert_called_once_with(MOCK_BOARD_ID, profile=BoardDetailsProfile.CARDS)
+
+    @patch.object(TrelloApi, 'auth_query_params', {'key': "key", 'token': "token"})
+    @patch.object(TrelloApi, '_request')
+    def test_board_details_query_params_of_profile(self, mock_request):
+        mock_request.return_value.text = json.dumps(MOCK_BOARD_JSON)
+
+        TrelloApi.get_board_details(MOCK_BOARD_ID, profile=BoardDetailsProfile.CARDS)
+        params = mock_request.call_args.kwargs["params"]
+        self.assertEqual("none", params["actions"])
+        self.assertEqual("none", params["members"])
+        self.assertNotIn("all", params["card_fields"].split(","))
+        self.assertEqual("token", params["token"])
+
+        TrelloApi.get_board_details(MOCK_BOARD_ID)
+        self.assertEqual("all", mock_request.call_args.kwargs["params"]["actions"])
+        self.assertEqual(BOARD_DETAILS_PARAMS[BoardDetailsProfile.FULL]["card_fields"],
+                         mock_request.call_args.kwargs["params"]["card_fields"])
+
+    @patch.object(TrelloApi, 'auth_query_params', {'key': "key", 'token': "token"})
+    @patch.object(TrelloApi, '_request')
+    def test_board_fingerprint_is_last_activity(self, mock_request):
+        mock_request.return_value.text = json.dumps({"id": MOCK_BOARD_ID, "dateLastActivity": "2025-01-01T10:00:00.000Z"})
+        self.assertEqual("2025-01-01T10:00:00.000Z", TrelloApi.get_board_fingerprint(MOCK_BOARD_ID))
+        self.assertEqual("dateLastActivity", mock_request.call_args.kwargs["params"]["fields"])
+
+
+def _split_fetch_board_json():
+    lists = [{"id": "l1", "name": "To Do", "closed": False, "idBoard": MOCK_BOARD_ID, "pos": 1},
+             {"id": "l2", "name": "Doing", "closed": False, "idBoard": MOCK_BOARD_ID, "pos": 2},
+             {"id": "l3", "name": "Done", "closed": True, "idBoard": MOCK_BOARD_ID, "pos": 3}]
+    cards = [{"id": f"c{idx}", "name": f"Card {idx}", "shortUrl": f"https://trello.com/c/c{idx}", "shortLink": f"c{idx}",
+              "idList": f"l{idx % 3 + 1}", "desc": "Description" if idx % 2 else "",
+              "labels": [{"name": "Urgent"}] if idx % 4 == 0 else [],
+              "idChecklists": [f"cl{idx}"] if idx % 3 == 0 else [], "closed": idx == 4, "due": None,
+              "attachments": [{"id": f"a{idx}", "date": "2025-01-01", "name": "Link", "url": "https://example.com",
+                               "isUpload": False, "fileName": None}] if idx == 1 else []}
+             for idx in range(9)]
+    checklists = [{"id": f"cl{idx}", "name": "Steps", "idBoard": MOCK_BOARD_ID, "idCard": f"c{idx}", "pos": 1,
+                   "checkItems": [{"id": f"i{idx}", "name": "Step", "state": "complete", "pos": 1}]}
+                  for idx in range(0, 9, 3)]
+    return {"id": MOCK_BOARD_ID, "name": MOCK_BOARD_NAME, "lists": lists, "cards": cards, "checklists": checklists}
+
+
+class TestSplitFetch(unittest.TestCase):
+    def setUp(self):
+        self.board_json = _split_fetch_board_json()
+        ctx = Object()
+        ctx.offline = False
+        trello_repository = TrelloRepository(TrelloApi(), OfflineTrelloApi(), NetworkStatusService(ctx))
+        self.title_service = Mock()
+        self._trello_ops = TrelloOperations(trello_repository, Mock(), self.title_service, Mock())
+        self._trello_ops._get_board_id = Mock(return_value=MOCK_BOARD_ID)
+        self.requested_urls = []
+        patchers = [patch.object(TrelloApi, 'auth_query_params', {'key': "key", 'token': "token"}),
+                    patch.object(TrelloApi, '_request', side_effect=self._request)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _request(self, method, url, params=None, **kwargs):
+        """
+        Serves the board details and the cards of a list from the board JSON like the Trello API.
+        """
+        self.requested_urls.append(url)
+        response = Mock()
+        if "/lists/" in url:
+            list_id = url.split("/lists/")[1].split("/")[0]
+            cards = [dict(c) for c in self.board_json["cards"] if c["idList"] == list_id]
+            for card in cards:
+                card["checklists"] = [cl for cl in self.board_json["checklists"] if cl["idCard"] == card["id"]]
+            response.text = json.dumps(cards)
+        elif "cards" in params:
+            response.text = json.dumps(self.board_json)
+        else:
+            response.text = json.dumps({k: v for k, v in self.board_json.items() if k not in ("cards", "checklists")})
+        return response
+
+    @staticmethod
+    def _summary(trello_lists):
+        return [(l.id, [(c.id, c.name, c.description, c.labels, c.closed, [a.id for a in c.attachments],
+                         [(cl.id, [i.value for i in cl.items]) for cl in c.checklists]) for c in l.cards])
+                for l in trello_lists]
+
+    def _assert_same_as_monolithic(self, filters_factory):
+        _, trello_lists = self._trello_ops.get_lists_and_cards(MOCK_BOARD_NAME, filters_factory())
+        expected = self._summary(trello_lists.get())
+        self._trello_ops.refresh()
+        actual = self._summary(self._trello_ops.iter_lists_and_cards(MOCK_BOARD_NAME, filters_factory()))
+        self.assertEqual(expected, actual)
+        return actual
+
+    def test_same_result_as_monolithic_fetch(self):
+        lists = self._assert_same_as_monolithic(TrelloFilters.create_default)
+        self.assertEqual(["l1", "l2", "l3"], [l[0] for l in lists])
+        lists = self._assert_same_as_monolithic(lambda: TrelloFilters([], ListFilter.OPEN, CardFilters.OPEN))
+        self.assertEqual(["l1", "l2"], [l[0] for l in lists])
+        self._assert_same_as_monolithic(lambda: TrelloFilters(["Doing"], ListFilter.ALL, CardFilters.DESC_AND_CHECKLIST))
+
+    def test_same_result_as_monolithic_fetch_with_query(self):
+        from trello_backup.trello.query import CardQueryParser
+        lists = self._assert_same_as_monolithic(
+            lambda: TrelloFilters([], ListFilter.ALL, CardFilters.ALL, card_query=CardQueryParser.parse("label:urgent")))
+        self.assertEqual(["c0", "c4", "c8"], sorted(c[0] for l in lists for c in l[1]))
+
+    def test_only_cards_of_selected_lists_are_downloaded(self):
+        lists = list(self._trello_ops.iter_lists_and_cards(MOCK_BOARD_NAME, TrelloFilters([], ListFilter.OPEN, CardFilters.OPEN)))
+        self.assertEqual(["l1", "l2"], [l.id for l in lists])
+        list_urls = [url for url in self.requested_urls if "/lists/" in url]
+        self.assertEqual(["https://api.trello.com/1/lists/l1/cards", "https://api.trello.com/1/lists/l2/cards"], sorted(list_urls))
+        self.assertEqual(2, self.title_service.process_list_checklist_titles.call_count)
+
+    def test_each_thread_has_its_own_http_session(self):
+        sessions = {}
+        with patch.object(TrelloApi, '_http_sessions', threading.local()):
+            def get_session(name):
+                sessions[name] = TrelloApi._get_http_session()
+            threads = [threading.Thread(target=get_session, args=(name, )) for name in ("t1", "t2")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertIs(TrelloApi._get_http_session(), TrelloApi._get_http_session())
+        self.assertIsNot(sessions["t1"], sessions["t2"])
+
 
 class TestTrelloTitleService(unittest.TestCase):
     def setUp(self):
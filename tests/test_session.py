@@ -0,0 +1,145 @@
+import hashlib
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from trello_backup.session import SessionManifest, BackupIndex, OutputFileRecord
+from trello_backup.trello.api import ApiCallStats
+
+
+class SessionTestBase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _create_session(self, name, boards=None, cards=None, previous=None):
+        backup_dir = os.path.join(self.output_dir, f"session-{name}", "backups")
+        os.makedirs(backup_dir)
+        manifest = SessionManifest(backup_dir)
+        for board_name, fingerprint in (boards or {}).items():
+            file_path = os.path.join(backup_dir, f"board-{board_name}.html")
+            with open(file_path, "w") as f:
+                f.write(board_name)
+            board_json = {"id": f"id-{board_name}", "cards": cards or []}
+            manifest.add_board(manifest.create_board_record(board_name, f"id-{board_name}", fingerprint,
+                                                            [("html_file", file_path, 0.5, False)],
+                                                            board_json=board_json, previous=previous,
+                                                            elapsed=1.5, api_calls={"GET /1/boards/:id": 2}))
+        if boards is not None:
+            manifest.save()
+        return manifest
+
+
+class TestSessionManifest(SessionTestBase):
+    def test_save_and_load(self):
+        backup_dir = self._create_session("1", {"b1": "fp1"}).backup_dir
+        manifest = SessionManifest.load(backup_dir)
+        board = manifest.boards["b1"]
+        self.assertEqual("fp1", board.fingerprint)
+        self.assertEqual("id-b1", board.board_id)
+        self.assertEqual(1.5, board.elapsed)
+        self.assertEqual([OutputFileRecord("html_file", "board-b1.html", 2, hashlib.sha256(b"b1").hexdigest(), 0.5)],
+                         board.files)
+        self.assertEqual("session-1", manifest.session_name)
+        self.assertEqual({"GET /1/boards/:id": 2}, manifest.to_dict()["api_calls"])
+        self.assertIsNone(SessionManifest.load(self.output_dir))
+
+    def test_find_previous_returns_latest_session(self):
+        self._create_session("1", {"b1": "old"})
+        time.sleep(0.01)
+        self._create_session("2", {"b1": "new"})
+        self._create_session("3")
+        current = self._create_session("4")
+
+        previous = SessionManifest.find_previous(current.backup_dir)
+        self.assertEqual("new", previous.boards["b1"].fingerprint)
+
+    def test_get_reusable_files(self):
+        backup_dir = self._create_session("1", {"b1": "fp1"}).backup_dir
+        manifest = SessionManifest.load(backup_dir)
+        self.assertEqual([("html_file", os.path.join(backup_dir, "board-b1.html"), "board-b1.html")],
+                         manifest.get_reusable_files("b1", "fp1"))
+        self.assertIsNone(manifest.get_reusable_files("b1", "fp2"))
+        self.assertIsNone(manifest.get_reusable_files("b2", "fp1"))
+
+        os.remove(os.path.join(backup_dir, "board-b1.html"))
+        self.assertIsNone(manifest.get_reusable_files("b1", "fp1"))
+
+    def test_changed_cards(self):
+        previous = self._create_session("1", {"b1": "fp1"}, cards=[{"id": "c1", "name": "a"}, {"id": "c2", "name": "b"}])
+        self.assertEqual(["c1", "c2"], previous.boards["b1"].changed_card_ids)
+        current = self._create_session("2", {"b1": "fp2"}, previous=previous,
+                                       cards=[{"id": "c1", "name": "a"}, {"id": "c2", "name": "changed"}, {"id": "c3"}])
+        self.assertEqual(["c2", "c3"], current.boards["b1"].changed_card_ids)
+
+
+class TestBackupIndex(SessionTestBase):
+    def test_latest_and_sessions_touching_card(self):
+        index_file = os.path.join(self.output_dir, "backup-index.jsonl")
+        index = BackupIndex(index_file)
+        self.assertIsNone(index.latest("b1"))
+        self.assertIsNone(index.latest_session())
+
+        first = self._create_session("1", {"b1": "fp1"}, cards=[{"id": "c1"}, {"id": "c2"}])
+        index.append(first, first.boards["b1"])
+        second = self._create_session("2", {"b1": "fp2"}, cards=[{"id": "c1"}, {"id": "c2", "name": "x"}],
+                                      previous=first)
+        index.append(second, second.boards["b1"])
+
+        # A new instance reads the appended lines
+        index = BackupIndex(index_file)
+        latest = index.latest("b1")
+        self.assertEqual("session-2", latest["session"])
+        self.assertEqual("fp2", latest["fingerprint"])
+        self.assertEqual(second.backup_dir, latest["backup_dir"])
+        self.assertEqual("session-2", index.latest_session())
+        self.assertEqual([first.backup_dir], index.backup_dirs_changing_card("c1"))
+        self.assertEqual([first.backup_dir, second.backup_dir], index.backup_dirs_changing_card("c2"))
+        self.assertEqual([], index.backup_dirs_changing_card("c3"))
+
+    def test_latest_is_read_without_the_index(self):
+        index_file = os.path.join(self.output_dir, "backup-index.jsonl")
+        first = self._create_session("1", {"b1": "fp1", "b2": "fp1"})
+        index = BackupIndex(index_file)
+        for board_name in ("b1", "b2"):
+            index.append(first, first.boards[board_name])
+        second = self._create_session("2", {"b1": "fp2"}, previous=first)
+        index.append(second, second.boards["b1"])
+
+        index = BackupIndex(index_file)
+        with patch.object(BackupIndex, '_iter_entries') as mock_iter_entries:
+            self.assertEqual("session-2", index.latest("b1")["session"])
+            self.assertEqual("session-1", index.latest("b2")["session"])
+            self.assertEqual("session-2", index.latest_session())
+        mock_iter_entries.assert_not_called()
+        self.assertNotIn("changed_card_ids", index.latest("b1"))
+
+    def test_latest_is_rebuilt_from_the_index(self):
+        index_file = os.path.join(self.output_dir, "backup-index.jsonl")
+        first = self._create_session("1", {"b1": "fp1"})
+        BackupIndex(index_file).append(first, first.boards["b1"])
+        os.remove(os.path.join(self.output_dir, "backup-index-latest.json"))
+
+        self.assertEqual("session-1", BackupIndex(index_file).latest("b1")["session"])
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "backup-index-latest.json")))
+
+
+class TestApiCallStats(unittest.TestCase):
+    def test_record_and_diff(self):
+        stats = ApiCallStats()
+        stats.record("get", "https://api.trello.com/1/members/me/boards?fields=name")
+        before = stats.snapshot()
+        stats.record("GET", "https://api.trello.com/1/boards/5f1b2c3d4e5f60718293a4b5")
+        stats.record("GET", "https://api.trello.com/1/cards/5f1b2c3d4e5f60718293a4b6/actions")
+        stats.record("GET", "https://api.trello.com/1/boards/5f1b2c3d4e5f60718293a4b7")
+        self.assertEqual({"GET /1/boards/:id": 2, "GET /1/cards/:id/actions": 1},
+                         ApiCallStats.diff(before, stats.snapshot()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import copy
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from trello_backup.exception import TrelloSnapshotException, TrelloException
+from trello_backup.snapshot import SnapshotStore
+from trello_backup.trello.api import BackupTrelloApi, NetworkStatusService, TrelloRepository, OfflineTrelloApi
+
+
+class TestSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(os.path.join(self.tmp_dir.name, "snapshots"))
+        self.board_json = {
+            "id": "board_1",
+            "name": "Test Board",
+            "cards": [{"id": f"c{idx}", "name": f"Card {idx}", "desc": "árvíztűrő"} for idx in range(3)],
+            "lists": [{"id": "l1", "name": "To Do"}],
+            "checklists": [],
+            "actions": [{"id": "a1", "type": "createCard"}],
+            "labels": [{"id": "lb1", "name": "Bug"}],
+        }
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _count_objects(self):
+        return sum(len(files) for _, _, files in os.walk(os.path.join(self.tmp_dir.name, "snapshots", "objects")))
+
+    def test_roundtrip(self):
+        self.store.put_board("session-1", "Test Board", self.board_json)
+        self.assertEqual(self.board_json, self.store.get_board("session-1", "Test Board"))
+        self.assertEqual(list(self.board_json.keys()), list(self.store.get_board("session-1", "Test Board").keys()))
+        self.assertEqual(["session-1"], self.store.get_sessions())
+        self.assertEqual(["Test Board"], self.store.get_boards("session-1"))
+
+    def test_unchanged_objects_are_stored_once(self):
+        self.store.put_board("session-1", "Test Board", self.board_json)
+        # 3 cards, 1 list, 1 action and the root
+        self.assertEqual(6, self._count_objects())
+
+        self.board_json["cards"][1]["name"] = "Renamed"
+        self.store.put_board("session-2", "Test Board", self.board_json)
+        # The changed card and the new root
+        self.assertEqual(8, self._count_objects())
+        self.assertEqual("Card 1", self.store.get_board("session-1", "Test Board")["cards"][1]["name"])
+        self.assertEqual("Renamed", self.store.get_board("session-2", "Test Board")["cards"][1]["name"])
+
+    def test_export_latest_session(self):
+        self.store.put_board("session-1", "Test Board", {"id": "board_1", "cards": []})
+        self.store.put_board("session-2", "Test Board", self.board_json)
+        output_dir = os.path.join(self.tmp_dir.name, "export")
+        files = self.store.export(None, output_dir)
+        self.assertEqual([os.path.join(output_dir, "board-test-board.json")], files)
+        with open(files[0]) as f:
+            self.assertEqual(json.dumps(self.board_json, indent=4), f.read())
+
+    def test_missing_snapshots(self):
+        with self.assertRaises(TrelloSnapshotException):
+            self.store.export(None, self.tmp_dir.name)
+        self.store.put_board("session-1", "Test Board", self.board_json)
+        with self.assertRaises(TrelloSnapshotException):
+            self.store.get_board("session-1", "Other Board")
+        with self.assertRaises(TrelloSnapshotException):
+            self.store.export("session-2", self.tmp_dir.name)
+
+    def test_loaded_board_is_cached(self):
+        self.store.put_board("session-1", "Test Board", self.board_json)
+        self.assertEqual(self.board_json, self.store.get_board("session-1", "Test Board"))
+        with patch.object(SnapshotStore, '_get_object') as mock_get_object:
+            self.assertEqual(self.board_json, self.store.get_board("session-1", "Test Board"))
+        mock_get_object.assert_not_called()
+
+        # The cache is replaced when another snapshot of the board is loaded
+        changed = copy.deepcopy(self.board_json)
+        changed["cards"][0]["name"] = "Changed"
+        self.store.put_board("session-2", "Test Board", changed)
+        self.assertEqual(changed, self.store.get_board("session-2", "Test Board"))
+        self.assertEqual(self.board_json, self.store.get_board("session-1", "Test Board"))
+
+
+class TestBackupTrelloApi(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(self.tmp_dir.name)
+        self.old_board = {"id": "board_1", "cards": [], "lists": [{"id": "l1"}], "checklists": []}
+        self.board = {
+            "id": "board_1",
+            "cards": [{"id": "c1", "shortLink": "AbC123", "idList": "l1", "idChecklists": ["cl1"]}],
+            "lists": [{"id": "l1", "name": "To Do"}],
+            "checklists": [{"id": "cl1", "name": "Steps", "idCard": "c1"}],
+            "actions": [{"id": "a1", "type": "commentCard", "data": {"card": {"id": "c1"}, "text": "hi"}}],
+        }
+        self.store.put_board("session-1", "Board", self.old_board)
+        self.store.put_board("session-2", "Board", self.board)
+        self.store.put_board("session-2", "Other", {"id": "board_2", "cards": [], "lists": [], "checklists": []})
+        self.api = BackupTrelloApi(self.store)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_boards_of_latest_or_given_session(self):
+        self.assertEqual({"Board": "board_1", "Other": "board_2"}, self.api.list_boards())
+        self.assertEqual(self.board, self.api.get_board_details(self.api.get_board_id("Board")))
+        api = BackupTrelloApi(self.store, "session-1")
+        self.assertEqual(self.old_board, api.get_board_details(api.get_board_id("Board")))
+        with self.assertRaises(KeyError):
+            api.get_board_id("Other")
+        with self.assertRaises(TrelloException):
+            BackupTrelloApi(self.store, "session-3").list_boards()
+
+    def test_unknown_board_id(self):
+        for get in (self.api.get_board_details, self.api.get_board_fingerprint):
+            with self.assertRaises(KeyError) as ctx:
+                get("board_3")
+            self.assertIn("board_3", str(ctx.exception))
+            self.assertIn("Board (board_1)", str(ctx.exception))
+
+    def test_cards_lists_and_checklists_by_id(self):
+        card = self.api.download_card_by_share_link("https://trello.com/c/AbC123/12-card-name")
+        self.assertEqual("c1", card["id"])
+        self.assertEqual("To Do", self.api.get_list_by_id("l1")["name"])
+        self.assertEqual("Steps", self.api.get_checklist_by_id("cl1")["name"])
+        self.assertEqual(["a1"], [a["id"] for a in self.api.get_actions_for_card("c1")])
+        with self.assertRaises(TrelloException):
+            self.api.download_card_by_share_link("https://trello.com/c/missing")
+
+    def test_share_link_lookup_stops_at_first_board_with_card(self):
+        with patch.object(self.store, "get_board", wraps=self.store.get_board) as get_board:
+            self.api.download_card_by_share_link("https://trello.com/c/AbC123")
+            self.api.get_list_by_id("l1")
+            self.api.get_checklist_by_id("cl1")
+        self.assertEqual([("session-2", "Board")], [c.args for c in get_board.call_args_list])
+
+    def test_split_fetch(self):
+        self.assertEqual([{"id": "l1", "name": "To Do"}], self.api.get_board_lists("board_1")["lists"])
+        self.assertNotIn("cards", self.api.get_board_lists("board_1"))
+        self.assertEqual([("l1", {"cards": self.board["cards"], "checklists": self.board["checklists"]}),
+                          ("l2", {"cards": [], "checklists": []})],
+                         list(self.api.iter_cards_of_lists("board_1", ["l1", "l2"])))
+
+    def test_cards_are_not_deleted(self):
+        self.api.delete_card("c1")
+        self.assertEqual(["c1"], self.api.planned_deletions)
+
+    def test_refresh_sees_new_sessions(self):
+        self.assertEqual(self.board, self.api.get_board_details("board_1"))
+        changed = copy.deepcopy(self.board)
+        changed["cards"][0]["name"] = "Changed"
+        self.store.put_board("session-3", "Board", changed)
+        self.assertEqual(self.board, self.api.get_board_details("board_1"))
+        self.api.refresh()
+        self.assertEqual(changed, self.api.get_board_details("board_1"))
+
+    def test_repository_prefers_backup_api(self):
+        class Ctx:
+            offline = False
+        repository = TrelloRepository(None, OfflineTrelloApi(), NetworkStatusService(Ctx()), backup_api=self.api)
+        self.assertIs(self.api, repository.get_api())
+
+
+if __name__ == '__main__':
+    unittest.main()
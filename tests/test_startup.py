@@ -0,0 +1,76 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+# Cumulative import time of the CLI module, generous so that slow CI machines do not fail.
+# Before imports were made lazy the CLI import took ~550ms locally, it is now ~180ms.
+IMPORT_TIME_BUDGET_US = 400_000
+HEAVY_MODULES = ["requests", "bs4", "markdown", "pythoncommons.logging_setup", "pytest",
+                 "trello_backup.trello.service", "trello_backup.trello.api"]
+# Modules of the stores, only imported when a command creates its handler
+STORE_MODULES = ["sqlite3", "trello_backup.snapshot", "trello_backup.trello.search", "trello_backup.cmd_handler"]
+CLI_MODULE = "trello_backup.cli.cli"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+USAGE_SCRIPT = f"""
+import json, sys
+from trello_backup.cli.cli import cli, register_commands
+from trello_backup.constants import FilePath, cached_classproperty
+register_commands()
+cli.main(args=["usage"], prog_name="trello-backup", standalone_mode=False)
+print(json.dumps({{
+    "heavy_modules": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+    "repo_root_resolved": not isinstance(FilePath.__dict__["REPO_ROOT_DIR"], cached_classproperty),
+}}))
+"""
+
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        self.home_dir = tempfile.TemporaryDirectory()
+        self.env = dict(os.environ, HOME=self.home_dir.name)
+
+    def tearDown(self):
+        self.home_dir.cleanup()
+
+    def _run_python(self, *args) -> subprocess.CompletedProcess:
+        return subprocess.run([sys.executable, *args], env=self.env, cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+
+    def test_import_time_budget(self):
+        # Best of 3 runs, the first run may also compile the bytecode
+        times = []
+        for _ in range(3):
+            result = self._run_python("-X", "importtime", "-c", f"import {CLI_MODULE}")
+            lines = [line for line in result.stderr.splitlines()
+                     if line.startswith("import time:") and line.split("|")[-1].strip() == CLI_MODULE]
+            self.assertEqual(1, len(lines), result.stderr)
+            times.append(int(lines[0].split("|")[1]))
+        self.assertLess(min(times), IMPORT_TIME_BUDGET_US)
+
+    def test_usage_does_not_load_heavy_modules(self):
+        result = self._run_python("-c", USAGE_SCRIPT)
+        self.assertIn("Trello CLI", result.stdout)
+        state = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertEqual([], state["heavy_modules"])
+        self.assertFalse(state["repo_root_resolved"])
+
+    def _get_loaded_modules(self, module: str, modules) -> list:
+        result = self._run_python("-c", f"import json, sys; import {module}; "
+                                        f"print(json.dumps([m for m in {modules!r} if m in sys.modules]))")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_import_does_not_load_stores(self):
+        self.assertEqual([], self._get_loaded_modules(CLI_MODULE, HEAVY_MODULES + STORE_MODULES))
+        self.assertEqual([], self._get_loaded_modules("trello_backup.trello.api",
+                                                      STORE_MODULES + ["trello_backup.display.output"]))
+
+    def test_import_does_not_create_output_dirs(self):
+        self._run_python("-c", f"import {CLI_MODULE}")
+        self.assertEqual([], os.listdir(self.home_dir.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from trello_backup.display.table import HtmlTableWriter
+
+HEADER = ["List", "Card", "Description"]
+
+
+class TestHtmlTableWriter(unittest.TestCase):
+    def _render(self, rows, **kwargs):
+        return "".join(HtmlTableWriter(HEADER, title="Board <1>", **kwargs).iter_html(rows))
+
+    def test_cells_are_escaped(self):
+        html = self._render([["To Do", "<script>alert(1)</script>", "a & b"]])
+        self.assertIn("<title>Board &lt;1&gt;</title>", html)
+        self.assertIn("<td>&lt;script&gt;alert(1)&lt;/script&gt;</td>", html)
+        self.assertIn("<td>a &amp; b</td>", html)
+        self.assertNotIn("<script>alert", html)
+
+    def test_sections_by_column(self):
+        rows = [["To Do", "c1", ""], ["To Do", "c2", ""], ["Done", "c3", ""]]
+        html = self._render(rows, section_col="List")
+        self.assertEqual(2, html.count('<tr class="section">'))
+        self.assertEqual(2, html.count("<tbody>"))
+        self.assertEqual(3, html.count('<tr class="row">'))
+        self.assertLess(html.index('colspan="3">To Do'), html.index('colspan="3">Done'))
+
+    def test_no_sections_without_column(self):
+        html = self._render([["To Do", "c1", ""]], section_col="Unknown")
+        self.assertNotIn('<tr class="section">', html)
+
+    def test_pagination_only_for_large_tables(self):
+        rows = [["To Do", f"c{i}", ""] for i in range(5)]
+        self.assertNotIn("pageSize", self._render(rows, page_size=5))
+        self.assertIn("const pageSize = 2;", self._render(rows, page_size=2))
+        self.assertNotIn("pageSize", self._render(rows))
+
+    def test_write_file(self):
+        rows = ([f"List {i // 100}", f"Card {i}", "desc"] for i in range(1000))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file = os.path.join(tmp_dir, "table.html")
+            HtmlTableWriter(HEADER, section_col="List", page_size=100).write_file(file, rows)
+            with open(file) as f:
+                html = f.read()
+        self.assertEqual(1000, html.count('<tr class="row">'))
+        self.assertEqual(10, html.count('<tr class="section">'))
+        self.assertTrue(html.endswith("</body></html>\n"))
+
+
+if __name__ == '__main__':
+    unittest.main()
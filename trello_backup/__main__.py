@@ -0,0 +1,20 @@
+import sys
+
+from trello_backup.daemon import DaemonClient
+
+
+def main():
+    """
+    Thin entry point: commands are forwarded to the daemon if it is running, otherwise the CLI runs in this process.
+    The CLI is not imported for forwarded commands.
+    """
+    exit_code = DaemonClient.forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from trello_backup.cli.cli import main as cli_main
+    cli_main(forward=False)
+
+
+if __name__ == "__main__":
+    main()
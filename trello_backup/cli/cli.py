@@ -1,18 +1,21 @@
+import sys
 import time
+from typing import Optional
 
 import click
 from pythoncommons.constants import ExecutionMode
-from pythoncommons.logging_setup import DEFAULT_FORMAT
-from rich import print as rich_print, box
 
 from trello_backup.cli.commands.backup import backup
 from trello_backup.cli.commands.print import print
 from trello_backup.cli.commands.cleanup import cleanup
-from rich.table import Table
+from trello_backup.cli.commands.diff import diff
+from trello_backup.cli.commands.search import search
+from trello_backup.cli.commands.daemon import daemon
 
 from trello_backup.cli.context import ClickContextWrapper, TrelloGroup
 from trello_backup.display.console import CliLogger
-from trello_backup.constants import FilePath
+from trello_backup.constants import FilePath, LATEST_BACKUP
+from trello_backup.daemon import DaemonClient
 from trello_backup.exception import TrelloException
 from trello_backup.cli.prompt import TrelloPrompt
 from trello_backup.utils import LoggingUtils
@@ -23,6 +26,7 @@ CLI_LOG = CliLogger(LOG)
 
 
 def setup_dirs(ctx: ClickContextWrapper, use_session_dir: bool, add_console_handler: bool = False):
+    FilePath.ensure_output_dirs_created()
     logs_dir = FilePath.get_logs_dir(use_session_dir)
     if use_session_dir:
         ctx.session_dir = FilePath.get_session_dir()
@@ -38,12 +42,23 @@ def setup_dirs(ctx: ClickContextWrapper, use_session_dir: bool, add_console_hand
 @click.option('--debug/--no-debug', default=False)
 @click.option('--dry-run', is_flag=True, default=False)
 @click.option('--offline', is_flag=True, default=False)
+@click.option('--from-backup', "from_backup", is_flag=True, default=False,
+              help="Read boards from the snapshot store instead of the Trello API. "
+                   "Defaults to the latest backup of each board, see --backup-session.")
+@click.option('--backup-session', "backup_session", required=False, default=None,
+              help="Session to read boards from with --from-backup, implies --from-backup.")
+@click.option('--parsed-board-cache', "parsed_board_cache", is_flag=True, default=False,
+              help="Keep the parsed lists and cards of print and cleanup in a binary cache per board, "
+                   "used as long as the board does not change. Always used with --from-backup.")
 @click.option('-s', '--session-dir', is_flag=True, default=True, help='Whether to use session dir to save output files.')
 @click.pass_context
 def cli(ctx: ClickContextWrapper,
         debug: bool,
         dry_run: bool = False,
         offline: bool = False,
+        from_backup: bool = False,
+        backup_session: Optional[str] = None,
+        parsed_board_cache: bool = False,
         session_dir: bool = True):
     if ctx.invoked_subcommand == "usage":
         return
@@ -53,6 +68,9 @@ def cli(ctx: ClickContextWrapper,
     ctx.log_level = level
     ctx.dry_run = dry_run
     ctx.offline = offline
+    ctx.from_backup = backup_session if backup_session else (LATEST_BACKUP if from_backup else None)
+    # The fingerprint of a backed up board is the hash of its snapshot, so the cache is always used for backups
+    ctx.parsed_board_cache = parsed_board_cache or ctx.from_backup is not None
 
     LOG.info("Invoked command %s", ctx.invoked_subcommand)
     setup_dirs(ctx, session_dir)
@@ -66,6 +84,9 @@ def usage(no_wrap: bool = False):
     """
     Prints the aggregated usage of cli
     """
+    from rich import print as rich_print, box
+    from rich.table import Table
+
     table = Table(title="Trello CLI", show_lines=True, box=box.SQUARE)
     table.add_column("Command", no_wrap=no_wrap)
     table.add_column("Description", no_wrap=no_wrap)
@@ -94,16 +115,32 @@ def usage(no_wrap: bool = False):
 
 
 
-if __name__ == "__main__":
+def register_commands():
+    cli.add_command(backup)
+    cli.add_command(print)
+    cli.add_command(cleanup)
+    cli.add_command(diff)
+    cli.add_command(search)
+    cli.add_command(daemon)
+    # TODO ASAP cli Add new command: Delete cards with confirmation (one by one or by lists)
+    #   Given board name, list id -> Validate
+    #   Remove cards one by one (in same order of the list on frontend) and ask for confirmation + Add tests
+
+
+def main(forward: bool = True):
+    """
+    :param forward: Whether to forward the command to the daemon if it is running,
+    False if the entry point has already tried it.
+    """
+    if forward:
+        exit_code = DaemonClient.forward(sys.argv[1:])
+        if exit_code is not None:
+            sys.exit(exit_code)
+
     LOG.info("Started Trello CLI")
     start_time = time.time()
     try:
-        cli.add_command(backup)
-        cli.add_command(print)
-        cli.add_command(cleanup)
-        # TODO ASAP cli Add new command: Delete cards with confirmation (one by one or by lists)
-        #   Given board name, list id -> Validate
-        #   Remove cards one by one (in same order of the list on frontend) and ask for confirmation + Add tests
+        register_commands()
         cli()
         end_time = time.time()
         LOG.info("Trello CLI execution finished after %d seconds", int(end_time - start_time))
@@ -114,3 +151,7 @@ if __name__ == "__main__":
         end_time = time.time()
         LOG.info("Error during execution after %d seconds", int(end_time - start_time))
         exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,33 @@
 import logging
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 
 import click
 from click import BadOptionUsage
 
 from trello_backup.cli.common import CliCommon, get_handler_and_setup_ctx
 from trello_backup.cli.context import TrelloCommand
-from trello_backup.display.output import BackupReport
+from trello_backup.display.console import CliLogger
+from trello_backup.display.output import BackupReport, OutputType
+from trello_backup.exception import TrelloException
+from trello_backup.trello.query import QUERY_OPTION_HELP
 
 LOG = logging.getLogger(__name__)
+CLI_LOG = CliLogger(LOG)
+
+SHARD_BY_LIST_OPTION_HELP = ("Write the outputs of each list to separate files with an index page. "
+                             "Files of lists unchanged since the last backup are reused.")
+FORMATS_OPTION_HELP = (f"Comma separated list of output formats to write: {', '.join(t.cli_name for t in OutputType)}. "
+                       f"Defaults to the 'output_formats' config or all formats except csv_gzip.")
+
+
+def _parse_formats(ctx, param, value: Optional[str]) -> Optional[List[OutputType]]:
+    if not value:
+        return None
+    try:
+        return OutputType.from_names(value.split(","))
+    except TrelloException as e:
+        raise click.BadParameter(str(e))
+
 
 # TODO ASAP Add documentation to each command + subcommand
 @click.group()
@@ -17,25 +36,44 @@ def backup():
 
 
 @backup.command(cls=TrelloCommand)
+@click.option('-q', '--query', "query", required=False, help=QUERY_OPTION_HELP)
+@click.option('-f', '--formats', "output_types", required=False, callback=_parse_formats, help=FORMATS_OPTION_HELP)
+@click.option('--shard-by-list', is_flag=True, default=False, help=SHARD_BY_LIST_OPTION_HELP)
 @click.pass_context
 @click.argument("board_name")
-def board(ctx, board_name: str):
+def board(ctx, board_name: str, query: Optional[str] = None, output_types: Optional[List[OutputType]] = None,
+          shard_by_list: bool = False):
     handler = get_handler_and_setup_ctx(ctx)
     report = BackupReport()
     # TODO ASAP Print generated file names in the end from report
-    # TODO Output make OutputTypes configurable via CLI
-    report = handler.backup_board(board_name, report)
+    report = handler.backup_board(board_name, report, query=query, output_types=output_types,
+                                  shard_by_list=shard_by_list)
     report.print()
     return report
 
 
 @backup.command(cls=TrelloCommand)
+@click.option('-q', '--query', "query", required=False, help=QUERY_OPTION_HELP)
+@click.option('-f', '--formats', "output_types", required=False, callback=_parse_formats, help=FORMATS_OPTION_HELP)
+@click.option('--shard-by-list', is_flag=True, default=False, help=SHARD_BY_LIST_OPTION_HELP)
 @click.pass_context
-def boards(ctx):
+def boards(ctx, query: Optional[str] = None, output_types: Optional[List[OutputType]] = None,
+           shard_by_list: bool = False):
     handler = get_handler_and_setup_ctx(ctx)
     report = BackupReport()
     # TODO ASAP Print generated file names in the end from report
-    # TODO Output make OutputTypes configurable via CLI
-    report = handler.backup_all_boards(report)
+    report = handler.backup_all_boards(report, query=query, output_types=output_types, shard_by_list=shard_by_list)
     report.print()
     return report
+
+
+@backup.command(cls=TrelloCommand, name="export-snapshot")
+@click.option('--session', "session", required=False,
+              help="Session to export the board JSONs of, e.g. session-20250101_120000. Defaults to the latest session.")
+@click.option('-b', '--board', "board_names", multiple=True, help="Board to export. Defaults to all boards of the session.")
+@click.option('-o', '--output-dir', "output_dir", required=False, help="Defaults to the backup dir of the current session.")
+@click.pass_context
+def export_snapshot(ctx, session: Optional[str] = None, board_names: Tuple[str] = (), output_dir: Optional[str] = None):
+    handler = get_handler_and_setup_ctx(ctx)
+    for file_path in handler.export_snapshot(session, list(board_names), output_dir=output_dir):
+        CLI_LOG.info("Exported board JSON: %s", file_path)
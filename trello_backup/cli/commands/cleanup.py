@@ -1,9 +1,10 @@
 import logging
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 
 import click
 from trello_backup.cli.common import CliCommon, get_handler_and_setup_ctx
 from trello_backup.cli.context import TrelloCommand
+from trello_backup.trello.query import QUERY_OPTION_HELP
 
 LOG = logging.getLogger(__name__)
 
@@ -16,9 +17,10 @@ def cleanup():
 
 @cleanup.command(cls=TrelloCommand)
 @click.option('-l', '--filter-list', "filter_list",  multiple=True, required=False, help='Only cleanup the specified lists')
+@click.option('-q', '--query', "query", required=False, help=QUERY_OPTION_HELP)
 @click.pass_context
 @click.argument("board_name")
-def board(ctx, board_name: str, filter_list: Tuple[str]):
+def board(ctx, board_name: str, filter_list: Tuple[str], query: Optional[str] = None):
     filter_list = list(filter_list)
     handler = get_handler_and_setup_ctx(ctx)
-    handler.cleanup_board(board_name, filter_list)
+    handler.cleanup_board(board_name, filter_list, query=query)
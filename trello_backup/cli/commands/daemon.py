@@ -0,0 +1,39 @@
+import logging
+
+import click
+
+from trello_backup.cli.context import TrelloCommand
+from trello_backup.daemon import TrelloDaemon, DaemonClient
+from trello_backup.display.console import CliLogger
+
+LOG = logging.getLogger(__name__)
+CLI_LOG = CliLogger(LOG)
+
+
+@click.group()
+def daemon():
+    """
+    Long-running local process that keeps caches warm for repeated print, search and diff commands.
+    """
+    pass
+
+
+@daemon.command(cls=TrelloCommand)
+def start():
+    """
+    Starts the daemon in the foreground.
+    """
+    TrelloDaemon().serve()
+
+
+@daemon.command(cls=TrelloCommand)
+def stop():
+    if DaemonClient().stop():
+        CLI_LOG.info("Stopped trello-backup daemon")
+    else:
+        CLI_LOG.info("Daemon is not running")
+
+
+@daemon.command(cls=TrelloCommand)
+def status():
+    CLI_LOG.info("Daemon is running" if DaemonClient().is_running() else "Daemon is not running")
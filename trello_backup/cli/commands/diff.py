@@ -0,0 +1,29 @@
+import logging
+from typing import Optional
+
+import click
+
+from trello_backup.cli.common import get_handler_and_setup_ctx
+from trello_backup.cli.context import TrelloCommand
+
+LOG = logging.getLogger(__name__)
+
+FROM_OPTION_HELP = ("Session or board JSON file to compare from, e.g. session-20250101_120000. "
+                    "Defaults to the snapshot before the one compared to, "
+                    "or to the latest snapshot if a board JSON file is compared.")
+TO_OPTION_HELP = "Session or board JSON file to compare to. Defaults to the latest snapshot of the board."
+
+
+@click.group()
+def diff():
+    pass
+
+
+@diff.command(cls=TrelloCommand)
+@click.option('--from', "from_source", required=False, help=FROM_OPTION_HELP)
+@click.option('--to', "to_source", required=False, help=TO_OPTION_HELP)
+@click.pass_context
+@click.argument("board_name")
+def board(ctx, board_name: str, from_source: Optional[str] = None, to_source: Optional[str] = None):
+    handler = get_handler_and_setup_ctx(ctx)
+    handler.diff_board(board_name, from_source=from_source, to_source=to_source)
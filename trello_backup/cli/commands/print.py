@@ -1,12 +1,15 @@
 import logging
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 
 import click
 
 from trello_backup.cli.common import get_handler_and_setup_ctx
 from trello_backup.cli.context import TrelloCommand
+from trello_backup.trello.query import QUERY_OPTION_HELP
 
 LOG = logging.getLogger(__name__)
+SPLIT_FETCH_OPTION_HELP = ("Download the lists of the board first, then the cards of each list concurrently, "
+                           "printing each list as soon as it arrives. Faster first output for very large boards.")
 
 # TODO ASAP Add documentation to each command + subcommand
 @click.group()
@@ -17,12 +20,14 @@ def print():
 
 @print.command(cls=TrelloCommand)
 @click.option('-l', '--filter-list', "filter_list",  multiple=True, required=False, help='Only print the specified lists')
+@click.option('-q', '--query', "query", required=False, help=QUERY_OPTION_HELP)
+@click.option('--split-fetch', is_flag=True, default=False, help=SPLIT_FETCH_OPTION_HELP)
 @click.pass_context
 @click.argument("board_name")
-def board(ctx, board_name: str, filter_list: Tuple[str]):
+def board(ctx, board_name: str, filter_list: Tuple[str], query: Optional[str] = None, split_fetch: bool = False):
     filter_list = list(filter_list)
     handler = get_handler_and_setup_ctx(ctx)
-    handler.print_cards(board_name, filter_list)
+    handler.print_cards(board_name, filter_list, query=query, split_fetch=split_fetch)
 
 @print.command(cls=TrelloCommand)
 @click.pass_context
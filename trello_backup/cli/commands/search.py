@@ -0,0 +1,24 @@
+import logging
+from typing import Optional
+
+import click
+
+from trello_backup.cli.common import get_handler_and_setup_ctx
+from trello_backup.cli.context import TrelloCommand
+from trello_backup.constants import SEARCH_RESULT_LIMIT
+
+LOG = logging.getLogger(__name__)
+
+
+@click.command(cls=TrelloCommand)
+@click.option('-b', '--board', "board_name", required=False, help="Only search the cards of this board")
+@click.option('-n', '--limit', "limit", type=int, default=SEARCH_RESULT_LIMIT, show_default=True,
+              help="Maximum number of cards to print")
+@click.pass_context
+@click.argument("query", nargs=-1, required=True)
+def search(ctx, query, board_name: Optional[str] = None, limit: int = SEARCH_RESULT_LIMIT):
+    """
+    Searches the cards of the backed up boards. Terms are AND-ed, a trailing '*' matches prefixes.
+    """
+    handler = get_handler_and_setup_ctx(ctx)
+    handler.search(" ".join(query), board_name=board_name, limit=limit)
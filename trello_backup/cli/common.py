@@ -1,18 +1,19 @@
 import logging
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Iterable, Optional, Dict, Tuple, TYPE_CHECKING
 
-from trello_backup.config_parser.config import ConfigLoader, ConfigReader, TrelloConfig, TrelloCfg
-from trello_backup.config_parser.config_validation import ConfigValidator, ValidationContext, ConfigSource
-from trello_backup.constants import FilePath
-from trello_backup.display.output import OutputHandlerFactory, MarkdownFormatter, TrelloDataConverter
+from trello_backup.constants import FilePath, LATEST_BACKUP
 from trello_backup.exception import TrelloConfigException
-from trello_backup.http_server import HttpServer, HTTP_SERVER_PORT
-from trello_backup.trello.api import TrelloApi, TrelloRepository, OfflineTrelloApi, NetworkStatusService
-from trello_backup.trello.cache import WebpageTitleCache
-from trello_backup.trello.service import TrelloOperations, TrelloTitleService
+
+if TYPE_CHECKING:
+    from trello_backup.config_parser.config import TrelloConfig
+    from trello_backup.display.output import TrelloDataConverter
+    from trello_backup.http_server import HttpServer
+    from trello_backup.trello.service import TrelloOperations
 
 LOG = logging.getLogger(__name__)
+# The config, the API and the output modules are imported when a command creates its handler,
+# so the CLI starts without importing them (e.g. for usage and --help).
 
 def get_handler_and_setup_ctx(ctx):
     handler = CliCommon.init_main_cmd_handler(ctx)
@@ -21,35 +22,93 @@ def get_handler_and_setup_ctx(ctx):
 
 
 class CliCommon:
+    # Enabled by the daemon: the config and the TrelloOperations of each API mode are kept between commands,
+    # so the title cache, the board IDs and the HTTP connections stay warm
+    keep_warm = False
+    _warm_config: Optional['TrelloConfig'] = None
+    _warm_trello_ops: Dict[Tuple[bool, Optional[str], bool], Tuple['TrelloOperations', 'TrelloDataConverter']] = {}
+    _http_server: Optional['HttpServer'] = None
+
+    @staticmethod
+    def set_keep_warm(enabled: bool):
+        CliCommon.keep_warm = enabled
+        if not enabled:
+            CliCommon._warm_config = None
+            CliCommon._warm_trello_ops = {}
+
     @staticmethod
     def init_main_cmd_handler(ctx):
         from trello_backup.cmd_handler import MainCommandHandler
+        from trello_backup.config_parser.config import TrelloCfg
+        from trello_backup.display.output import OutputHandlerFactory
+        from trello_backup.http_server import HttpServer
+
+        conf = CliCommon._load_config(ctx)
+        context = TrelloContext.create_from_config(ctx, conf, dry_run=ctx.dry_run)
+
+        # Serve attachment files with http server
+        if context.config.get(TrelloCfg.SERVE_ATTACHMENTS) and CliCommon._http_server is None:
+            http_server = HttpServer(FilePath.OUTPUT_DIR_ATTACHMENTS)
+            http_server.launch()
+            if CliCommon.keep_warm:
+                CliCommon._http_server = http_server
 
+        key = (ctx.offline, ctx.from_backup, ctx.parsed_board_cache)
+        if CliCommon.keep_warm and key in CliCommon._warm_trello_ops:
+            trello_ops, data_converter = CliCommon._warm_trello_ops[key]
+            trello_ops.refresh()
+        else:
+            trello_ops, data_converter = CliCommon._create_trello_ops(ctx)
+            if CliCommon.keep_warm:
+                CliCommon._warm_trello_ops[key] = (trello_ops, data_converter)
+        handler = MainCommandHandler(context, trello_ops, data_converter, OutputHandlerFactory)
+
+        # TODO ASAP Print if offline == true, print directory where files are being loaded from (print from OfflineTrelloApi)
+        return handler
+
+    @staticmethod
+    def _load_config(ctx) -> 'TrelloConfig':
+        from trello_backup.config_parser.config import ConfigLoader, ConfigReader, TrelloConfig
+        from trello_backup.config_parser.config_validation import ConfigValidator, ValidationContext, ConfigSource
+        if CliCommon._warm_config is not None:
+            return CliCommon._warm_config
         validator = ConfigValidator()
         validator.set_context(ValidationContext(ConfigSource.MAIN, None))
         config_reader = ConfigReader(validator)
         conf_loader = ConfigLoader(config_reader, validator)
         conf: TrelloConfig = conf_loader.load(ctx)
-        context = TrelloContext.create_from_config(ctx, conf, dry_run=ctx.dry_run)
+        if CliCommon.keep_warm:
+            CliCommon._warm_config = conf
+        return conf
 
+    @staticmethod
+    def _create_trello_ops(ctx) -> Tuple['TrelloOperations', 'TrelloDataConverter']:
+        from trello_backup.display.output import MarkdownFormatter, TrelloDataConverter
+        from trello_backup.http_server import HTTP_SERVER_PORT
+        from trello_backup.snapshot import SnapshotStore
+        from trello_backup.trello.api import TrelloApi, TrelloRepository, OfflineTrelloApi, NetworkStatusService, \
+            BackupTrelloApi
+        from trello_backup.trello.cache import WebpageTitleCache, MarkdownCache, ParsedBoardCache, \
+            BoardDirectoryCache
+        from trello_backup.trello.service import TrelloOperations, TrelloTitleService
         # Initialize WebpageTitleCache so 'board.get_checklist_url_titles' can use it
         cache = WebpageTitleCache()
         webpage_title_service = TrelloTitleService(cache)
-        md_formatter = MarkdownFormatter()
+        md_formatter = MarkdownFormatter(MarkdownCache())
         data_converter = TrelloDataConverter(md_formatter, HTTP_SERVER_PORT)
 
-        # Serve attachment files with http server
-        if context.config.get(TrelloCfg.SERVE_ATTACHMENTS):
-            http_server = HttpServer(FilePath.OUTPUT_DIR_ATTACHMENTS)
-            http_server.launch()
-
         network_status_service = NetworkStatusService(ctx)
-        trello_repository = TrelloRepository(TrelloApi(), OfflineTrelloApi(), network_status_service)
-        trello_ops = TrelloOperations(trello_repository, cache, webpage_title_service, data_converter)
-        handler = MainCommandHandler(context, trello_ops, data_converter, OutputHandlerFactory)
-
-        # TODO ASAP Print if offline == true, print directory where files are being loaded from (print from OfflineTrelloApi)
-        return handler
+        backup_api = None
+        if ctx.from_backup:
+            session = None if ctx.from_backup == LATEST_BACKUP else ctx.from_backup
+            backup_api = BackupTrelloApi(SnapshotStore(), session)
+        trello_repository = TrelloRepository(TrelloApi(), OfflineTrelloApi(), network_status_service, backup_api=backup_api)
+        # Offline and backup boards are resolved from local files, only the Trello API needs the board directory cache
+        board_directory_cache = BoardDirectoryCache() if network_status_service.is_online() and not backup_api else None
+        trello_ops = TrelloOperations(trello_repository, cache, webpage_title_service, data_converter,
+                                      parsed_board_cache=ParsedBoardCache() if ctx.parsed_board_cache else None,
+                                      board_directory_cache=board_directory_cache)
+        return trello_ops, data_converter
 
 
 class TrelloContext:
@@ -69,6 +128,8 @@ class TrelloContext:
 
     @classmethod
     def create_from_config(cls, ctx, conf, dry_run=False):
+        from trello_backup.config_parser.config import TrelloCfg
+        from trello_backup.trello.api import TrelloApi
         if dry_run:
             LOG.info("Using dry-run mode for initializing context")
         else:
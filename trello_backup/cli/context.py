@@ -1,13 +1,16 @@
 from dataclasses import dataclass
-from typing import Any, Type, Dict, List
+from typing import Any, Type, Dict, List, Optional, TYPE_CHECKING
 
 import click
 
-from trello_backup.cmd_handler import MainCommandHandler
 import logging
 
 from trello_backup.utils import LoggingUtils
 
+if TYPE_CHECKING:
+    # The command handler imports the whole application, it is only created when a command runs
+    from trello_backup.cmd_handler import MainCommandHandler
+
 # TODO implement dryRun feature
 # Define a structure for each property's configuration
 @dataclass(frozen=True)
@@ -47,9 +50,17 @@ PROPERTY_CONFIG: List[ContextProperty] = [
         name='offline',
         attr_type=bool
     ),
+    ContextProperty(
+        name='from_backup',
+        attr_type=Optional[str]
+    ),
+    ContextProperty(
+        name='parsed_board_cache',
+        attr_type=bool
+    ),
     ContextProperty(
         name='handler',
-        attr_type=MainCommandHandler
+        attr_type='MainCommandHandler'
     ),
 ]
 # -------------------------------------
@@ -1,8 +1,20 @@
-from typing import List, Dict, Any
+import json
+import os
+import time
+from typing import List, Dict, Any, Optional
 from trello_backup.cli.common import TrelloContext
+from trello_backup.config_parser.config import TrelloCfg
 from trello_backup.display.output import TrelloCardHtmlGeneratorMode, TrelloListAndCardsPrinter, \
-    OutputHandlerFactory, TrelloDataConverter, BackupReport
+    OutputHandlerFactory, TrelloDataConverter, BackupReport, OutputType, OutputWriterPool
+from trello_backup.exception import TrelloException, TrelloConfigException, TrelloSnapshotException
+from trello_backup.session import SessionManifest, BackupIndex
+from trello_backup.snapshot import SnapshotStore
+from trello_backup.trello.api import API_CALL_STATS, ApiCallStats
+from trello_backup.trello.diff import BoardDiffer, BoardDiffPrinter, BoardDiff
 from trello_backup.trello.filter import CardFilters, ListFilter, TrelloFilters
+from trello_backup.trello.model import TrelloBoard
+from trello_backup.trello.query import CardQueryParser, CardQuery
+from trello_backup.trello.search import SearchIndex, SearchHit, SearchResultPrinter, SEARCH_RESULT_LIMIT
 from trello_backup.trello.service import TrelloOperations
 
 
@@ -22,42 +34,192 @@ class MainCommandHandler:
         self._trello_ops = trello_ops
         self._data_converter = data_converter
         self.output_factory = output_factory
+        self._previous_session: Optional[SessionManifest] = None
+        self._session_manifest: Optional[SessionManifest] = None
+        # Creating a store resolves its data directory, the stores are only created when a command uses them
+        self._backup_index: Optional[BackupIndex] = None
+        self._snapshot_store: Optional[SnapshotStore] = None
+        self._search_index: Optional[SearchIndex] = None
+
+    @property
+    def backup_index(self) -> BackupIndex:
+        if self._backup_index is None:
+            self._backup_index = BackupIndex()
+        return self._backup_index
+
+    @property
+    def snapshot_store(self) -> SnapshotStore:
+        if self._snapshot_store is None:
+            self._snapshot_store = SnapshotStore()
+        return self._snapshot_store
+
+    @property
+    def search_index(self) -> SearchIndex:
+        if self._search_index is None:
+            self._search_index = SearchIndex()
+        return self._search_index
 
     def backup_board(self,
                      board_name: str,
                      report: BackupReport,
-                     html_gen_config: TrelloCardHtmlGeneratorMode = TrelloCardHtmlGeneratorMode.BASIC):
+                     html_gen_config: TrelloCardHtmlGeneratorMode = TrelloCardHtmlGeneratorMode.BASIC,
+                     query: Optional[str] = None,
+                     output_types: Optional[List[OutputType]] = None,
+                     shard_by_list: bool = False,
+                     writer_pool: Optional[OutputWriterPool] = None):
         # TODO ASAP Filtering: Filter should not be passed to TrelloOperations, as it's only a representational concept
+        start_time = time.perf_counter()
+        api_calls_before = API_CALL_STATS.snapshot()
         filters = TrelloFilters.create_default()
+        filters.card_query = self._parse_query(query)
         board, _ = self._trello_ops.get_board(board_name, filters=filters, download_comments=html_gen_config.value.include_comments)
-        # TODO ASAP Make output formats configurable: txt, html, rich, json, ...
-        # TODO ASAP Use OutputType as much as I can
         # TODO ASAP Consider removing this factory?
-        out = self.output_factory.create_for_board(self._data_converter, self.ctx.backup_dir, board, html_gen_config.value, filters=filters)
+        out = self.output_factory.create_for_board(self._data_converter, self.ctx.backup_dir, board, html_gen_config.value,
+                                                   filters=filters, output_types=self._get_output_types(output_types),
+                                                   shard_by_list=shard_by_list,
+                                                   previous_session=self._get_previous_session(board_name),
+                                                   writer_pool=writer_pool)
         out.write_outputs(board_name, report.file_write_callback)
+        self.snapshot_store.put_board(self._get_snapshot_session_name(), board.name, board.json)
+        if not filters.card_query:
+            # Only complete boards are indexed, a query would drop the other cards from the index
+            self.search_index.index_board(board, session=self._get_snapshot_session_name())
+        self._record_board_in_session_manifest(board, out.fingerprint, report,
+                                               elapsed=time.perf_counter() - start_time,
+                                               api_calls=ApiCallStats.diff(api_calls_before, API_CALL_STATS.snapshot()))
         return report
 
     def backup_all_boards(self,
                           report: BackupReport,
-                          html_gen_config: TrelloCardHtmlGeneratorMode = TrelloCardHtmlGeneratorMode.BASIC):
+                          html_gen_config: TrelloCardHtmlGeneratorMode = TrelloCardHtmlGeneratorMode.BASIC,
+                          query: Optional[str] = None,
+                          output_types: Optional[List[OutputType]] = None,
+                          shard_by_list: bool = False):
         boards: Dict[str, str] = self._trello_ops.get_board_names_and_ids()
-        for board_name in boards.keys():
-            self.backup_board(board_name, report, html_gen_config=html_gen_config)
+        output_types = self._get_output_types(output_types)
+        # One pool of writer processes for all boards
+        with OutputWriterPool() as writer_pool:
+            for board_name in boards.keys():
+                self.backup_board(board_name, report, html_gen_config=html_gen_config, query=query,
+                                  output_types=output_types, shard_by_list=shard_by_list, writer_pool=writer_pool)
         return report
 
-    def print_cards(self, board: str, filter_list_names: List[str]):
-        filters = TrelloFilters(filter_list_names, ListFilter.OPEN, CardFilters.OPEN)
+    def export_snapshot(self, session: Optional[str], board_names: List[str], output_dir: Optional[str] = None) -> List[str]:
+        return self.snapshot_store.export(session, output_dir if output_dir else self.ctx.backup_dir, board_names)
+
+    def diff_board(self, board_name: str, from_source: Optional[str] = None, to_source: Optional[str] = None) -> BoardDiff:
+        """
+        Sources are session names of the snapshot store or board JSON files.
+        By default, the latest snapshot of the board is compared to the one before it.
+        A board JSON file given as to_source is compared to the latest snapshot of the board by default.
+        """
+        if not from_source or not to_source:
+            sessions = self.snapshot_store.get_board_sessions(board_name)
+            if not sessions:
+                raise TrelloSnapshotException(f"No snapshots found for board: {board_name}")
+            if not to_source:
+                to_source = sessions[-1]
+            if not from_source and os.path.isfile(to_source):
+                # Session names can't be ordered against a file path
+                from_source = sessions[-1]
+            elif not from_source:
+                earlier = [s for s in sessions if s < to_source]
+                if not earlier:
+                    raise TrelloSnapshotException(f"No snapshot of board '{board_name}' found before: {to_source}")
+                from_source = earlier[-1]
+        diff = BoardDiffer.diff(self._load_board_json(board_name, from_source), self._load_board_json(board_name, to_source))
+        BoardDiffPrinter.print_plain_text(board_name, from_source, to_source, diff)
+        return diff
+
+    def _load_board_json(self, board_name: str, source: str) -> Dict[str, Any]:
+        if os.path.isfile(source):
+            with open(source) as f:
+                return json.load(f)
+        return self.snapshot_store.get_board(source, board_name)
+
+    def search(self, query: str, board_name: Optional[str] = None, limit: int = SEARCH_RESULT_LIMIT) -> List[SearchHit]:
+        hits = self.search_index.search(query, board_name=board_name, limit=limit)
+        SearchResultPrinter.print_plain_text(query, hits)
+        return hits
+
+    def print_cards(self, board: str, filter_list_names: List[str], query: Optional[str] = None, split_fetch: bool = False):
+        filters = TrelloFilters(filter_list_names, ListFilter.OPEN, CardFilters.OPEN, card_query=self._parse_query(query))
+        if split_fetch:
+            # Each list is printed as soon as its cards are downloaded
+            for trello_list in self._trello_ops.iter_lists_and_cards(board, filters):
+                list_data = self._data_converter.convert_list_to_output(trello_list.name, trello_list)
+                TrelloListAndCardsPrinter.print_list_plain_text(list_data, only_open=True, print_placeholders=False)
+            self._data_converter.md_formatter.save()
+            return
         # TODO ASAP Filtering: Filter should not be passed to TrelloOperations, as it's only a representational concept
         board, trello_lists = self._trello_ops.get_lists_and_cards(board, filters)
         trello_data = self._data_converter.convert_to_output_data(trello_lists)
+        self._data_converter.md_formatter.save()
         TrelloListAndCardsPrinter.print_plain_text(trello_data, print_placeholders=False, only_open=True)
         # TrelloListAndCardsPrinter.print_rich(trello_data)
 
     def print_cards_by_share_links(self, card_links: List[str]):
         self._trello_ops.get_cards_by_links(card_links)
 
-    def cleanup_board(self, board: str, filter_list_names: List[str]):
-        filters = TrelloFilters(filter_list_names, ListFilter.OPEN, CardFilters.OPEN)
+    def cleanup_board(self, board: str, filter_list_names: List[str], query: Optional[str] = None):
+        filters = TrelloFilters(filter_list_names, ListFilter.OPEN, CardFilters.OPEN, card_query=self._parse_query(query))
         self._trello_ops.cleanup_board(board, filters)
 
+    def _get_previous_session(self, board_name: str) -> Optional[SessionManifest]:
+        """
+        The manifest of the latest backup of the board, looked up from the backup index.
+        Falls back to scanning the session dirs if the board is not indexed yet.
+        """
+        latest = self.backup_index.latest(board_name)
+        if latest:
+            if os.path.abspath(latest["backup_dir"]) == os.path.abspath(self.ctx.backup_dir):
+                return self._get_session_manifest()
+            manifest = SessionManifest.load(latest["backup_dir"])
+            if manifest:
+                return manifest
+        if self._previous_session is None:
+            # Looked up before this session's manifest is written
+            self._previous_session = SessionManifest.find_previous(self.ctx.backup_dir)
+        return self._previous_session
+
+    def _get_session_manifest(self) -> SessionManifest:
+        if self._session_manifest is None:
+            self._session_manifest = SessionManifest.load(self.ctx.backup_dir) or SessionManifest(self.ctx.backup_dir)
+        return self._session_manifest
+
+    def _get_snapshot_session_name(self) -> str:
+        return self._get_session_manifest().session_name or os.path.basename(os.path.normpath(self.ctx.backup_dir))
+
+    def _record_board_in_session_manifest(self, board: TrelloBoard, fingerprint: str, report: BackupReport,
+                                          elapsed: float, api_calls: Dict[str, int]):
+        previous = self._get_previous_session(board.name)
+        files = [(file_type.cli_name, file_path, report.get_elapsed(file_path), report.is_reused(file_path))
+                 for file_type, file_path in report.get_board_files(board.name)]
+        manifest = self._get_session_manifest()
+        record = manifest.create_board_record(board.name, board.id, fingerprint, files, board_json=board.json,
+                                              previous=previous, elapsed=elapsed, api_calls=api_calls)
+        manifest.add_board(record)
+        manifest.save()
+        self.backup_index.append(manifest, record)
+
+    def _get_output_types(self, output_types: Optional[List[OutputType]]) -> List[OutputType]:
+        """
+        Output types from the command line take precedence over the configured ones, the default types are written otherwise.
+        """
+        if output_types:
+            return output_types
+        configured = self.ctx.config.get_optional(TrelloCfg.OUTPUT_FORMATS) if self.ctx.config else None
+        if not configured:
+            return OutputType.defaults()
+        try:
+            return OutputType.from_names(configured)
+        except TrelloException as e:
+            raise TrelloConfigException(f"Invalid value for config '{TrelloCfg.OUTPUT_FORMATS.key}': {e}")
+
+    @staticmethod
+    def _parse_query(query: Optional[str]) -> Optional[CardQuery]:
+        if not query:
+            return None
+        return CardQueryParser.parse(query)
+
 
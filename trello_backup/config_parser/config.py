@@ -86,6 +86,8 @@ class TrelloCfg(Enum):
     ########################################
     # Global configs
     SERVE_ATTACHMENTS =  (TrelloConfigType.GLOBAL, TrelloConfigCategory.GENERIC, "serve_attachments", TypeChecker.BOOL)
+    # Optional, default output formats of backup commands, e.g. ["html_file", "board_json"]
+    OUTPUT_FORMATS = (TrelloConfigType.GLOBAL, TrelloConfigCategory.GENERIC, "output_formats", TypeChecker.LIST_STR)
 
     def __init__(self, type, category, key, type_checker, value_checker=None, defaults: Dict[str, str] = None):
         self.type = type
@@ -160,6 +162,9 @@ class Config:
             raise TrelloConfigException(f"Undefined config: {cfg}")
         return self._configs[cfg]
 
+    def get_optional(self, cfg: Any, default=None):
+        return self._configs.get(cfg, default)
+
     def get_global_confs(self):
         return {k: v for k, v in self._configs.items() if k.type == TrelloConfigType.GLOBAL}
 
@@ -318,6 +323,9 @@ class TrelloConfig:
     def get(self, cfg: TrelloCfg):
         return self.config.get(cfg)
 
+    def get_optional(self, cfg: TrelloCfg, default=None):
+        return self.config.get_optional(cfg, default)
+
     def get_secret(self, cfg: TrelloCfg):
         return self.secrets.get(cfg)
 
@@ -3,47 +3,91 @@ import os.path
 import os
 from enum import Enum
 
-from pythoncommons.file_utils import FileUtils, FindResultType
-from pythoncommons.project_utils import SimpleProjectUtils
-
 
 LOG = logging.getLogger(__name__)
 PROJECT_NAME = "trello-backup"
+# Value of ctx.from_backup if --from-backup is given without --backup-session
+LATEST_BACKUP = "latest"
+# Default number of cards printed by the search command, the CLI does not import the search module for it
+SEARCH_RESULT_LIMIT = 20
+# Same as pythoncommons.logging_setup.DEFAULT_FORMAT, that module imports pytest so it is only imported when logging is set up
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+
+class cached_classproperty:
+    """
+    Class attribute that is computed on first access, then stored on the class.
+    Used for paths that need a filesystem walk, so importing the module does not touch the filesystem.
+    """
+    def __init__(self, func):
+        self._func = func
+        self._name = func.__name__
+
+    def __get__(self, instance, owner):
+        value = self._func(owner)
+        setattr(owner, self._name, value)
+        return value
 
 
 class FilePath:
     REPO_ROOT_DIRNAME = "trello-backup"
     MODULE_ROOT_NAME = "trello_backup"
-    REPO_ROOT_DIR = FileUtils.find_repo_root_dir(__file__, REPO_ROOT_DIRNAME)
     _TRELLO_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "trello-backup-output")
     OUTPUT_DIR_ATTACHMENTS = os.path.join(_TRELLO_OUTPUT_DIR, "attachments")
-    TRELLO_BACKUP_DIR = SimpleProjectUtils.get_project_dir(
-        basedir=REPO_ROOT_DIR,
-        parent_dir=REPO_ROOT_DIRNAME,
-        dir_to_find=MODULE_ROOT_NAME,
-        find_result_type=FindResultType.DIRS,
-        exclude_dirs=[],
-    )
-    WEBPAGE_TITLE_CACHE_FILE = FileUtils.join_path(_TRELLO_OUTPUT_DIR, 'webpage_title_cache')
-    FileUtils.ensure_dir_created(_TRELLO_OUTPUT_DIR)
-    FileUtils.ensure_dir_created(OUTPUT_DIR_ATTACHMENTS)
+    WEBPAGE_TITLE_CACHE_FILE = os.path.join(_TRELLO_OUTPUT_DIR, 'webpage_title_cache')
+    MARKDOWN_CACHE_FILE = os.path.join(_TRELLO_OUTPUT_DIR, 'markdown_plain_text_cache')
+    SHARD_MANIFEST_DIR = os.path.join(_TRELLO_OUTPUT_DIR, 'shard-manifests')
+    BACKUP_INDEX_FILE = os.path.join(_TRELLO_OUTPUT_DIR, 'backup-index.jsonl')
+    SNAPSHOT_STORE_DIR = os.path.join(_TRELLO_OUTPUT_DIR, 'snapshots')
+    SEARCH_INDEX_FILE = os.path.join(_TRELLO_OUTPUT_DIR, 'search-index.sqlite')
+    PARSED_BOARD_CACHE_DIR = os.path.join(_TRELLO_OUTPUT_DIR, 'parsed-boards')
+    DAEMON_SOCKET_FILE = os.path.join(_TRELLO_OUTPUT_DIR, 'daemon.sock')
+    BOARD_DIRECTORY_CACHE_FILE = os.path.join(_TRELLO_OUTPUT_DIR, 'board-directory.json')
 
     SESSION_DIR = None
 
+    @cached_classproperty
+    def REPO_ROOT_DIR(cls):
+        from pythoncommons.file_utils import FileUtils
+        return FileUtils.find_repo_root_dir(__file__, cls.REPO_ROOT_DIRNAME)
+
+    @cached_classproperty
+    def TRELLO_BACKUP_DIR(cls):
+        from pythoncommons.file_utils import FindResultType
+        from pythoncommons.project_utils import SimpleProjectUtils
+        return SimpleProjectUtils.get_project_dir(
+            basedir=cls.REPO_ROOT_DIR,
+            parent_dir=cls.REPO_ROOT_DIRNAME,
+            dir_to_find=cls.MODULE_ROOT_NAME,
+            find_result_type=FindResultType.DIRS,
+            exclude_dirs=[],
+        )
+
+    @classmethod
+    def ensure_output_dirs_created(cls):
+        os.makedirs(cls._TRELLO_OUTPUT_DIR, exist_ok=True)
+        os.makedirs(cls.OUTPUT_DIR_ATTACHMENTS, exist_ok=True)
+
     @classmethod
     def get_file_from_root(cls, fname):
+        from pythoncommons.file_utils import FindResultType
+        from pythoncommons.project_utils import SimpleProjectUtils
         return SimpleProjectUtils.get_project_file(basedir=FilePath.REPO_ROOT_DIR,
                                                    file_to_find=fname,
                                                    find_result_type=FindResultType.FILES)
 
     @classmethod
     def get_file_from_basedir(cls, fname, basedir):
+        from pythoncommons.file_utils import FindResultType
+        from pythoncommons.project_utils import SimpleProjectUtils
         return SimpleProjectUtils.get_project_file(basedir=basedir,
                                                    file_to_find=fname,
                                                    find_result_type=FindResultType.FILES)
 
     @classmethod
     def get_dir_from_root(cls, dirname, parent_dir, excludes=None, exact_dirname_match=False):
+        from pythoncommons.file_utils import FindResultType
+        from pythoncommons.project_utils import SimpleProjectUtils
         kwargs = {"basedir": FilePath.REPO_ROOT_DIR,
                   "dir_to_find": dirname,
                   "find_result_type": FindResultType.DIRS,
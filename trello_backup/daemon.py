@@ -0,0 +1,187 @@
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+from typing import List, Optional, Tuple, Dict, Any
+
+LOG = logging.getLogger(__name__)
+
+PROG_NAME = "trello-backup"
+# Top level commands that are forwarded to a running daemon.
+# Interactive commands (cleanup) and commands writing backups always run in the CLI process.
+FORWARDED_COMMANDS = ("print", "search", "diff")
+TOP_LEVEL_COMMANDS = FORWARDED_COMMANDS + ("backup", "cleanup", "daemon", "usage")
+# Options of the top level command group taking a value, the value is not the command name
+GLOBAL_OPTIONS_WITH_VALUE = ("--backup-session", )
+_PING_REQUEST = "ping"
+_STOP_REQUEST = "stop"
+_ENCODING = "utf-8"
+
+# The client side is imported by the entry points (trello_backup/__main__.py, trello_backup/cli/cli.py) for every
+# invocation, so this module only imports the standard library. The server side imports the CLI lazily.
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = json.loads(self.rfile.readline().decode(_ENCODING))
+        command = request.get("command")
+        if command == _PING_REQUEST:
+            response = {"exit_code": 0, "output": ""}
+        elif command == _STOP_REQUEST:
+            self.server.stop_requested = True
+            response = {"exit_code": 0, "output": ""}
+        else:
+            exit_code, output = TrelloDaemon.run_command(request["args"], cwd=request.get("cwd"))
+            response = {"exit_code": exit_code, "output": output}
+        self.wfile.write(json.dumps(response).encode(_ENCODING) + b"\n")
+
+
+class TrelloDaemon:
+    """
+    Long-running local process that runs the forwarded CLI commands in-process.
+    The config, the webpage title cache, the parsed boards, the board name -> ID mapping and the HTTP connections
+    are kept between commands. Commands are run one at a time, as their console output is captured per command.
+    """
+    def __init__(self, socket_path: str = None):
+        if not socket_path:
+            from trello_backup.constants import FilePath
+            socket_path = FilePath.DAEMON_SOCKET_FILE
+        self._socket_path = socket_path
+
+    def serve(self):
+        from trello_backup.cli.cli import register_commands
+        from trello_backup.cli.common import CliCommon
+        from trello_backup.display.console import CliLogger
+        from trello_backup.exception import TrelloException
+        cli_log = CliLogger(LOG)
+
+        if os.path.exists(self._socket_path):
+            if DaemonClient(self._socket_path).is_running():
+                raise TrelloException(f"Daemon is already running, socket: {self._socket_path}")
+            # Left behind by a daemon that was killed
+            os.remove(self._socket_path)
+
+        CliCommon.set_keep_warm(True)
+        register_commands()
+        with socketserver.UnixStreamServer(self._socket_path, _DaemonRequestHandler) as server:
+            server.stop_requested = False
+            os.chmod(self._socket_path, 0o600)
+            cli_log.info(f"Started trello-backup daemon, socket: {self._socket_path}")
+            try:
+                while not server.stop_requested:
+                    server.handle_request()
+            finally:
+                os.remove(self._socket_path)
+                CliCommon.set_keep_warm(False)
+        cli_log.info("Stopped trello-backup daemon")
+
+    @staticmethod
+    def run_command(args: List[str], cwd: Optional[str] = None) -> Tuple[int, str]:
+        """
+        Runs the CLI with the args, returns the exit code and the console output of the command.
+        :param cwd: Working directory of the client, relative paths of the args are resolved against it.
+        Commands are run one at a time, so changing the working directory of the daemon is safe.
+        """
+        import click
+        from trello_backup.cli.cli import cli
+        from trello_backup.display.console import CliLogger
+        cli_log = CliLogger(LOG)
+
+        output = io.StringIO()
+        daemon_cwd = os.getcwd()
+        with contextlib.redirect_stdout(output):
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                result = cli.main(args=args, prog_name=PROG_NAME, standalone_mode=False)
+                exit_code = result if isinstance(result, int) else 0
+            except click.ClickException as e:
+                e.show(file=output)
+                exit_code = e.exit_code
+            except click.Abort:
+                exit_code = 1
+            except Exception as e:
+                # A failing command must not stop the daemon
+                LOG.exception(e)
+                cli_log.print_exception(show_locals=False)
+                exit_code = 1
+            finally:
+                os.chdir(daemon_cwd)
+        return exit_code, output.getvalue()
+
+
+class DaemonClient:
+    def __init__(self, socket_path: str = None):
+        if not socket_path:
+            from trello_backup.constants import FilePath
+            socket_path = FilePath.DAEMON_SOCKET_FILE
+        self._socket_path = socket_path
+
+    @staticmethod
+    def should_forward(args: List[str]) -> bool:
+        return DaemonClient._get_command(args) in FORWARDED_COMMANDS
+
+    @staticmethod
+    def _get_command(args: List[str]) -> Optional[str]:
+        """
+        Returns the first argument that is not an option or the value of an option.
+        """
+        skip_value = False
+        for arg in args:
+            if skip_value:
+                skip_value = False
+            elif arg in GLOBAL_OPTIONS_WITH_VALUE:
+                skip_value = True
+            elif not arg.startswith("-"):
+                return arg
+        return None
+
+    def _send(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Returns None if the daemon is not running.
+        """
+        if not os.path.exists(self._socket_path):
+            return None
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(self._socket_path)
+                sock.sendall(json.dumps(request).encode(_ENCODING) + b"\n")
+                with sock.makefile("rb") as f:
+                    line = f.readline()
+        except (ConnectionRefusedError, FileNotFoundError):
+            return None
+        return json.loads(line.decode(_ENCODING)) if line else None
+
+    def is_running(self) -> bool:
+        return self._send({"command": _PING_REQUEST}) is not None
+
+    @staticmethod
+    def forward(args: List[str], socket_path: str = None) -> Optional[int]:
+        """
+        Runs a forwarded command in the daemon and prints its output.
+        Returns the exit code, None if the command is not forwarded or the daemon is not running.
+        """
+        if not DaemonClient.should_forward(args):
+            return None
+        result = DaemonClient(socket_path).run(args)
+        if result is None:
+            return None
+        exit_code, output = result
+        sys.stdout.write(output)
+        return exit_code
+
+    def run(self, args: List[str]) -> Optional[Tuple[int, str]]:
+        """
+        Runs the command in the daemon. Returns None if the daemon is not running.
+        """
+        response = self._send({"args": args, "cwd": os.getcwd()})
+        if response is None:
+            return None
+        return response["exit_code"], response["output"]
+
+    def stop(self) -> bool:
+        return self._send({"command": _STOP_REQUEST}) is not None
@@ -4,7 +4,6 @@ import os.path
 import sys
 
 from rich.console import Console
-from rich.markdown import Markdown
 from rich.theme import Theme
 
 import logging
@@ -167,5 +166,6 @@ class PrettyPrint:
         # lines = text.split("\n")
         #markup = "<br/>".join(lines)
         md = f"```\n{text}\n```"
+        from rich.markdown import Markdown
         markdown = Markdown(md)
         CLI_LOG.print(markdown)
@@ -1,34 +1,46 @@
+import csv
+import dataclasses
 import enum
+import gzip
 import json
 import logging
 import os
-from collections import defaultdict
+import re
+import time
+from collections import defaultdict, OrderedDict
 from dataclasses import dataclass
+from operator import attrgetter
+from concurrent.futures import ProcessPoolExecutor, Future
 from enum import Enum
 from io import StringIO
-from typing import List, Dict, Any, Tuple, Callable, Iterable
-
-from markdown import Markdown
-from pythoncommons.file_utils import FileUtils, CsvFileUtils
-from pythoncommons.result_printer import TabulateTableFormat, TableRenderingConfig, ResultPrinter
-from rich.console import Console
-from rich.style import Style
-from rich.table import Table
-from rich.text import Text
+from typing import List, Dict, Any, Tuple, Callable, Iterable, Iterator, Optional, Set, TYPE_CHECKING
 
+from trello_backup.constants import FilePath
 from trello_backup.display.console import ConsoleUtils, CliLogger
-from trello_backup.display.table import TrelloTable, TrelloTableRenderSettings, TrelloTableColumnStyles
+from trello_backup.display.shard import ListShardManifest, ListShard, ListShardUtils, SHARD_INDEX_FILE_NAME
+from trello_backup.display.table import TrelloTable, TrelloTableRenderSettings, TrelloTableColumnStyles, HtmlTableWriter
 from trello_backup.exception import TrelloException
 from trello_backup.http_server import HTTP_SERVER_PORT
-from trello_backup.trello.filter import CardFilterer, CardFilters, CardPropertyFilter, TrelloFilters
+from trello_backup.session import SessionManifest
+from trello_backup.trello.filter import CardFilters, CardPropertyFilter, TrelloFilters
 from trello_backup.trello.model import TrelloComment, TrelloChecklist, TrelloBoard, ExtractedCardData, \
     TrelloLists, TrelloCard, TrelloList
+from trello_backup.utils import FsUtils
+
+if TYPE_CHECKING:
+    from trello_backup.trello.cache import MarkdownCache
 
 LOG = logging.getLogger(__name__)
 CLI_LOG = CliLogger(LOG)
 
 
+# rich and markdown are imported where they are used, so importing this module (e.g. for OutputType) stays cheap
 INDENT = "&nbsp;&nbsp;&nbsp;&nbsp;"
+OUTPUT_FILE_BUFFER_SIZE = 1024 * 1024
+HTML_TABLE_PAGE_SIZE = 1000
+RICH_TABLE_MAX_ROWS = 5000
+# Converted texts kept in memory by MarkdownFormatter, the least recently used ones are evicted
+MARKDOWN_MEMO_MAX_SIZE = 10000
 
 class TableHeaderFieldName(Enum):
     BOARD = "Board"
@@ -96,11 +108,20 @@ class TrelloCardHtmlGeneratorMode(Enum):
 
 
 class MarkdownFormatter:
-    def __init__(self):
-        # patching Markdown
-        Markdown.output_formats["plain"] = MarkdownFormatter.unmark_element
+    # Single line texts made of these characters are not changed by the markdown conversion
+    _PLAIN_TEXT_RE = re.compile(r"(?:[^\W_]|[ ,.;:'\"%$@/?=])*")
+    _ORDERED_LIST_RE = re.compile(r"\d+\.(\s|$)")
+
+    def __init__(self, cache: 'MarkdownCache' = None, memo_max_size: int = MARKDOWN_MEMO_MAX_SIZE):
+        from markdown import Markdown
+        # patching Markdown, only once per process
+        if "plain" not in Markdown.output_formats:
+            Markdown.output_formats["plain"] = MarkdownFormatter.unmark_element
         self.__md = Markdown(output_format="plain")
         self.__md.stripTopLevelTags = False
+        self._cache = cache
+        self._memo: OrderedDict[str, str] = OrderedDict()
+        self._memo_max_size = memo_max_size
 
     @staticmethod
     def unmark_element(element, stream=None):
@@ -118,6 +139,33 @@ class MarkdownFormatter:
         return stream.getvalue()
 
     def to_plain_text(self, text):
+        if text in self._memo:
+            self._memo.move_to_end(text)
+            return self._memo[text]
+        if self._is_plain_text(text):
+            converted = text.replace("\u200c", "")
+        else:
+            converted = self._cache.get(text) if self._cache is not None else None
+            if converted is None:
+                converted = self._convert(text)
+                if self._cache is not None:
+                    self._cache.put(text, converted)
+        self._memo[text] = converted
+        if len(self._memo) > self._memo_max_size:
+            self._memo.popitem(last=False)
+        return converted
+
+    def save(self):
+        if self._cache is not None:
+            self._cache.save()
+
+    @staticmethod
+    def _is_plain_text(text: str) -> bool:
+        return (MarkdownFormatter._PLAIN_TEXT_RE.fullmatch(text) is not None
+                and text == text.strip()
+                and not MarkdownFormatter._ORDERED_LIST_RE.match(text))
+
+    def _convert(self, text):
         converted = self.__md.convert(text)
 
         # Remove potential ZWNJ (0x200c) characters: https://unicodemap.org/details/0x200C/index.html
@@ -131,7 +179,7 @@ class MarkdownFormatter:
 
 class TrelloDataConverter:
     def __init__(self, md_formatter: 'MarkdownFormatter', http_server_port: int):
-        self._md_formatter = md_formatter
+        self.md_formatter = md_formatter
         self._http_server_port = http_server_port
         h = TableHeaderFieldName
         # Board name, List name, Card name, card labels, card due date, Description, Attachment name, Attachment URL, Checklist item name, Checklist item URL Title, Checklist item URL
@@ -148,35 +196,82 @@ class TrelloDataConverter:
                   h.CHECKLIST_ITEM_NAME,
                   h.CHECKLIST_ITEM_URL_TITLE,
                   h.CHECKLIST_ITEM_URL])
-        self._col_value_getters = {
-            h.BOARD: lambda board, list, card, item: board.name,
-            h.LIST: lambda board, list, card, item: list.name,
-            h.CARD: lambda board, list, card, item: card.name,
-            h.LABELS: lambda board, list, card, item: card.get_labels_as_str(),
-            h.DUE_DATE: lambda board, list, card, item: card.due_date if card.due_date else "",
-            h.DESCRIPTION: lambda board, list, card, item: item.description,
-            h.ATTACHMENT_NAME: lambda board, list, card, item: item.attachment_name,
-            h.ATTACHMENT_URL: lambda board, list, card, item: item.attachment_url,
-            h.ATTACHMENT_LOCAL_URL: lambda board, list, card, item: item.local_server_path,
-            h.ATTACHMENT_FILE_PATH: lambda board, list, card, item: item.attachment_file_path,
-            h.CHECKLIST_ITEM_NAME: lambda board, list, card, item: item.cl_item_name,
-            h.CHECKLIST_ITEM_URL_TITLE: lambda board, list, card, item: item.cl_item_url_title,
-            h.CHECKLIST_ITEM_URL: lambda board, list, card, item: item.cl_item_url
+        # Values of these columns are the same for every row of a card, computed once per card
+        self._card_value_getters = {
+            h.BOARD: lambda board, list, card: board.name,
+            h.LIST: lambda board, list, card: list.name,
+            h.CARD: lambda board, list, card: card.name,
+            h.LABELS: lambda board, list, card: card.get_labels_as_str(),
+            h.DUE_DATE: lambda board, list, card: card.due_date if card.due_date else "",
+        }
+        # Attributes of ExtractedCardData, one row per item
+        self._item_value_attrs = {
+            h.DESCRIPTION: "description",
+            h.ATTACHMENT_NAME: "attachment_name",
+            h.ATTACHMENT_URL: "attachment_url",
+            h.ATTACHMENT_LOCAL_URL: "local_server_path",
+            h.ATTACHMENT_FILE_PATH: "attachment_file_path",
+            h.CHECKLIST_ITEM_NAME: "cl_item_name",
+            h.CHECKLIST_ITEM_URL_TITLE: "cl_item_url_title",
+            h.CHECKLIST_ITEM_URL: "cl_item_url",
         }
         self._sanity_check_col_value_getters()
         self._none_value_converters = {h.CHECKLIST_ITEM_URL_TITLE: lambda val: ""}
+        self._card_values, self._build_rows = self._compile_row_builder()
 
     def _sanity_check_col_value_getters(self):
         cols_set = self._header.cols_set()
         missing_getters = []
         for col in cols_set:
-            if col not in self._col_value_getters:
+            if col not in self._card_value_getters and col not in self._item_value_attrs:
                 missing_getters.append(col)
 
         if missing_getters:
             raise TrelloException(
                 f"Value getters are not configured for the following columns: {', '.join([g.value for g in missing_getters])}")
 
+    def _compile_row_builder(self) -> Tuple[Callable, Callable]:
+        """
+        Resolves the column getters once.
+        Returns a function computing the card level values and a function building all rows of a card from them.
+        """
+        cols = self._header.cols_list()
+        card_cols = [col for col in cols if col in self._card_value_getters]
+        item_cols = [col for col in cols if col not in self._card_value_getters]
+        card_getters = tuple(self._card_value_getters[col] for col in card_cols)
+        item_getter = attrgetter(*(self._item_value_attrs[col] for col in item_cols))
+        if len(item_cols) == 1:
+            # attrgetter with a single attribute does not return a tuple
+            single_item_getter = item_getter
+            item_getter = lambda item: (single_item_getter(item), )
+
+        # Indices to restore the header order if card and item columns are interleaved
+        built_order = card_cols + item_cols
+        reorder = None if built_order == cols else [built_order.index(col) for col in cols]
+        none_converters = [(built_order.index(col), conv) for col, conv in self._none_value_converters.items() if col in cols]
+
+        def card_values(board, list, card) -> List[str]:
+            return [getter(board, list, card) for getter in card_getters]
+
+        def build_rows(card_vals: List[str], items: Iterable[ExtractedCardData]) -> Iterator[List[str]]:
+            for item in items:
+                row = card_vals + list(item_getter(item))
+                if None in row:
+                    row = self._convert_none_values(row, built_order, none_converters)
+                if reorder:
+                    row = [row[idx] for idx in reorder]
+                yield row
+        return card_values, build_rows
+
+    @staticmethod
+    def _convert_none_values(row, cols, none_converters):
+        for idx, converter in none_converters:
+            if row[idx] is None:
+                row[idx] = converter(row[idx])
+        if None in row:
+            raise ValueError(f"Value is None for column: {cols[row.index(None)]}")
+        return row
+
     def convert_to_output_data(self, trello_lists: TrelloLists) -> List[Dict[str, Any]]:
         output_data = []
         for trello_list in trello_lists.get():
@@ -201,7 +296,7 @@ class TrelloDataConverter:
             "id": card.id,
             "name": card.name,
             "closed": card.closed,
-            "description": self._md_formatter.to_plain_text(card.description),
+            "description": self.md_formatter.to_plain_text(card.description),
             "attachments": [
                 {
                     "name": a.name,
@@ -224,25 +319,22 @@ class TrelloDataConverter:
         return card_data
 
     def convert_to_table_rows(self, board: TrelloBoard, filters: TrelloFilters, md_formatter) -> Tuple[List[List[str]], List[str]]:
-        rows = []
+        return list(self.iter_table_rows(board, filters, md_formatter)), self.table_header
+
+    @property
+    def table_header(self) -> List[str]:
+        return self._header.as_string_headers()
+
+    def iter_table_rows(self, board: TrelloBoard, filters: TrelloFilters, md_formatter) -> Iterator[List[str]]:
+        card_predicate = filters.card_predicate
+        card_values = self._card_values
+        build_rows = self._build_rows
         for list in board.lists:
-            cards = CardFilterer.filter_cards(list, filters.card_filters)
-            for card in cards:
+            for card in list.cards:
+                if card_predicate and not card_predicate(card):
+                    continue
                 items: List[ExtractedCardData] = self._extract_card_data(card, filters.card_filters, md_formatter)
-                for item in items:
-                    row = []
-                    for col in self._header.cols_list():
-                        val = self._col_value_getters[col](board, list, card, item)
-                        if val is None:
-                            if col in self._none_value_converters:
-                                val = self._none_value_converters[col](val)
-                            else:
-                                raise ValueError(f"Value is None for column: {col}")
-                        row.append(val)
-                    if len(self._header) != len(row):
-                        raise ValueError("Mismatch in number of columns in row({}) vs. number of header columns ({})".format(len(row), self._header))
-                    rows.append(row)
-        return rows, self._header.as_string_headers()
+                yield from build_rows(card_values(board, list, card), items)
 
     def _extract_card_data(self, card, card_filters, md_formatter):
         # TODO ASAP Filtering cleanup
@@ -330,10 +422,7 @@ class TrelloBoardHtmlFileGenerator:
 
     @staticmethod
     def format_comments(card):
-        comments_str = ""
-        for comment in card.comments:
-            comments_str += f"{TrelloBoardHtmlFileGenerator.format_comment(comment)}<br>"
-        return comments_str
+        return "".join(f"{TrelloBoardHtmlFileGenerator.format_comment(comment)}<br>" for comment in card.comments)
 
     @staticmethod
     def format_activity(activity):
@@ -341,68 +430,194 @@ class TrelloBoardHtmlFileGenerator:
 
     @staticmethod
     def format_activities(card):
-        act_str = ""
-        for activity in card.activities:
-            act_str += f"{TrelloBoardHtmlFileGenerator.format_activity(activity)}<br>"
-        return act_str
+        return "".join(f"{TrelloBoardHtmlFileGenerator.format_activity(activity)}<br>" for activity in card.activities)
 
     def format_checklist(self, checklist: TrelloChecklist):
-        items_str = ""
-        for item in checklist.items:
-            item_str = "[x] " if item.checked else "[] "
-            item_str += item.get_html() + "<br>"
-            items_str += f"{INDENT * 3}{item_str}"
+        items_str = "".join(f"{INDENT * 3}{'[x] ' if item.checked else '[] '}{item.get_html()}<br>"
+                            for item in checklist.items)
         return f"<p class=\"checklist\">{items_str}</p>"
 
     def format_checklists(self, card):
-        checklist_str = ""
-        for checklist in card.checklists:
-            checklist_str += f"<b>{INDENT * 2}{checklist.name}</b>{self.format_checklist(checklist)}"
+        checklist_str = "".join(f"<b>{INDENT * 2}{checklist.name}</b>{self.format_checklist(checklist)}"
+                                for checklist in card.checklists)
         return f"<p class=\"checklists\">{checklist_str}</p>"
 
-    def _render_card(self, list, card):
-        html = "<hr/><div class =\"card\">"
-        html += f"<h2>CARD: {card.name}</h2>"
-        html += f"{INDENT}<h3>LIST: </h3><p class=\"list\">{INDENT * 2}{list.name}</p>"
+    def _render_card(self, list, card) -> Iterator[str]:
+        yield "<hr/><div class =\"card\">"
+        yield f"<h2>CARD: {card.name}</h2>"
+        yield f"{INDENT}<h3>LIST: </h3><p class=\"list\">{INDENT * 2}{list.name}</p>"
 
         if card.description:
-            html += self.format_plain_text_description(card)
+            yield self.format_plain_text_description(card)
         if self.config.include_labels:
-            html += f"{INDENT}<h3>LABELS: </h3><p class=\"labels\">{INDENT * 2}{card.labels}</p>"
+            yield f"{INDENT}<h3>LABELS: </h3><p class=\"labels\">{INDENT * 2}{card.labels}</p>"
         if self.config.include_due_date:
             due_date = card.due_date if card.due_date else "N/A"
-            html += f"{INDENT}<h3>DUE DATE: </h3><p class=\"dueDate\">{INDENT * 2}{due_date}</p>"
+            yield f"{INDENT}<h3>DUE DATE: </h3><p class=\"dueDate\">{INDENT * 2}{due_date}</p>"
         if self.config.include_comments:
-            html += f"{INDENT}<h3>COMMENTS: </h3><p class=\"comments\">{self.format_comments(card)}</p>"
+            yield f"{INDENT}<h3>COMMENTS: </h3><p class=\"comments\">{self.format_comments(card)}</p>"
         if self.config.include_activity:
-            html += f"{INDENT}<h3>ACTIVITY HISTORY: </h3><p class=\"activity\">{self.format_activities(card)}</p>"
+            yield f"{INDENT}<h3>ACTIVITY HISTORY: </h3><p class=\"activity\">{self.format_activities(card)}</p>"
         if self.config.include_checklists:
             if card.checklists:
-                html += f"{INDENT}<h3>CHECKLISTS: </h3><br>{self.format_checklists(card)}"
-        html += "</div>"
-        return html
+                yield f"{INDENT}<h3>CHECKLISTS: </h3><br>{self.format_checklists(card)}"
+        yield "</div>"
 
-    def render(self, rows, header):
+    def iter_html(self) -> Iterator[str]:
         """
-        Accept rows and header parameters to conform with other Trello output renderer interfaces
+        The HTML document is not kept in memory, it is generated chunk by chunk while writing the file.
         """
-        html = self.default_style
+        yield self.default_style
         for trello_list in self._board.lists:
-            html += f"<h1>LIST: {trello_list.name} ({len(trello_list.cards)} cards)</h1><br><br>"
+            yield f"<h1>LIST: {trello_list.name} ({len(trello_list.cards)} cards)</h1><br><br>"
             for card in trello_list.cards:
-                html += self._render_card(trello_list, card)
-        self.html = html
+                yield from self._render_card(trello_list, card)
 
     def write_file(self, file):
-        FileUtils.write_to_file(file, self.html)
+        with open(file, "w", buffering=OUTPUT_FILE_BUFFER_SIZE) as f:
+            f.writelines(self.iter_html())
 
 class OutputType(enum.Enum):
     HTML_FILE = "html file"
     RICH_HTML_TABLE = "rich html table"
     CUSTOM_HTML_TABLE = "custom html table"
     CSV = "csv"
+    CSV_GZIP = "gzipped csv"
     BOARD_JSON = "board json"
 
+    @property
+    def cli_name(self) -> str:
+        return self.name.lower()
+
+    @property
+    def needs_table_rows(self) -> bool:
+        return self in (OutputType.CUSTOM_HTML_TABLE, OutputType.RICH_HTML_TABLE, OutputType.CSV, OutputType.CSV_GZIP)
+
+    @property
+    def is_csv(self) -> bool:
+        return self in (OutputType.CSV, OutputType.CSV_GZIP)
+
+    @staticmethod
+    def defaults() -> List['OutputType']:
+        """
+        Output types written if none are selected. The gzipped CSV is only written on request.
+        """
+        return [t for t in OutputType if t != OutputType.CSV_GZIP]
+
+    @staticmethod
+    def from_names(names: Iterable[str]) -> List['OutputType']:
+        """
+        Converts format names like 'html_file' or 'board_json' to OutputTypes, keeping the order of the enum.
+        """
+        by_name = {t.cli_name: t for t in OutputType}
+        selected = set()
+        for name in names:
+            name = name.strip().lower()
+            if not name:
+                continue
+            if name not in by_name:
+                raise TrelloException(f"Unknown output format: '{name}'. Possible values: {', '.join(by_name.keys())}")
+            selected.add(by_name[name])
+        if not selected:
+            raise TrelloException(f"No output format selected. Possible values: {', '.join(by_name.keys())}")
+        return [t for t in OutputType if t in selected]
+
+
+def _write_html_file(file_path: str, board: TrelloBoard, html_gen_config: TrelloCardHtmlGeneratorConfig):
+    TrelloBoardHtmlFileGenerator(board, html_gen_config).write_file(file_path)
+
+
+def _write_custom_html_table(file_path: str, board_name: str, rows: List[List[str]], header: List[str]):
+    generator = TrelloBoardHtmlTableGenerator(board_name)
+    generator.render(rows, header)
+    generator.write_file(file_path)
+
+
+def _write_rich_html_table(file_path: str, board_name: str, rows: List[List[str]], header: List[str]):
+    generator = TrelloBoardRichTableGenerator(board_name, print_to_console=False)
+    generator.render(rows, header)
+    generator.write_file(file_path)
+
+
+def _write_csv_file(file_path: str, rows: Iterable[List[str]], header: List[str], compress: bool = False):
+    # Same dialect as CsvFileUtils.append_rows_to_csv_file, rows are written as they are generated
+    if compress:
+        f = gzip.open(file_path, "wt", newline="")
+    else:
+        f = open(file_path, "w", newline="", buffering=OUTPUT_FILE_BUFFER_SIZE)
+    with f:
+        csv_writer = csv.writer(f, delimiter=";", quotechar="|", quoting=csv.QUOTE_MINIMAL)
+        csv_writer.writerow(header)
+        csv_writer.writerows(rows)
+
+
+def _write_gzipped_csv_file(file_path: str, rows: Iterable[List[str]], header: List[str]):
+    _write_csv_file(file_path, rows, header, compress=True)
+
+
+def _write_board_json(file_path: str, board_json):
+    # Uncomment this for other JSON printout
+    # print(json.dumps(parsed_json, sort_keys=True, indent=4, separators=(",", ": ")))
+    with open(file_path, "w") as f:
+        json.dump(board_json, f, indent=4)
+
+
+OUTPUT_WRITERS: Dict[OutputType, Callable[..., None]] = {
+    OutputType.HTML_FILE: _write_html_file,
+    OutputType.CUSTOM_HTML_TABLE: _write_custom_html_table,
+    OutputType.RICH_HTML_TABLE: _write_rich_html_table,
+    OutputType.CSV: _write_csv_file,
+    OutputType.CSV_GZIP: _write_gzipped_csv_file,
+    OutputType.BOARD_JSON: _write_board_json,
+}
+
+
+OUTPUT_FILE_SUFFIXES: Dict[OutputType, str] = {
+    OutputType.HTML_FILE: ".html",
+    OutputType.RICH_HTML_TABLE: "-rich-table.html",
+    OutputType.CUSTOM_HTML_TABLE: "-custom-table.html",
+    OutputType.CSV: ".csv",
+    OutputType.CSV_GZIP: ".csv.gz",
+    OutputType.BOARD_JSON: ".json",
+}
+
+
+def _run_output_writer(output_type: OutputType, file_path: str, args: Tuple) -> float:
+    """
+    Runs a single output writer and returns the elapsed time in seconds.
+    Module level function so it can be submitted to a process pool.
+    """
+    start = time.perf_counter()
+    OUTPUT_WRITERS[output_type](file_path, *args)
+    return time.perf_counter() - start
+
+
+class OutputWriterPool:
+    """
+    Worker processes running the output writers, shared by the boards of a backup run,
+    so the processes are not started (and the package imported in them) again for every board.
+    The processes are started when the first writer is submitted and stopped by close().
+    """
+    def __init__(self, max_workers: Optional[int] = None):
+        self._max_workers = max_workers if max_workers else os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def submit(self, output_type: OutputType, file_path: str, args: Tuple) -> Future:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor.submit(_run_output_writer, output_type, file_path, args)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
 
 class OutputHandler:
     def __init__(self,
@@ -410,71 +625,225 @@ class OutputHandler:
                  output_dir: str,
                  board: TrelloBoard,
                  html_gen_config,
-                 filters: TrelloFilters):
+                 filters: TrelloFilters,
+                 output_types: Iterable[OutputType] = None,
+                 max_workers: Optional[int] = None,
+                 shard_by_list: bool = False,
+                 shard_manifest_dir: str = None,
+                 previous_session: Optional[SessionManifest] = None,
+                 writer_pool: Optional[OutputWriterPool] = None):
         self._data_converter = data_converter
         self._output_dir = output_dir
         self.board = board
+        self._html_gen_config = html_gen_config
         self._set_file_paths()
-        self._set_generators(board, html_gen_config)
-        self._md_formatter = MarkdownFormatter()
+        # Shared formatter, conversions are memoized across boards
+        self._md_formatter = data_converter.md_formatter
         self._filters: TrelloFilters = filters
-        self._callback_gen_files: Callable[[str, str], None] = None
+        self._output_types: List[OutputType] = list(output_types) if output_types else OutputType.defaults()
+        # None: one process per output type (bounded by the CPU count), 1: write outputs in this process
+        self._max_workers = max_workers
+        self._shard_by_list = shard_by_list
+        self._shard_manifest_dir = shard_manifest_dir if shard_manifest_dir else FilePath.SHARD_MANIFEST_DIR
+        self._previous_session = previous_session
+        # None: a pool is created for the outputs of this board
+        self._writer_pool = writer_pool
+        self.fingerprint: Optional[str] = None
 
     def _set_file_paths(self):
         fname_prefix = f"board-{self.board.simple_name}"
-        self._output_file_paths = {
-            OutputType.HTML_FILE: os.path.join(self._output_dir, f"{fname_prefix}.html"),
-            OutputType.RICH_HTML_TABLE: os.path.join(self._output_dir, f"{fname_prefix}-rich-table.html"),
-            OutputType.CUSTOM_HTML_TABLE: os.path.join(self._output_dir, f"{fname_prefix}-custom-table.html"),
-            OutputType.CSV: os.path.join(self._output_dir, f"{fname_prefix}.csv"),
-            OutputType.BOARD_JSON: os.path.join(self._output_dir, f"{fname_prefix}.json"),
-        }
-
-    def _set_generators(self, board, html_gen_config):
-        self._generators: Dict[OutputType, Any] = {
-            OutputType.HTML_FILE: TrelloBoardHtmlFileGenerator(board, html_gen_config),
-            OutputType.CUSTOM_HTML_TABLE: TrelloBoardHtmlTableGenerator(board),
-            OutputType.RICH_HTML_TABLE: TrelloBoardRichTableGenerator(board, print_to_console=False),
-        }
+        self._output_file_paths = {output_type: os.path.join(self._output_dir, f"{fname_prefix}{suffix}")
+                                   for output_type, suffix in OUTPUT_FILE_SUFFIXES.items()}
 
     @staticmethod
     def get_board_filename_by_board(board):
         return f"board-{board.simple_name}.json"
 
-    def write_outputs(self, board_name: str, callback: Callable[[OutputType, str], None]):
-        self._callback_gen_files: Callable[[OutputType, str], None] = callback
+    def _get_writer_args(self, output_type: OutputType, board: TrelloBoard, rows: Iterable[List[str]], header: List[str]) -> Tuple:
+        # Only pass what the writer needs, arguments are pickled when sent to a worker process
+        if output_type == OutputType.HTML_FILE:
+            # The HTML file is rendered from the parsed lists, the board JSON is not needed
+            return dataclasses.replace(board, json=None), self._html_gen_config
+        if output_type in (OutputType.RICH_HTML_TABLE, OutputType.CUSTOM_HTML_TABLE):
+            return board.name, rows, header
+        if output_type == OutputType.BOARD_JSON:
+            return (board.json, )
+        return rows, header
 
-        header: List[str]
-        rows, header = self._data_converter.convert_to_table_rows(self.board, self._filters, self._md_formatter)
-
-        # Outputs: HTML file, HTML table, Rich table
-        for type, generator in self._generators.items():
-            file_path = self._output_file_paths[type]
-            # Assuming all generators have a compatible render signature
-            generator.render(rows, header)
-            generator.write_file(file_path)
-            self._callback_gen_files(board_name, type, file_path)
+    @staticmethod
+    def _get_written_type(output_type: OutputType, table_name: str, rows: Iterable[List[str]]) -> OutputType:
+        """
+        Returns the output type the file of the output type is written as.
+        Tables above RICH_TABLE_MAX_ROWS rows are written as custom HTML tables, to the file of the rich table.
+        """
+        if output_type == OutputType.RICH_HTML_TABLE and len(rows) > RICH_TABLE_MAX_ROWS:
+            # Rich measures every cell and records the whole console, this takes minutes for large boards
+            LOG.warning("Table of '%s' has %d rows (limit: %d), writing the rich table as a custom HTML table",
+                        table_name, len(rows), RICH_TABLE_MAX_ROWS)
+            return OutputType.CUSTOM_HTML_TABLE
+        return output_type
+
+    def write_outputs(self, board_name: str, callback: Callable[[str, OutputType, str, Optional[float], bool], None]):
+        output_types = [t for t in OUTPUT_WRITERS.keys() if t in self._output_types]
+        self.fingerprint = self._compute_fingerprint(output_types)
+        if self._reuse_previous_outputs(board_name, callback):
+            return
+        if self._shard_by_list:
+            self._write_sharded_outputs(board_name, callback, output_types)
+        else:
+            self._write_board_outputs(board_name, callback, output_types)
+        self._md_formatter.save()
 
-        # Handle these output types separately due to unique logic (removal, printing)
-        self._generate_csv_file(board_name, header, rows)
-        self._write_board_json(board_name)
+    def _compute_fingerprint(self, output_types: List[OutputType]) -> str:
+        """
+        Fingerprint of everything the outputs depend on: the board JSON, the parsed board
+        (including comments and checklist URL titles, these are not part of the board JSON) and the output settings.
+        """
+        card_query = self._filters.card_query.text if self._filters.card_query else None
+        return SessionManifest.fingerprint(json.dumps(self.board.json, sort_keys=True),
+                                           list(self.board.lists),
+                                           [t.cli_name for t in output_types],
+                                           self._html_gen_config,
+                                           self._filters.card_filters,
+                                           card_query,
+                                           self._shard_by_list)
+
+    def _reuse_previous_outputs(self, board_name: str, callback) -> bool:
+        if not self._previous_session:
+            return False
+        files = self._previous_session.get_reusable_files(board_name, self.fingerprint)
+        if not files:
+            return False
+
+        by_name = {t.cli_name: t for t in OutputType}
+        for fmt, previous_file, rel_path in files:
+            file_path = os.path.join(self._output_dir, rel_path)
+            FsUtils.link_or_copy(previous_file, file_path)
+            self._report_output(board_name, callback, by_name[fmt], file_path, None, reused=True)
+        LOG.info("Board '%s' is unchanged since the previous session, reused %d output files from: %s",
+                 board_name, len(files), self._previous_session.backup_dir)
+        return True
+
+    def _write_board_outputs(self, board_name: str, callback, output_types: List[OutputType]):
+        header: List[str] = self._data_converter.table_header
+        rows: Iterable[List[str]] = []
+        # Converting the board to table rows (markdown rendering included) is only needed for table outputs.
+        # A single CSV output consumes the rows as they are generated, in this process.
+        row_consumers = [t for t in output_types if t.needs_table_rows]
+        lazy_rows = len(row_consumers) == 1 and row_consumers[0].is_csv
+        if lazy_rows:
+            rows = self._data_converter.iter_table_rows(self.board, self._filters, self._md_formatter)
+        elif row_consumers:
+            rows, header = self._data_converter.convert_to_table_rows(self.board, self._filters, self._md_formatter)
+
+        tasks = [(self._get_written_type(output_type, board_name, rows), self._output_file_paths[output_type],
+                  self._get_writer_args(output_type, self.board, rows, header))
+                 for output_type in output_types]
+        local_tasks = [task for task in tasks if lazy_rows and task[0].needs_table_rows]
+        elapsed_by_file = self._run_writers(tasks, local_tasks)
+
+        # Report in a deterministic order, with the type the file was written as
+        for output_type, file_path, _ in tasks:
+            self._report_output(board_name, callback, output_type, file_path, elapsed_by_file[file_path])
+
+    def _write_sharded_outputs(self, board_name: str, callback, output_types: List[OutputType]):
+        """
+        Writes the outputs of each list to separate files and an index page linking them.
+        The board JSON is not sharded, it is the raw API response.
+        Shards of lists that did not change since they were last written are reused instead of rendered again.
+        """
+        shard_dir = os.path.join(self._output_dir, f"board-{self.board.simple_name}")
+        os.makedirs(shard_dir, exist_ok=True)
+        manifest = ListShardManifest(os.path.join(self._shard_manifest_dir, f"board-{self.board.simple_name}.json"))
+        shard_types = [t for t in output_types if t != OutputType.BOARD_JSON]
+        formats = [t.cli_name for t in shard_types]
+        header = self._data_converter.table_header
+        needs_rows = any(t.needs_table_rows for t in shard_types)
+
+        tasks = []
+        shards: List[ListShard] = []
+        for idx, trello_list in enumerate(self.board.lists):
+            list_board = TrelloBoard(id=self.board.id, json=None, name=self.board.name, lists=[trello_list])
+            fingerprint = ListShardManifest.fingerprint(self.board.name, trello_list, formats,
+                                                        self._html_gen_config, self._filters.card_filters)
+            file_prefix = os.path.join(shard_dir, ListShardUtils.get_file_prefix(idx, trello_list.name))
+            files = {t.cli_name: f"{file_prefix}{OUTPUT_FILE_SUFFIXES[t]}" for t in shard_types}
+            previous_files = manifest.get_files(trello_list.id, fingerprint, formats)
+            shard = ListShard(trello_list.id, trello_list.name, len(trello_list.cards), fingerprint, files,
+                              reused=previous_files is not None)
+            shards.append(shard)
+            if previous_files:
+                shard.fallbacks = manifest.get_fallbacks(trello_list.id)
+                for fmt, previous_file in previous_files.items():
+                    FsUtils.link_or_copy(previous_file, files[fmt])
+                continue
 
-    # TODO ASAP Consider migrating these to generator classes
-    def _generate_csv_file(self, board_name, header: list[str | Any], rows: list[Any]):
-        file_path = self._output_file_paths[OutputType.CSV]
-        if os.path.exists(file_path):
-            FileUtils.remove_file(file_path)
-        CsvFileUtils.append_rows_to_csv_file(file_path, rows, header=header)
-        self._callback_gen_files(board_name, OutputType.CSV, file_path)
+            rows = self._data_converter.convert_to_table_rows(list_board, self._filters, self._md_formatter)[0] if needs_rows else []
+            for t in shard_types:
+                written_type = self._get_written_type(t, f"{board_name}/{trello_list.name}", rows)
+                if written_type != t:
+                    shard.fallbacks[t.cli_name] = written_type.cli_name
+                tasks.append((written_type, files[t.cli_name], self._get_writer_args(t, list_board, rows, header)))
+        if OutputType.BOARD_JSON in output_types:
+            board_json_file = self._output_file_paths[OutputType.BOARD_JSON]
+            tasks.append((OutputType.BOARD_JSON, board_json_file, self._get_writer_args(OutputType.BOARD_JSON, self.board, [], header)))
+
+        elapsed_by_file = self._run_writers(tasks, [])
+        index_file = os.path.join(shard_dir, SHARD_INDEX_FILE_NAME)
+        ListShardUtils.write_index(index_file, self.board.name, shards, {t.cli_name: t.value for t in shard_types})
+        manifest.update(shards)
+        manifest.save()
+        LOG.info("Wrote %d list shards of board '%s', reused %d unchanged ones",
+                 len(shards), board_name, sum(1 for s in shards if s.reused))
+
+        self._report_output(board_name, callback, OutputType.HTML_FILE, index_file, None)
+        by_name = {t.cli_name: t for t in OutputType}
+        for shard in shards:
+            for t in shard_types:
+                file_path = shard.files[t.cli_name]
+                written_type = by_name[shard.fallbacks.get(t.cli_name, t.cli_name)]
+                self._report_output(board_name, callback, written_type, file_path, elapsed_by_file.get(file_path),
+                                    reused=shard.reused)
+        if OutputType.BOARD_JSON in output_types:
+            self._report_output(board_name, callback, OutputType.BOARD_JSON, board_json_file, elapsed_by_file[board_json_file])
+
+    def _run_writers(self, tasks: List[Tuple[OutputType, str, Tuple]], local_tasks: List[Tuple[OutputType, str, Tuple]]) -> Dict[str, float]:
+        """
+        Runs the writers and returns the elapsed seconds by file path.
+        Local tasks are run in this process, e.g. the ones consuming a row generator that can't be pickled.
+        """
+        # Compared by file path, comparing the tasks would compare their rows
+        local_file_paths = {file_path for _, file_path, _ in local_tasks}
+        pool_tasks = [task for task in tasks if task[1] not in local_file_paths]
+        max_workers = self._max_workers if self._max_workers else min(len(pool_tasks), os.cpu_count() or 1)
+        if max_workers <= 1:
+            return {file_path: _run_output_writer(output_type, file_path, args) for output_type, file_path, args in tasks}
+
+        if self._writer_pool is not None:
+            return self._run_writers_in_pool(self._writer_pool, pool_tasks, local_tasks)
+        with OutputWriterPool(max_workers) as writer_pool:
+            return self._run_writers_in_pool(writer_pool, pool_tasks, local_tasks)
 
-    def _write_board_json(self, board_name):
-        # Uncomment this for other JSON printout
-        # print(json.dumps(parsed_json, sort_keys=True, indent=4, separators=(",", ": ")))
+    @staticmethod
+    def _run_writers_in_pool(writer_pool: OutputWriterPool,
+                             pool_tasks: List[Tuple[OutputType, str, Tuple]],
+                             local_tasks: List[Tuple[OutputType, str, Tuple]]) -> Dict[str, float]:
+        # The writers are independent of each other, the Rich table rendering is the most CPU heavy one
+        futures = {file_path: writer_pool.submit(output_type, file_path, args) for output_type, file_path, args in pool_tasks}
+        elapsed_by_file: Dict[str, float] = {}
+        for output_type, file_path, args in local_tasks:
+            elapsed_by_file[file_path] = _run_output_writer(output_type, file_path, args)
+        # result() re-raises the writer's exception
+        for file_path, future in futures.items():
+            elapsed_by_file[file_path] = future.result()
+        return elapsed_by_file
 
-        file_path = self._output_file_paths[OutputType.BOARD_JSON]
-        with open(file_path, "w") as f:
-            json.dump(self.board.json, f, indent=4)
-        self._callback_gen_files(board_name, OutputType.BOARD_JSON, file_path)
+    @staticmethod
+    def _report_output(board_name: str, callback, output_type: OutputType, file_path: str, elapsed: Optional[float],
+                       reused: bool = False):
+        if elapsed is not None:
+            LOG.debug("Wrote %s output of board '%s' in %.3fs: %s", output_type.value, board_name, elapsed, file_path)
+        callback(board_name, output_type, file_path, elapsed, reused)
 
 
 class OutputHandlerFactory:
@@ -483,14 +852,21 @@ class OutputHandlerFactory:
                          backup_dir: str,
                          board: TrelloBoard,
                          html_gen_config: TrelloCardHtmlGeneratorMode,
-                         filters: TrelloFilters) -> OutputHandler:
-        return OutputHandler(data_converter, backup_dir, board, html_gen_config, filters)
+                         filters: TrelloFilters,
+                         output_types: Iterable[OutputType] = None,
+                         max_workers: Optional[int] = None,
+                         shard_by_list: bool = False,
+                         previous_session: Optional[SessionManifest] = None,
+                         writer_pool: Optional[OutputWriterPool] = None) -> OutputHandler:
+        return OutputHandler(data_converter, backup_dir, board, html_gen_config, filters,
+                             output_types=output_types, max_workers=max_workers, shard_by_list=shard_by_list,
+                             previous_session=previous_session, writer_pool=writer_pool)
 
 
 
 class TrelloBoardRichTableGenerator:
-    def __init__(self, board, print_to_console=False):
-        self._board = board
+    def __init__(self, board_name: str, print_to_console=False):
+        self._board_name = board_name
         self._console = ConsoleUtils.create_console(record=True, log_to_console=print_to_console, wide=True)
 
     def render(self, rows, header: List[str]):
@@ -512,7 +888,7 @@ class TrelloBoardRichTableGenerator:
                                            wide_print=True,
                                            show_lines=True,
                                            additional_table_config={"expand": True, "min_width": 800})
-        table = TrelloTable(header, render, title=f"TRELLO EXPORT OF BOARD: {self._board.name}")
+        table = TrelloTable(header, render, title=f"TRELLO EXPORT OF BOARD: {self._board_name}")
         table.render(rows)
         self._console.print(table._table)
 
@@ -525,6 +901,10 @@ class TrelloListAndCardsPrinter:
         """
         Prints the structured Trello data using the rich library for nice formatting.
         """
+        from rich.console import Console
+        from rich.style import Style
+        from rich.table import Table
+        from rich.text import Text
         console = Console()
 
         # Define styles for reuse
@@ -635,37 +1015,53 @@ class TrelloListAndCardsPrinter:
 
 
 class TrelloBoardHtmlTableGenerator:
-    DEFAULT_TABLE_FORMATS = [TabulateTableFormat.HTML]
-
-    def __init__(self, board):
-        self._tables = {}
+    """
+    Writes the table rows with HtmlTableWriter, one section per Trello list.
+    Large tables are paginated in the browser.
+    """
+    def __init__(self, board_name: Optional[str], page_size: int = HTML_TABLE_PAGE_SIZE):
+        self._title = f"TRELLO EXPORT OF BOARD: {board_name}" if board_name else ""
+        self._page_size = page_size
+        self._rows = []
+        self._header = []
 
     def render(self, rows, header):
-        render_conf = TableRenderingConfig(
-            row_callback=lambda row: row,
-            print_result=False,
-            max_width=200,
-            max_width_separator=os.sep,
-            tabulate_formats=TrelloBoardHtmlTableGenerator.DEFAULT_TABLE_FORMATS,
-        )
-        self._tables: Dict[TabulateTableFormat, str] = ResultPrinter.print_tables(
-            data=rows,
-            header=header,
-            render_conf=render_conf,
-        )
+        self._rows = rows
+        self._header = header
 
     def write_file(self, file):
-        for fmt, table in self._tables.items():
-            FileUtils.save_to_file(file, table)
+        writer = HtmlTableWriter(self._header,
+                                 title=self._title,
+                                 section_col=TableHeaderFieldName.LIST.value,
+                                 page_size=self._page_size)
+        writer.write_file(file, self._rows, buffer_size=OUTPUT_FILE_BUFFER_SIZE)
 
 
 class BackupReport:
     def __init__(self):
         self._generated_files: defaultdict[str, defaultdict[OutputType, List[str]]] = \
             defaultdict(lambda: defaultdict(list))
+        self._elapsed_by_file: Dict[str, float] = {}
+        self._reused_files: Set[str] = set()
 
-    def file_write_callback(self, board_name: str, file_type: OutputType, file_path: str):
+    def file_write_callback(self, board_name: str, file_type: OutputType, file_path: str, elapsed: float = None,
+                            reused: bool = False):
         self._generated_files[board_name][file_type].append(file_path)
+        if elapsed is not None:
+            self._elapsed_by_file[file_path] = elapsed
+        if reused:
+            self._reused_files.add(file_path)
+
+    def is_reused(self, file_path: str) -> bool:
+        return file_path in self._reused_files
+
+    def get_elapsed(self, file_path: str) -> Optional[float]:
+        return self._elapsed_by_file.get(file_path)
+
+    def get_board_files(self, board_name: str) -> List[Tuple[OutputType, str]]:
+        return [(file_type, file_path)
+                for file_type, file_paths in self._generated_files.get(board_name, {}).items()
+                for file_path in file_paths]
         # if file_type in self._generated_files:
         #     raise ValueError(f"File type {file_type} is already generated as {self._generated_files[file_type]}. Preventing overwrites!")
 
@@ -693,4 +1089,9 @@ class BackupReport:
             for out_type, filenames in board_files.items():
                 # Print each filename on a new line for clarity
                 for filename in filenames:
-                    CLI_LOG.info("Generated %s file: %s", out_type.value, filename)
+                    if filename in self._reused_files:
+                        CLI_LOG.info("Reused %s file: %s", out_type.value, filename)
+                    elif filename in self._elapsed_by_file:
+                        CLI_LOG.info("Generated %s file: %s (%.2fs)", out_type.value, filename, self._elapsed_by_file[filename])
+                    else:
+                        CLI_LOG.info("Generated %s file: %s", out_type.value, filename)
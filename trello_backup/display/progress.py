@@ -0,0 +1,61 @@
+import logging
+import time
+from typing import Optional
+
+from trello_backup.display.console import CliLogger
+
+LOG = logging.getLogger(__name__)
+CLI_LOG = CliLogger(LOG)
+
+
+class ProgressReporter:
+    """
+    Cheap progress reporting for long-running loops (parsing cards, downloading attachments, fetching titles).
+    Per-item messages are only emitted at DEBUG level.
+    The INFO level summary line goes through CLI_LOG, but it is throttled so that it is printed
+    at most once per 'report_interval' seconds, plus once when the loop is finished.
+    """
+    DEFAULT_REPORT_INTERVAL_SECONDS = 2.0
+
+    def __init__(self,
+                 description: str,
+                 total: int,
+                 report_interval: float = DEFAULT_REPORT_INTERVAL_SECONDS,
+                 clock=time.monotonic):
+        self.description = description
+        self.total = total
+        self.count = 0
+        self._report_interval = report_interval
+        self._clock = clock
+        self._start = clock()
+        self._last_report = self._start
+        # Resolve this once, a disabled DEBUG level should cost nothing per item
+        self._debug_enabled = LOG.isEnabledFor(logging.DEBUG)
+        self._finished = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.finish()
+
+    def advance(self, item_name: Optional[str] = None, steps: int = 1):
+        self.count += steps
+        if self._debug_enabled and item_name is not None:
+            LOG.debug("%s: %d / %d (%s)", self.description, self.count, self.total, item_name)
+
+        now = self._clock()
+        if now - self._last_report >= self._report_interval:
+            self._last_report = now
+            self._report(now)
+
+    def finish(self):
+        if self._finished:
+            return
+        self._finished = True
+        if self.total > 0:
+            self._report(self._clock())
+
+    def _report(self, now: float):
+        elapsed = now - self._start
+        CLI_LOG.info("%s: %d / %d (%.1fs)", self.description, self.count, self.total, elapsed)
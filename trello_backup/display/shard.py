@@ -0,0 +1,96 @@
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from html import escape
+from typing import Dict, Optional, List, Iterable
+
+from trello_backup.utils import HashUtils
+
+LOG = logging.getLogger(__name__)
+
+# Increase this if the rendering of the shards changes, so previously written shards are not reused
+SHARD_FORMAT_VERSION = 1
+SHARD_INDEX_FILE_NAME = "index.html"
+
+
+@dataclass
+class ListShard:
+    list_id: str
+    list_name: str
+    card_count: int
+    fingerprint: str
+    # Output format name -> file path
+    files: Dict[str, str]
+    reused: bool = False
+    # Output format name -> format name the file was written as, if it differs (e.g. rich table of a large list)
+    fallbacks: Dict[str, str] = field(default_factory=dict)
+
+
+class ListShardManifest:
+    """
+    Fingerprints and file paths of the list shards written for a board.
+    Used to skip writing the shards of lists that did not change since the last session.
+    """
+    def __init__(self, file_path: str):
+        self._file_path = file_path
+        self._shards: Dict[str, Dict] = {}
+        if os.path.exists(file_path):
+            try:
+                with open(file_path) as f:
+                    self._shards = json.load(f)
+            except (OSError, ValueError) as e:
+                LOG.warning("Ignoring unreadable list shard manifest: %s, error: %s", file_path, e)
+
+    @staticmethod
+    def fingerprint(*parts) -> str:
+        return HashUtils.fingerprint(SHARD_FORMAT_VERSION, *parts)
+
+    def get_files(self, list_id: str, fingerprint: str, formats: Iterable[str]) -> Optional[Dict[str, str]]:
+        """
+        Returns the previously written files of the list if its fingerprint matches and all files still exist.
+        """
+        shard = self._shards.get(list_id)
+        if not shard or shard["fingerprint"] != fingerprint:
+            return None
+        files = shard["files"]
+        if not all(fmt in files and os.path.exists(files[fmt]) for fmt in formats):
+            return None
+        return {fmt: files[fmt] for fmt in formats}
+
+    def get_fallbacks(self, list_id: str) -> Dict[str, str]:
+        shard = self._shards.get(list_id)
+        return shard.get("fallbacks", {}) if shard else {}
+
+    def update(self, shards: List[ListShard]):
+        # Lists removed from the board are dropped from the manifest
+        self._shards = {s.list_id: {"fingerprint": s.fingerprint, "files": s.files, "fallbacks": s.fallbacks}
+                        for s in shards}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self._file_path), exist_ok=True)
+        tmp_file = f"{self._file_path}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self._shards, f, indent=2)
+        os.replace(tmp_file, self._file_path)
+
+
+class ListShardUtils:
+    @staticmethod
+    def get_file_prefix(idx: int, list_name: str) -> str:
+        simple_name = re.sub(r"[^\w.-]+", "-", list_name).strip("-").lower()
+        return f"list-{idx:03d}-{simple_name}"
+
+    @staticmethod
+    def write_index(file_path: str, board_name: str, shards: List[ListShard], format_names: Dict[str, str]):
+        base_dir = os.path.dirname(file_path)
+        with open(file_path, "w") as f:
+            f.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{escape(board_name)}</title></head><body>\n")
+            f.write(f"<h1>TRELLO EXPORT OF BOARD: {escape(board_name)}</h1>\n<table>\n")
+            f.write("<tr><th>List</th><th>Cards</th><th>Files</th></tr>\n")
+            for shard in shards:
+                links = " | ".join(f"<a href=\"{escape(os.path.relpath(path, base_dir))}\">{escape(format_names[fmt])}</a>"
+                                   for fmt, path in shard.files.items())
+                f.write(f"<tr><td>{escape(shard.list_name)}</td><td>{shard.card_count}</td><td>{links}</td></tr>\n")
+            f.write("</table>\n</body></html>\n")
@@ -1,8 +1,7 @@
 import logging
 from collections import defaultdict
-from typing import List, Any, Dict
-
-from rich.table import Table
+from html import escape
+from typing import List, Any, Dict, Iterable, Iterator, Optional, Sequence
 
 from trello_backup.display.console import CliLogger
 
@@ -84,6 +83,7 @@ class TrelloTable:
         self._render_settings: TrelloTableRenderSettings = render_settings
         self._cols = cols
         self._rows = None
+        from rich.table import Table
         self._table = Table(title=title, **self._render_settings.get_table_config_dict())
 
         for col in cols:
@@ -100,3 +100,81 @@ class TrelloTable:
 
     def print(self):
         CLI_LOG.print(self._table, wide_print=self._render_settings._wide_print)
+
+
+class HtmlTableWriter:
+    """
+    Streams an HTML table row by row, without computing column widths or keeping the document in memory.
+    Rows can be grouped to sections by the value of a column and paginated in the browser.
+    """
+    STYLE = """<style>
+    table { border-collapse: collapse; font-family: sans-serif; font-size: 13px; }
+    th, td { border: 1px solid #ccc; padding: 4px 6px; text-align: left; vertical-align: top; }
+    thead th { background-color: #eee; position: sticky; top: 0; }
+    tr.section th { background-color: #dde8f5; }
+    #pager { margin: 10px 0; }
+</style>"""
+    # Shows page_size rows at a time, sections without visible rows are hidden
+    PAGINATION_SCRIPT = """<div id="pager"><button id="prev">&lt;</button> <span id="page"></span> <button id="next">&gt;</button></div>
+<script>
+(function() {
+    const pageSize = %d;
+    const rows = Array.from(document.querySelectorAll("tr.row"));
+    const pages = Math.ceil(rows.length / pageSize);
+    let current = 0;
+    function show(page) {
+        current = Math.min(Math.max(page, 0), pages - 1);
+        rows.forEach((row, i) => { row.hidden = Math.floor(i / pageSize) !== current; });
+        document.querySelectorAll("tbody").forEach(section => {
+            section.hidden = !section.querySelector("tr.row:not([hidden])");
+        });
+        document.getElementById("page").textContent = `Page ${current + 1} / ${pages}`;
+    }
+    document.getElementById("prev").onclick = () => show(current - 1);
+    document.getElementById("next").onclick = () => show(current + 1);
+    show(0);
+})();
+</script>"""
+
+    def __init__(self,
+                 header: List[str],
+                 title: str = "",
+                 section_col: Optional[str] = None,
+                 page_size: Optional[int] = None):
+        self._header = header
+        self._title = title
+        self._section_col_idx: Optional[int] = header.index(section_col) if section_col in header else None
+        self._page_size = page_size
+
+    def iter_html(self, rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+        yield "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        yield f"<title>{escape(self._title)}</title>{self.STYLE}</head><body>\n"
+        if self._title:
+            yield f"<h1>{escape(self._title)}</h1>\n"
+        yield "<table><thead><tr>"
+        yield "".join(f"<th>{escape(col)}</th>" for col in self._header)
+        yield "</tr></thead>\n"
+
+        section_idx = self._section_col_idx
+        section_header = f"<tr class=\"section\"><th colspan=\"{len(self._header)}\">"
+        section = None
+        row_count = 0
+        yield "<tbody>\n"
+        for row in rows:
+            if section_idx is not None and row[section_idx] != section:
+                if row_count:
+                    yield "</tbody>\n<tbody>\n"
+                section = row[section_idx]
+                yield f"{section_header}{escape(str(section), quote=False)}</th></tr>\n"
+            yield "<tr class=\"row\"><td>" + "</td><td>".join(escape(str(val), quote=False) for val in row) + "</td></tr>\n"
+            row_count += 1
+        yield "</tbody></table>\n"
+
+        if self._page_size and row_count > self._page_size:
+            yield self.PAGINATION_SCRIPT % self._page_size
+        yield "</body></html>\n"
+        LOG.debug("Rendered HTML table '%s' with %d rows", self._title, row_count)
+
+    def write_file(self, file: str, rows: Iterable[Sequence[Any]], buffer_size: int = 1024 * 1024):
+        with open(file, "w", buffering=buffer_size) as f:
+            f.writelines(self.iter_html(rows))
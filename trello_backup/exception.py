@@ -10,3 +10,12 @@ class TrelloConfigException(TrelloException):
     def __init__(self, message, errors=None):
         super().__init__(message, errors)
 
+
+class TrelloQueryException(TrelloException):
+    def __init__(self, message, errors=None):
+        super().__init__(message, errors)
+
+
+class TrelloSnapshotException(TrelloException):
+    def __init__(self, message, errors=None):
+        super().__init__(message, errors)
@@ -0,0 +1,289 @@
+import dataclasses
+import datetime
+import glob
+import hashlib
+import json
+import logging
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List, Tuple, Any, Iterable, Iterator
+
+from trello_backup.constants import FilePath
+from trello_backup.utils import HashUtils
+
+LOG = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME = "manifest.json"
+SESSION_DIR_PREFIX = "session-"
+# Increase this if the rendering of the outputs changes, so outputs of previous sessions are not reused
+OUTPUT_FORMAT_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class OutputFileRecord:
+    type: str
+    # Relative to the backup dir
+    path: str
+    size: int
+    sha256: str
+    elapsed: Optional[float] = None
+    reused: bool = False
+
+
+@dataclass
+class BoardBackupRecord:
+    board_name: str
+    board_id: str
+    fingerprint: str
+    files: List[OutputFileRecord]
+    # Card ID -> short hash of the card JSON
+    card_fingerprints: Dict[str, str] = field(default_factory=dict)
+    # Cards added or changed since the previous backup of the board
+    changed_card_ids: List[str] = field(default_factory=list)
+    elapsed: Optional[float] = None
+    api_calls: Dict[str, int] = field(default_factory=dict)
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'BoardBackupRecord':
+        d = dict(d)
+        d["files"] = [OutputFileRecord(**f) for f in d.get("files", [])]
+        return BoardBackupRecord(**d)
+
+
+class SessionManifest:
+    """
+    Machine-readable summary of the boards backed up into a backup dir:
+    fingerprints, output files with sizes and hashes, timings and API call counts.
+    """
+    def __init__(self, backup_dir: str, boards: Dict[str, BoardBackupRecord] = None, created: str = None):
+        self.backup_dir = backup_dir
+        self.boards: Dict[str, BoardBackupRecord] = boards if boards else {}
+        self.created = created if created else datetime.datetime.now().isoformat(timespec="seconds")
+
+    @property
+    def file_path(self) -> str:
+        return os.path.join(self.backup_dir, MANIFEST_FILE_NAME)
+
+    @property
+    def session_name(self) -> Optional[str]:
+        """
+        Name of the session dir, backup dirs of sessions are: <output dir>/session-<timestamp>/backups
+        """
+        name = os.path.basename(os.path.dirname(os.path.abspath(self.backup_dir)))
+        return name if name.startswith(SESSION_DIR_PREFIX) else None
+
+    @staticmethod
+    def fingerprint(*parts) -> str:
+        return HashUtils.fingerprint(OUTPUT_FORMAT_VERSION, *parts)
+
+    @staticmethod
+    def card_fingerprints(board_json: Dict[str, Any]) -> Dict[str, str]:
+        return {card["id"]: HashUtils.fingerprint(card)[:16] for card in board_json.get("cards", [])}
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        h = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    @classmethod
+    def load(cls, backup_dir: str) -> Optional['SessionManifest']:
+        file_path = os.path.join(backup_dir, MANIFEST_FILE_NAME)
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path) as f:
+                data = json.load(f)
+            boards = {name: BoardBackupRecord.from_dict(b) for name, b in data.get("boards", {}).items()}
+        except (OSError, ValueError, TypeError) as e:
+            LOG.warning("Ignoring unreadable session manifest: %s, error: %s", file_path, e)
+            return None
+        return cls(backup_dir, boards, created=data.get("created"))
+
+    @classmethod
+    def find_previous(cls, backup_dir: str) -> Optional['SessionManifest']:
+        """
+        Returns the manifest of the backup dir itself if it exists (e.g. no session dirs are used),
+        otherwise the most recent manifest of other sessions' backup dirs.
+        This scans the session dirs, BackupIndex.latest should be preferred.
+        """
+        manifest = cls.load(backup_dir)
+        if manifest:
+            return manifest
+
+        output_dir = os.path.dirname(os.path.dirname(os.path.abspath(backup_dir)))
+        backup_dir_name = os.path.basename(os.path.normpath(backup_dir))
+        manifest_files = glob.glob(os.path.join(output_dir, f"{SESSION_DIR_PREFIX}*", backup_dir_name, MANIFEST_FILE_NAME))
+        for manifest_file in sorted(manifest_files, key=os.path.getmtime, reverse=True):
+            manifest = cls.load(os.path.dirname(manifest_file))
+            if manifest:
+                LOG.debug("Found previous session manifest: %s", manifest_file)
+                return manifest
+        return None
+
+    def create_board_record(self,
+                            board_name: str,
+                            board_id: str,
+                            fingerprint: Optional[str],
+                            files: Iterable[Tuple[str, str, Optional[float], bool]],
+                            board_json: Dict[str, Any] = None,
+                            previous: Optional['SessionManifest'] = None,
+                            elapsed: float = None,
+                            api_calls: Dict[str, int] = None) -> BoardBackupRecord:
+        """
+        :param files: output format name, absolute file path, elapsed seconds of writing the file
+        and whether the file was reused from the previous session
+        """
+        previous_board = previous.boards.get(board_name) if previous else None
+        previous_files = {f.path: f for f in previous_board.files} if previous_board else {}
+        file_records = []
+        for fmt, file_path, file_elapsed, reused in files:
+            rel_path = os.path.relpath(file_path, self.backup_dir)
+            previous_file = previous_files.get(rel_path)
+            if reused and previous_file:
+                # Reused files are identical to the previous ones, no need to hash them again
+                file_records.append(dataclasses.replace(previous_file, elapsed=None, reused=True))
+                continue
+            file_records.append(OutputFileRecord(fmt, rel_path, os.path.getsize(file_path), self.hash_file(file_path),
+                                                 elapsed=file_elapsed, reused=reused))
+
+        card_fingerprints = self.card_fingerprints(board_json) if board_json else {}
+        previous_cards = previous_board.card_fingerprints if previous_board else {}
+        changed_card_ids = [card_id for card_id, fp in card_fingerprints.items() if previous_cards.get(card_id) != fp]
+        return BoardBackupRecord(board_name, board_id, fingerprint, file_records, card_fingerprints, changed_card_ids,
+                                 elapsed=elapsed, api_calls=api_calls if api_calls else {})
+
+    def add_board(self, record: BoardBackupRecord):
+        self.boards[record.board_name] = record
+
+    def get_reusable_files(self, board_name: str, fingerprint: str) -> Optional[List[Tuple[str, str, str]]]:
+        """
+        Returns the output format name, absolute and relative path of the board's files
+        if the fingerprint matches and all files still exist.
+        """
+        board = self.boards.get(board_name)
+        if not board or not board.files or board.fingerprint != fingerprint:
+            return None
+        files = [(f.type, os.path.join(self.backup_dir, f.path), f.path) for f in board.files]
+        if not all(os.path.exists(abs_path) for _, abs_path, _ in files):
+            return None
+        return files
+
+    def to_dict(self) -> Dict[str, Any]:
+        api_calls = defaultdict(int)
+        for board in self.boards.values():
+            for call, count in board.api_calls.items():
+                api_calls[call] += count
+        return {
+            "session": self.session_name,
+            "created": self.created,
+            "api_calls": dict(api_calls),
+            "boards": {name: dataclasses.asdict(board) for name, board in self.boards.items()},
+        }
+
+    def save(self):
+        os.makedirs(self.backup_dir, exist_ok=True)
+        tmp_file = f"{self.file_path}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_file, self.file_path)
+
+
+class BackupIndex:
+    """
+    Global, append-only index of board backups across sessions, one JSON line per backed up board.
+    The latest entry of each board is also kept in a small JSON file next to the index, replaced atomically on append,
+    so looking up the latest backup does not read the whole index. The index is only read to find the backups changing a card.
+    """
+    def __init__(self, file_path: str = None):
+        self._file_path = file_path if file_path else FilePath.BACKUP_INDEX_FILE
+        self._latest_file_path = f"{os.path.splitext(self._file_path)[0]}-latest.json"
+        self._latest_by_board: Optional[Dict[str, Dict[str, Any]]] = None
+        self._sessions_by_card: Optional[Dict[str, List[str]]] = None
+
+    def _iter_entries(self) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(self._file_path):
+            return
+        with open(self._file_path) as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    LOG.warning("Skipping invalid line %d of backup index: %s", line_no, self._file_path)
+
+    def _ensure_latest_loaded(self):
+        if self._latest_by_board is not None:
+            return
+        if os.path.exists(self._latest_file_path):
+            try:
+                with open(self._latest_file_path) as f:
+                    self._latest_by_board = json.load(f)["boards"]
+                return
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                LOG.warning("Rebuilding unreadable latest backups file: %s, error: %s", self._latest_file_path, e)
+        # Index written before the latest backups file existed, or the file is broken
+        self._latest_by_board = {}
+        for entry in self._iter_entries():
+            self._latest_by_board[entry["board"]] = BackupIndex._to_latest_entry(entry)
+        if self._latest_by_board:
+            self._save_latest()
+
+    def _ensure_sessions_by_card_loaded(self):
+        if self._sessions_by_card is not None:
+            return
+        self._sessions_by_card = defaultdict(list)
+        for entry in self._iter_entries():
+            self._add_card_sessions(entry)
+
+    def _add_card_sessions(self, entry: Dict[str, Any]):
+        for card_id in entry.get("changed_card_ids", []):
+            self._sessions_by_card[card_id].append(entry["backup_dir"])
+
+    @staticmethod
+    def _to_latest_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in entry.items() if k != "changed_card_ids"}
+
+    def _save_latest(self):
+        tmp_file = f"{self._latest_file_path}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump({"boards": self._latest_by_board}, f, indent=2)
+        os.replace(tmp_file, self._latest_file_path)
+
+    def append(self, manifest: SessionManifest, record: BoardBackupRecord):
+        self._ensure_latest_loaded()
+        entry = {
+            "session": manifest.session_name,
+            "backup_dir": os.path.abspath(manifest.backup_dir),
+            "created": manifest.created,
+            "board": record.board_name,
+            "board_id": record.board_id,
+            "fingerprint": record.fingerprint,
+            "changed_card_ids": record.changed_card_ids,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self._file_path)), exist_ok=True)
+        with open(self._file_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        self._latest_by_board[entry["board"]] = BackupIndex._to_latest_entry(entry)
+        self._save_latest()
+        if self._sessions_by_card is not None:
+            self._add_card_sessions(entry)
+
+    def latest(self, board_name: str) -> Optional[Dict[str, Any]]:
+        self._ensure_latest_loaded()
+        return self._latest_by_board.get(board_name)
+
+    def latest_session(self) -> Optional[str]:
+        self._ensure_latest_loaded()
+        if not self._latest_by_board:
+            return None
+        return max(self._latest_by_board.values(), key=lambda e: e["created"])["session"]
+
+    def backup_dirs_changing_card(self, card_id: str) -> List[str]:
+        self._ensure_sessions_by_card_loaded()
+        return list(dict.fromkeys(self._sessions_by_card.get(card_id, [])))
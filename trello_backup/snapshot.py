@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import zlib
+from typing import Dict, Any, List, Optional, Tuple
+
+from trello_backup.constants import FilePath
+from trello_backup.exception import TrelloSnapshotException
+from trello_backup.trello.model import TrelloBoard
+
+LOG = logging.getLogger(__name__)
+
+# Arrays of the board JSON whose elements are stored as separate objects
+CHUNKED_KEYS = ("cards", "lists", "checklists", "actions")
+OBJECTS_DIR_NAME = "objects"
+SESSIONS_DIR_NAME = "sessions"
+CACHE_DIR_NAME = "cache"
+
+
+class SnapshotStore:
+    """
+    Content-addressed store of board JSONs.
+    Cards, lists, checklists and actions of a board are stored as separate objects keyed by their SHA-256,
+    so objects that did not change between sessions are stored only once.
+    The rest of the board JSON is stored as a root object that references the hashes of these objects.
+
+    Layout:
+      objects/<2 hex chars>/<remaining hex chars>: zlib compressed JSON of an object
+      sessions/<session>.json: board name -> board ID and hash of the root object
+      cache/<board ID>.pickle: hash of the root object and the board JSON of the latest loaded snapshot of the board
+    """
+    def __init__(self, root_dir: str = None):
+        self._root_dir = root_dir if root_dir else FilePath.SNAPSHOT_STORE_DIR
+        self._objects_dir = os.path.join(self._root_dir, OBJECTS_DIR_NAME)
+        self._sessions_dir = os.path.join(self._root_dir, SESSIONS_DIR_NAME)
+        self._cache_dir = os.path.join(self._root_dir, CACHE_DIR_NAME)
+
+    @staticmethod
+    def _serialize(obj: Any) -> bytes:
+        # Key order is kept, so the exported board JSON is the same as the original one
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _object_path(self, obj_hash: str) -> str:
+        return os.path.join(self._objects_dir, obj_hash[:2], obj_hash[2:])
+
+    def _session_path(self, session: str) -> str:
+        return os.path.join(self._sessions_dir, f"{session}.json")
+
+    def _put_object(self, obj: Any) -> Tuple[str, bool]:
+        """
+        Returns the hash of the object and whether it was new to the store.
+        """
+        data = self._serialize(obj)
+        obj_hash = hashlib.sha256(data).hexdigest()
+        file_path = self._object_path(obj_hash)
+        if os.path.exists(file_path):
+            return obj_hash, False
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_file = f"{file_path}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(zlib.compress(data))
+        os.replace(tmp_file, file_path)
+        return obj_hash, True
+
+    def _get_object(self, obj_hash: str) -> Any:
+        try:
+            with open(self._object_path(obj_hash), "rb") as f:
+                return json.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            raise TrelloSnapshotException(f"Missing object in snapshot store: {obj_hash}")
+
+    def _load_session(self, session: str) -> Dict[str, Dict[str, str]]:
+        file_path = self._session_path(session)
+        if not os.path.exists(file_path):
+            return {}
+        with open(file_path) as f:
+            return json.load(f)
+
+    def put_board(self, session: str, board_name: str, board_json: Dict[str, Any]) -> str:
+        """
+        Stores the board JSON as the snapshot of the board in the session, returns the hash of the root object.
+        """
+        root = {}
+        chunked = []
+        new_objects = total_objects = 0
+        for key, value in board_json.items():
+            if key in CHUNKED_KEYS and isinstance(value, list):
+                hashes = []
+                for obj in value:
+                    obj_hash, is_new = self._put_object(obj)
+                    hashes.append(obj_hash)
+                    new_objects += is_new
+                total_objects += len(hashes)
+                root[key] = hashes
+                chunked.append(key)
+            else:
+                root[key] = value
+        root_hash, _ = self._put_object({"chunked": chunked, "board": root})
+
+        boards = self._load_session(session)
+        boards[board_name] = {"board_id": board_json.get("id"), "root": root_hash}
+        os.makedirs(self._sessions_dir, exist_ok=True)
+        tmp_file = f"{self._session_path(session)}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(boards, f, indent=2)
+        os.replace(tmp_file, self._session_path(session))
+        LOG.info("Stored snapshot of board '%s' in session %s: %d new objects out of %d",
+                 board_name, session, new_objects, total_objects)
+        return root_hash
+
+    def _get_board_ref(self, session: str, board_name: str) -> Dict[str, str]:
+        boards = self._load_session(session)
+        if board_name not in boards:
+            raise TrelloSnapshotException(f"No snapshot of board '{board_name}' in session: {session}")
+        return boards[board_name]
+
+    def get_board_root_hash(self, session: str, board_name: str) -> str:
+        return self._get_board_ref(session, board_name)["root"]
+
+    def get_board(self, session: str, board_name: str) -> Dict[str, Any]:
+        board_ref = self._get_board_ref(session, board_name)
+        root_hash = board_ref["root"]
+        cache_file = os.path.join(self._cache_dir, f"{board_ref['board_id']}.pickle")
+        board_json = self._load_cached_board(cache_file, root_hash)
+        if board_json is not None:
+            return board_json
+
+        root = self._get_object(root_hash)
+        board_json = root["board"]
+        for key in root["chunked"]:
+            board_json[key] = [self._get_object(obj_hash) for obj_hash in board_json[key]]
+        self._save_cached_board(cache_file, root_hash, board_json)
+        return board_json
+
+    @staticmethod
+    def _load_cached_board(cache_file: str, root_hash: str) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(cache_file):
+            return None
+        try:
+            with open(cache_file, "rb") as f:
+                cached_root_hash, board_json = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError) as e:
+            LOG.warning("Ignoring unreadable snapshot cache: %s, error: %s", cache_file, e)
+            return None
+        return board_json if cached_root_hash == root_hash else None
+
+    def _save_cached_board(self, cache_file: str, root_hash: str, board_json: Dict[str, Any]):
+        # Only one snapshot is cached per board, so the cache does not grow with the number of sessions
+        os.makedirs(self._cache_dir, exist_ok=True)
+        tmp_file = f"{cache_file}.tmp"
+        with open(tmp_file, "wb") as f:
+            pickle.dump((root_hash, board_json), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+
+    def get_sessions(self) -> List[str]:
+        if not os.path.isdir(self._sessions_dir):
+            return []
+        return sorted(f[:-len(".json")] for f in os.listdir(self._sessions_dir) if f.endswith(".json"))
+
+    def get_boards(self, session: str) -> List[str]:
+        return sorted(self._load_session(session).keys())
+
+    def get_board_sessions(self, board_name: str) -> List[str]:
+        return [session for session in self.get_sessions() if board_name in self._load_session(session)]
+
+    def get_board_refs(self, session: Optional[str] = None) -> Dict[str, Tuple[str, str]]:
+        """
+        Returns board name -> session and board ID of the boards of the session.
+        Without a session, the latest snapshot of each board is returned.
+        """
+        sessions = [session] if session else self.get_sessions()
+        refs = {}
+        for s in sessions:
+            for board_name, ref in self._load_session(s).items():
+                refs[board_name] = (s, ref["board_id"])
+        return refs
+
+    def export(self, session: Optional[str], output_dir: str, board_names: List[str] = None) -> List[str]:
+        """
+        Writes the board JSONs of the session, by default the latest one, to the output dir
+        with the same file names as the board JSONs of the backups. Returns the written file paths.
+        """
+        if not session:
+            sessions = self.get_sessions()
+            if not sessions:
+                raise TrelloSnapshotException(f"Snapshot store is empty: {self._root_dir}")
+            session = sessions[-1]
+        board_names = board_names if board_names else self.get_boards(session)
+        if not board_names:
+            raise TrelloSnapshotException(f"No snapshots found for session: {session}")
+
+        os.makedirs(output_dir, exist_ok=True)
+        files = []
+        for board_name in board_names:
+            file_path = os.path.join(output_dir, f"board-{TrelloBoard.get_simple_name(board_name)}.json")
+            with open(file_path, "w") as f:
+                json.dump(self.get_board(session, board_name), f, indent=4)
+            files.append(file_path)
+        return files
@@ -2,13 +2,19 @@ import json
 import logging
 import os
 import re
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
 from pathlib import Path
+from urllib.parse import urlparse
 
 import requests
 
-from trello_backup.constants import FilePath
+from trello_backup.constants import FilePath, cached_classproperty
 from trello_backup.display.console import CliLogger
-from trello_backup.display.output import OutputHandler
+from trello_backup.display.progress import ProgressReporter
+from trello_backup.exception import TrelloException
 from trello_backup.trello.model import TrelloBoard
 
 TRELLO_API_ROOT = "https://api.trello.com/1/"
@@ -19,6 +25,9 @@ GET_CHECKLIST_API_TMPL = "https://api.trello.com/1/checklists/{id}"
 LIST_BOARDS_API = "https://api.trello.com/1/members/me/boards"
 GET_BOARD_DETAILS_API_TMPL = "https://api.trello.com/1/boards/{id}/"
 GET_BOARD_LISTS_API_TMPL = "https://api.trello.com/1/boards/{id}/lists"
+GET_LIST_CARDS_API_TMPL = "https://api.trello.com/1/lists/{list_id}/cards"
+# Number of lists whose cards are downloaded at the same time in split-fetch mode
+SPLIT_FETCH_MAX_WORKERS = 8
 GET_CARD_ACTIONS_API_TMPL = "https://api.trello.com/1/cards/{id}/actions"
 
 # TODO ASAP need to move to config file
@@ -28,7 +37,77 @@ CLI_LOG = CliLogger(LOG)
 
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple, List, Iterator, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from trello_backup.snapshot import SnapshotStore
+
+
+class BoardDetailsProfile(Enum):
+    """
+    Fields requested by get_board_details.
+    FULL: Everything, for backups.
+    CARDS: Only the fields the parser reads, for commands that print or clean up cards (no actions, members, labels).
+    """
+    FULL = "full"
+    CARDS = "cards"
+
+    def includes(self, other: 'BoardDetailsProfile') -> bool:
+        return self == BoardDetailsProfile.FULL or self == other
+
+
+BOARD_DETAILS_PARAMS: Dict[BoardDetailsProfile, Dict[str, Any]] = {
+    BoardDetailsProfile.FULL: {
+        "fields": "all",
+        "actions": "all",
+        "action_fields": "all",
+        "actions_limit": 1000,
+        "cards": "all",
+        "card_fields": "all",
+        "card_attachments": "true",
+        "labels": "all",
+        "lists": "all",
+        "list_fields": "all",
+        "members": "all",
+        "member_fields": "all",
+        "checklists": "all",
+        "checklist_fields": "all",
+        "organization": "false",
+    },
+    BoardDetailsProfile.CARDS: {
+        "fields": "id,name",
+        "actions": "none",
+        # Closed cards are needed as well, the card filters are applied locally
+        "cards": "all",
+        "card_fields": "id,name,shortUrl,shortLink,idList,desc,labels,idChecklists,closed,due",
+        "card_attachments": "true",
+        "card_attachment_fields": "id,date,name,url,isUpload,fileName",
+        "labels": "none",
+        "lists": "all",
+        "list_fields": "id,name,closed,idBoard,pos",
+        "members": "none",
+        "checklists": "all",
+        "checklist_fields": "id,name,idBoard,idCard,pos",
+        "organization": "false",
+    },
+}
+
+# Split-fetch mode: the board with its lists, then the cards of each list with the same fields as the CARDS profile
+_CARDS_PARAMS = BOARD_DETAILS_PARAMS[BoardDetailsProfile.CARDS]
+SPLIT_FETCH_BOARD_PARAMS: Dict[str, Any] = {
+    "fields": _CARDS_PARAMS["fields"],
+    "lists": "all",
+    "list_fields": _CARDS_PARAMS["list_fields"],
+}
+SPLIT_FETCH_LIST_CARDS_PARAMS: Dict[str, Any] = {
+    "filter": "all",
+    "fields": _CARDS_PARAMS["card_fields"],
+    "attachments": "true",
+    "attachment_fields": _CARDS_PARAMS["card_attachment_fields"],
+    "checklists": "all",
+    "checklist_fields": _CARDS_PARAMS["checklist_fields"],
+}
+
 
 class TrelloApiAbs(ABC):
     @abstractmethod
@@ -42,8 +121,11 @@ class TrelloApiAbs(ABC):
         pass
 
     @abstractmethod
-    def get_board_details(self, board_id: str) -> Dict[str, Any]:
-        """Returns the raw JSON data for a specific board."""
+    def get_board_details(self, board_id: str, profile: BoardDetailsProfile = BoardDetailsProfile.FULL) -> Dict[str, Any]:
+        """
+        Returns the raw JSON data for a specific board.
+        The JSON contains at least the fields of the profile, it may contain more.
+        """
         pass
 
     @abstractmethod
@@ -71,9 +153,79 @@ class TrelloApiAbs(ABC):
     def get_list_by_id(self, list_id: str) -> dict:
         pass
 
+    def get_board_fingerprint(self, board_id: str) -> Optional[str]:
+        """
+        Returns a fingerprint of the board that changes whenever the board JSON changes,
+        without loading the board JSON. Returns None if the API cannot tell it cheaply.
+        """
+        return None
+
+    def refresh(self):
+        """
+        Drops the data cached by the API, so the next calls see the current boards.
+        Called by the daemon before each command.
+        """
+        pass
+
+    def get_board_lists(self, board_id: str) -> Dict[str, Any]:
+        """
+        Returns the board JSON with the lists of the board, without cards and checklists.
+        """
+        board_json = self.get_board_details(board_id, profile=BoardDetailsProfile.CARDS)
+        return {k: v for k, v in board_json.items() if k not in ("cards", "checklists")}
+
+    def iter_cards_of_lists(self, board_id: str, list_ids: Sequence[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yields list ID, board JSON of the list (with its cards and their checklists) in the order of list_ids.
+        The APIs working from local files split the full board JSON.
+        """
+        board_json = self.get_board_details(board_id, profile=BoardDetailsProfile.CARDS)
+        cards_by_list_id: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for card in board_json["cards"]:
+            cards_by_list_id[card["idList"]].append(card)
+        checklists_by_card_id: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for checklist in board_json["checklists"]:
+            checklists_by_card_id[checklist["idCard"]].append(checklist)
+        for list_id in list_ids:
+            cards = cards_by_list_id.get(list_id, [])
+            yield list_id, {"cards": cards,
+                            "checklists": [cl for card in cards for cl in checklists_by_card_id.get(card["id"], [])]}
+
+
+class ApiCallStats:
+    """
+    Counts Trello API calls by method and path, board, card and other IDs in paths are replaced with ':id'.
+    """
+    _ID_REGEX = re.compile(r"/[0-9a-f]{24}(?=/|$)")
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        # Split-fetch mode calls the API from multiple threads
+        self._lock = threading.Lock()
+
+    def record(self, method: str, url: str):
+        path = self._ID_REGEX.sub("/:id", urlparse(url).path)
+        with self._lock:
+            self._counts[f"{method.upper()} {path}"] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    @staticmethod
+    def diff(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+        return {k: v - before.get(k, 0) for k, v in after.items() if v - before.get(k, 0) > 0}
+
+
+API_CALL_STATS = ApiCallStats()
+
+
 class TrelloApi(TrelloApiAbs):
     auth_query_params = None
     authorization_headers = None
+    # Keeps the connections to the Trello API alive between requests.
+    # requests.Session is not documented as thread-safe, so every thread (e.g. the split fetch workers) has its own.
+    _http_sessions = threading.local()
     headers_accept_json = {
         "Accept": "application/json"
     }
@@ -91,6 +243,19 @@ class TrelloApi(TrelloApiAbs):
             "Authorization": "OAuth oauth_consumer_key=\"{}\", oauth_token=\"{}\"".format(api_key, token)
         }
 
+    @staticmethod
+    def _request(method: str, url: str, **kwargs) -> requests.Response:
+        API_CALL_STATS.record(method, url)
+        return TrelloApi._get_http_session().request(method, url, **kwargs)
+
+    @staticmethod
+    def _get_http_session() -> requests.Session:
+        session = getattr(TrelloApi._http_sessions, "session", None)
+        if session is None:
+            session = requests.Session()
+            TrelloApi._http_sessions.session = session
+        return session
+
     @classmethod
     def list_boards(cls):
         """
@@ -105,7 +270,7 @@ class TrelloApi(TrelloApiAbs):
         query = dict(TrelloApi.auth_query_params)
         query.update(params)
 
-        response = requests.request(
+        response = TrelloApi._request(
             "GET",
             LIST_BOARDS_API,
             headers=TrelloApi.headers_accept_json,
@@ -126,28 +291,10 @@ class TrelloApi(TrelloApiAbs):
         return result_dict
 
     @classmethod
-    def get_board_details(cls, board_id):
-        params = {
-            "fields": "all",
-            "actions": "all",
-            "action_fields": "all",
-            "actions_limit": 1000,
-            "cards": "all",
-            "card_fields": "all",
-            "card_attachments": "true",
-            "labels": "all",
-            "lists": "all",
-            "list_fields": "all",
-            "members": "all",
-            "member_fields": "all",
-            "checklists": "all",
-            "checklist_fields": "all",
-            "organization": "false",
-        }
-
+    def get_board_details(cls, board_id, profile: BoardDetailsProfile = BoardDetailsProfile.FULL):
         query = dict(TrelloApi.auth_query_params)
-        query.update(params)
-        response = requests.request(
+        query.update(BOARD_DETAILS_PARAMS[profile])
+        response = TrelloApi._request(
             "GET",
             GET_BOARD_DETAILS_API_TMPL.format(id=board_id),
             headers=TrelloApi.headers_accept_json,
@@ -159,10 +306,71 @@ class TrelloApi(TrelloApiAbs):
 
         return parsed_json
 
+    @classmethod
+    def get_board_fingerprint(cls, board_id: str) -> Optional[str]:
+        # Changes of the board update its last activity date, requesting only this field is cheap
+        query = dict(TrelloApi.auth_query_params)
+        query["fields"] = "dateLastActivity"
+        response = TrelloApi._request(
+            "GET",
+            GET_BOARD_DETAILS_API_TMPL.format(id=board_id),
+            headers=TrelloApi.headers_accept_json,
+            params=query
+        )
+        response.raise_for_status()
+        return json.loads(response.text).get("dateLastActivity")
+
+    @classmethod
+    def get_board_lists(cls, board_id: str) -> Dict[str, Any]:
+        query = dict(TrelloApi.auth_query_params)
+        query.update(SPLIT_FETCH_BOARD_PARAMS)
+        response = TrelloApi._request(
+            "GET",
+            GET_BOARD_DETAILS_API_TMPL.format(id=board_id),
+            headers=TrelloApi.headers_accept_json,
+            params=query
+        )
+        response.raise_for_status()
+        return json.loads(response.text)
+
+    @classmethod
+    def iter_cards_of_lists(cls, board_id: str, list_ids: Sequence[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Downloads the cards of the lists concurrently. The lists are yielded in order as soon as they arrive,
+        so the caller can process the first list while the others are still being downloaded.
+        """
+        if not list_ids:
+            return
+        with ThreadPoolExecutor(max_workers=min(SPLIT_FETCH_MAX_WORKERS, len(list_ids))) as executor:
+            futures = [(list_id, executor.submit(cls._get_cards_of_list, list_id)) for list_id in list_ids]
+            try:
+                for list_id, future in futures:
+                    yield list_id, future.result()
+            finally:
+                # The caller stopped iterating or a download failed: do not start the remaining downloads
+                for _, future in futures:
+                    future.cancel()
+
+    @classmethod
+    def _get_cards_of_list(cls, list_id: str) -> Dict[str, Any]:
+        query = dict(TrelloApi.auth_query_params)
+        query.update(SPLIT_FETCH_LIST_CARDS_PARAMS)
+        response = TrelloApi._request(
+            "GET",
+            GET_LIST_CARDS_API_TMPL.format(list_id=list_id),
+            headers=TrelloApi.headers_accept_json,
+            params=query
+        )
+        response.raise_for_status()
+        cards = json.loads(response.text)
+        # Checklists are nested into the cards, the board JSON has them in a separate array
+        checklists = [checklist for card in cards for checklist in card.pop("checklists", [])]
+        return {"cards": cards, "checklists": checklists}
+
     @classmethod
     def get_board_json(cls, board_name):
         url = f"https://trello.com/b/9GZZWy03/{board_name}.json"
-        response = requests.request(
+        response = TrelloApi._request(
             "GET",
             url,
             headers=TrelloApi.headers_accept_json,
@@ -178,7 +386,7 @@ class TrelloApi(TrelloApiAbs):
             "Accept": "application/json"
         }
 
-        response = requests.request(
+        response = TrelloApi._request(
             "GET",
             GET_BOARD_LISTS_API_TMPL.format(id=board_id),
             headers=headers,
@@ -197,7 +405,8 @@ class TrelloApi(TrelloApiAbs):
             dict: JSON data of the list.
         """
         url = GET_LISTS_API_TMPL.format(list_id=list_id)
-        response = requests.get(
+        response = TrelloApi._request(
+            "GET",
             url,
             headers=cls.headers_accept_json,
             params=cls.auth_query_params
@@ -211,7 +420,7 @@ class TrelloApi(TrelloApiAbs):
             "Accept": "application/json"
         }
 
-        response = requests.request(
+        response = TrelloApi._request(
             "GET",
             GET_CARD_ACTIONS_API_TMPL.format(id=card_id),
             headers=headers,
@@ -229,7 +438,7 @@ class TrelloApi(TrelloApiAbs):
 
         # list_id_example: 5abbe4b7ddc1b351ef961414
         query = TrelloApi.auth_query_params.update({'idList': list_id})
-        response = requests.request(
+        response = TrelloApi._request(
             "POST",
             CARDS_API,
             headers=headers,
@@ -254,7 +463,7 @@ class TrelloApi(TrelloApiAbs):
         # The API URL for deleting a card is https://api.trello.com/1/cards/{id}
         url = CARDS_API + f"/{card_id}"
 
-        response = requests.request(
+        response = TrelloApi._request(
             "DELETE",
             url,
             headers=headers,
@@ -269,7 +478,7 @@ class TrelloApi(TrelloApiAbs):
 
     @classmethod
     def get_actions_for_card(cls, card_id: str):
-        response = requests.request(
+        response = TrelloApi._request(
             "GET",
             GET_CARD_ACTIONS_API_TMPL.format(id=card_id),
             headers=TrelloApi.headers_accept_json,
@@ -282,10 +491,8 @@ class TrelloApi(TrelloApiAbs):
     @classmethod
     def get_board_id(cls, board_name: str):
         boards: Dict[str, str] = cls.list_boards()
-        available_board_names = list(boards.keys())
-        CLI_LOG.info(f"Available boards: {available_board_names}")
         if board_name not in boards:
-            raise KeyError(f"Cannot find board with name: {board_name}")
+            raise KeyError(f"Cannot find board with name: {board_name}. Available boards: {list(boards.keys())}")
 
         board_id = boards[board_name]
         return board_id
@@ -293,13 +500,17 @@ class TrelloApi(TrelloApiAbs):
     # TODO ASAP Refactor this does not belong here
     @classmethod
     def download_attachments(cls, board):
-        for list in board.lists:
-            for card in list.cards:
-                for attachment in card.attachments:
-                    if attachment.is_upload:
-                        fpath = TrelloApi.download_and_save_attachment(attachment)
-                        # TODO ASAP Migrate these to session dir? Only symlinks to save space
-                        attachment.downloaded_file_path = "file://" + fpath
+        uploads = [attachment
+                   for list in board.lists
+                   for card in list.cards
+                   for attachment in card.attachments
+                   if attachment.is_upload]
+        with ProgressReporter("Downloading attachments", len(uploads)) as progress:
+            for attachment in uploads:
+                fpath = TrelloApi.download_and_save_attachment(attachment)
+                # TODO ASAP Migrate these to session dir? Only symlinks to save space
+                attachment.downloaded_file_path = "file://" + fpath
+                progress.advance(attachment.file_name)
 
     # TODO ASAP Refactor this does not belong here
     @classmethod
@@ -339,7 +550,7 @@ class TrelloApi(TrelloApiAbs):
 
         # Fetch full card info from Trello API
         url = f"{CARDS_API}/{short_card_id}"
-        response = requests.get(url, headers=cls.headers_accept_json, params=cls.auth_query_params)
+        response = TrelloApi._request("GET", url, headers=cls.headers_accept_json, params=cls.auth_query_params)
         response.raise_for_status()
         card_data = response.json()
 
@@ -352,7 +563,7 @@ class TrelloApi(TrelloApiAbs):
                     attachment_filename=attachment["name"]
                 )
                 file_path = os.path.join(FilePath.OUTPUT_DIR_ATTACHMENTS, f"{attachment['id']}-{attachment['name']}")
-                with requests.get(attachment_url, headers=cls.authorization_headers, stream=True) as r:
+                with TrelloApi._request("GET", attachment_url, headers=cls.authorization_headers, stream=True) as r:
                     r.raise_for_status()
                     with open(file_path, 'wb') as f:
                         for chunk in r.iter_content(chunk_size=1024*1024):
@@ -374,7 +585,8 @@ class TrelloApi(TrelloApiAbs):
             dict: Checklist JSON data, including items.
         """
         url = GET_CHECKLIST_API_TMPL.format(id=checklist_id)
-        response = requests.get(
+        response = TrelloApi._request(
+            "GET",
             url,
             headers=cls.headers_accept_json,
             params=cls.auth_query_params
@@ -390,7 +602,7 @@ class TrelloApi(TrelloApiAbs):
         Initiates the request and returns the raw response stream object.
         Caller is responsible for closing the stream.
         """
-        response = requests.request(
+        response = TrelloApi._request(
             "GET",
             attachment.api_url,
             headers=TrelloApi.authorization_headers,
@@ -408,7 +620,7 @@ class TrelloApi(TrelloApiAbs):
         """
         Initiates the request and yields data chunks, ensuring the connection is closed.
         """
-        with requests.request(
+        with TrelloApi._request(
                 "GET",
                 attachment.api_url,
                 headers=TrelloApi.authorization_headers,
@@ -439,8 +651,14 @@ class OfflineTrelloApi(TrelloApiAbs):
                             GET_CARDS_API: "responses/cards/{card_short_name}.json",
                             GET_LISTS_API_TMPL: "responses/lists/{id}.json",
                             GET_CHECKLIST_API_TMPL: "responses/checklists/{id}.json"}
-    TESTS_DIR = FilePath.get_dir_from_root("tests", parent_dir=FilePath.REPO_ROOT_DIRNAME)
-    RESOURCES_DIR = FilePath.get_dir_from_root("resources", parent_dir=TESTS_DIR)
+
+    @cached_classproperty
+    def TESTS_DIR(cls):
+        return FilePath.get_dir_from_root("tests", parent_dir=FilePath.REPO_ROOT_DIRNAME)
+
+    @cached_classproperty
+    def RESOURCES_DIR(cls):
+        return FilePath.get_dir_from_root("resources", parent_dir=cls.TESTS_DIR)
 
     @staticmethod
     def _load_resource_file(filename) -> str:
@@ -466,7 +684,9 @@ class OfflineTrelloApi(TrelloApiAbs):
         boards_by_name = self._get_boards_by_name(boards_list)
         return boards_by_name.get(name)
 
-    def get_board_details(self, board_id: str) -> Dict[str, Any]:
+    def get_board_details(self, board_id: str, profile: BoardDetailsProfile = BoardDetailsProfile.FULL) -> Dict[str, Any]:
+        # The resource files contain the full board JSON
+        from trello_backup.display.output import OutputHandler
         boards_list = self._load_boards_json()
         boards_by_id = self._get_boards_by_id(boards_list)
         board_name = boards_by_id[board_id]
@@ -529,6 +749,125 @@ class OfflineTrelloApi(TrelloApiAbs):
         return json.loads(OfflineTrelloApi._load_resource_file(f))
 
 
+class BackupTrelloApi(TrelloApiAbs):
+    """
+    Serves the board JSONs from the snapshot store, so commands can run on backed up data without calling the Trello API.
+    Without a session, the latest snapshot of each board is used. Cards are never deleted, deletions are only planned.
+    """
+    def __init__(self, snapshot_store: 'SnapshotStore', session: Optional[str] = None):
+        self._store = snapshot_store
+        self._session = session
+        self._board_refs: Optional[Dict[str, Tuple[str, str]]] = None
+        self._board_json_by_id: Dict[str, Dict[str, Any]] = {}
+        self._objects_by_board_id: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {}
+        self.planned_deletions: List[str] = []
+
+    def _get_board_refs(self) -> Dict[str, Tuple[str, str]]:
+        if self._board_refs is None:
+            self._board_refs = self._store.get_board_refs(self._session)
+            if not self._board_refs:
+                raise TrelloException(f"No backed up boards found in the snapshot store for session: {self._session or 'latest'}")
+        return self._board_refs
+
+    def list_boards(self) -> Dict[str, str]:
+        return {board_name: board_id for board_name, (_, board_id) in self._get_board_refs().items()}
+
+    def get_board_id(self, name: str) -> str:
+        refs = self._get_board_refs()
+        if name not in refs:
+            raise KeyError(f"Cannot find backup of board with name: {name}. Available boards: {list(refs.keys())}")
+        return refs[name][1]
+
+    def _get_board_ref(self, board_id: str) -> Tuple[str, str]:
+        """
+        Returns the board name and the session of the backup of the board.
+        """
+        refs = self._get_board_refs()
+        ref = next(((name, session) for name, (session, ref_board_id) in refs.items() if ref_board_id == board_id), None)
+        if ref is None:
+            raise KeyError(f"Cannot find backup of board with ID: {board_id}. "
+                           f"Available boards: {[f'{name} ({ref_board_id})' for name, (_, ref_board_id) in refs.items()]}")
+        return ref
+
+    def get_board_details(self, board_id: str, profile: BoardDetailsProfile = BoardDetailsProfile.FULL) -> Dict[str, Any]:
+        # Snapshots contain the full board JSON
+        board_json = self._board_json_by_id.get(board_id)
+        if board_json is None:
+            board_name, session = self._get_board_ref(board_id)
+            board_json = self._store.get_board(session, board_name)
+            self._board_json_by_id[board_id] = board_json
+        return board_json
+
+    def refresh(self):
+        # Sessions stored since the last command become visible
+        self._board_refs = None
+        self._board_json_by_id = {}
+        self._objects_by_board_id = {}
+
+    def get_board_fingerprint(self, board_id: str) -> Optional[str]:
+        # The hash of the root object of the snapshot changes if any object of the board changes
+        board_name, session = self._get_board_ref(board_id)
+        return self._store.get_board_root_hash(session, board_name)
+
+    def download_attachments(self, board):
+        # Attachments are not downloaded again, files of previous backups are used if they exist
+        for trello_list in board.lists:
+            for card in trello_list.cards:
+                for attachment in card.attachments:
+                    file_path = os.path.join(FilePath.OUTPUT_DIR_ATTACHMENTS, f"{attachment.id}-{attachment.file_name}")
+                    if attachment.is_upload and os.path.exists(file_path):
+                        attachment.downloaded_file_path = "file://" + file_path
+
+    def get_actions_for_card(self, card_id: str):
+        for board_json in self._board_json_by_id.values():
+            actions = [a for a in board_json.get("actions", []) if a.get("data", {}).get("card", {}).get("id") == card_id]
+            if actions:
+                return actions
+        return []
+
+    def delete_card(self, card_id: str):
+        CLI_LOG.info("Working from backup, card is not deleted, only added to the cleanup plan: %s", card_id)
+        self.planned_deletions.append(card_id)
+
+    def _get_objects_by_id(self, board_id: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Cards by short link, lists and checklists by ID of the backed up board.
+        """
+        objects_by_id = self._objects_by_board_id.get(board_id)
+        if objects_by_id is None:
+            board_json = self.get_board_details(board_id)
+            objects_by_id = {
+                "cards": {c["shortLink"]: c for c in board_json["cards"] if "shortLink" in c},
+                "lists": {l["id"]: l for l in board_json["lists"]},
+                "checklists": {c["id"]: c for c in board_json["checklists"]},
+            }
+            self._objects_by_board_id[board_id] = objects_by_id
+        return objects_by_id
+
+    def _get_object(self, kind: str, key: str) -> Dict[str, Any]:
+        # Boards are loaded one by one until the object is found. Already loaded boards are searched first,
+        # as the list and the checklists of a card are on the board of the card.
+        board_ids = sorted(self.list_boards().values(), key=lambda board_id: board_id not in self._board_json_by_id)
+        for board_id in board_ids:
+            obj = self._get_objects_by_id(board_id)[kind].get(key)
+            if obj is not None:
+                return obj
+        raise TrelloException(f"Cannot find {kind[:-1]} in the backed up boards: {key}")
+
+    def download_card_by_share_link(self, share_link: str, download_attachments: bool = True):
+        # URL Example: 'https://trello.com/c/YNR0xF3N/123-card-name'
+        match = re.match(r"https?://trello\.com/c/([a-zA-Z0-9]+)/?.*", share_link)
+        if not match:
+            raise ValueError(f"Invalid Trello share link: {share_link}")
+        return self._get_object("cards", match.group(1))
+
+    def get_checklist_by_id(self, checklist_id: str) -> dict:
+        return self._get_object("checklists", checklist_id)
+
+    def get_list_by_id(self, list_id: str) -> dict:
+        return self._get_object("lists", list_id)
+
+
 class NetworkStatusService:
     def __init__(self, ctx):
         self._online = not ctx.offline
@@ -541,13 +880,17 @@ class TrelloRepository:
     def __init__(self,
                  online_api: TrelloApi,
                  offline_api: OfflineTrelloApi,
-                 network_service: NetworkStatusService):
+                 network_service: NetworkStatusService,
+                 backup_api: Optional[BackupTrelloApi] = None):
         self._online = online_api
         self._offline = offline_api
         self._network = network_service
+        self._backup = backup_api
 
     def get_api(self) -> TrelloApiAbs:
         # Simple selection logic
+        if self._backup:
+            return self._backup
         if self._network.is_online():
             return self._online
         else:
@@ -1,9 +1,29 @@
+import hashlib
+import io
+import json
+import logging
+import mmap
+import os
 import pickle
 import shelve
+import struct
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Optional, List, Sequence, Set, Mapping
 
 from trello_backup.constants import FilePath
+from trello_backup.trello.model import TrelloList, TrelloCard
+
+LOG = logging.getLogger(__name__)
+
+PARSED_BOARD_CACHE_MAGIC = b"TBPC"
+# Increase this if the model classes change, so previously cached boards are not loaded
+PARSED_BOARD_CACHE_VERSION = 2
+_UINT32 = struct.Struct("<I")
+# Boards are rarely created or renamed, a board that is not in the directory refreshes it anyway
+BOARD_DIRECTORY_CACHE_TTL_SECONDS = 24 * 60 * 60
 
 
 class WebpageTitleCache:
@@ -64,4 +84,244 @@ class WebpageTitleCache:
         """
         Stores a title. Handled directly by the shelf object.
         """
-        self._shelf[url] = title
\ No newline at end of file
+        self._shelf[url] = title
+
+
+class MarkdownCache:
+    """
+    Persistent cache of markdown texts converted to plain text, keyed by the hash of the markdown text.
+    """
+    def __init__(self, file_path: str = FilePath.MARKDOWN_CACHE_FILE):
+        # Values are immutable strings, put() writes them to the database directly.
+        # Without writeback, entries read from the cache are not written back on every sync.
+        self._shelf = shelve.open(file_path)
+        self._file_path = file_path
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def save(self) -> None:
+        self._shelf.sync()
+
+    def close(self) -> None:
+        self._shelf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._shelf)
+
+    def get(self, text: str) -> Optional[str]:
+        return self._shelf.get(self._key(text))
+
+    def put(self, text: str, plain_text: str) -> None:
+        self._shelf[self._key(text)] = plain_text
+
+
+@dataclass
+class CachedListEntry:
+    list: TrelloList
+    # Position and length of the pickled cards of the list, relative to the end of the header.
+    # None if the cards of the list are not cached yet.
+    offset: Optional[int]
+    length: Optional[int]
+
+
+class _CardsPickler(pickle.Pickler):
+    """
+    Pickles the cards of a list without their list, which is stored in the header of the cache file.
+    """
+    def persistent_id(self, obj):
+        return obj.id if isinstance(obj, TrelloList) else None
+
+
+class _CardsUnpickler(pickle.Unpickler):
+    def __init__(self, file, trello_list: TrelloList):
+        super().__init__(file)
+        self._trello_list = trello_list
+
+    def persistent_load(self, pid):
+        return self._trello_list
+
+
+class CachedBoard:
+    """
+    Memory-mapped parsed board. The header with all lists of the board is loaded eagerly,
+    the cards of a list are only unpickled when the list is loaded.
+    Only the cards of the lists that were requested since the board last changed are cached.
+    """
+    def __init__(self, file_path: str, entries: List[CachedListEntry], data_offset: int):
+        self._file = open(file_path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._entries: Dict[str, CachedListEntry] = {e.list.id: e for e in entries}
+        self._data_offset = data_offset
+
+    @property
+    def lists(self) -> List[TrelloList]:
+        """
+        Lists of the board without cards, cards are loaded with load_cards.
+        """
+        return [e.list for e in self._entries.values()]
+
+    def has_cards(self, trello_list: TrelloList) -> bool:
+        entry = self._entries.get(trello_list.id)
+        return entry is not None and entry.length is not None
+
+    def read_cards_blob(self, list_id: str) -> bytes:
+        entry = self._entries[list_id]
+        start = self._data_offset + entry.offset
+        return self._mmap[start:start + entry.length]
+
+    def load_cards(self, trello_list: TrelloList) -> List[TrelloCard]:
+        return _CardsUnpickler(io.BytesIO(self.read_cards_blob(trello_list.id)), trello_list).load()
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ParsedBoardCache:
+    """
+    Binary cache of parsed boards (lists, cards, checklists with the resolved URL titles), one file per board.
+    Layout: magic, version, header length, pickled header (fingerprint and lists with the offsets of their cards),
+    then the pickled cards of each cached list.
+    """
+    def __init__(self, cache_dir: str = None):
+        self._cache_dir = cache_dir if cache_dir else FilePath.PARSED_BOARD_CACHE_DIR
+
+    def _file_path(self, board_id: str) -> str:
+        return os.path.join(self._cache_dir, f"{board_id}.bin")
+
+    def save(self, board_id: str, fingerprint: str, trello_lists: Sequence[TrelloList], parsed_list_ids: Set[str],
+             previous: Optional[CachedBoard] = None):
+        """
+        Saves all lists of the board, with the cards of the parsed lists.
+        The cards of the other lists are kept from the previous cached board of the same fingerprint, if any.
+        """
+        entries = []
+        blobs = []
+        offset = 0
+        for trello_list in trello_lists:
+            list_header = TrelloList(trello_list.closed, trello_list.id, trello_list.name, trello_list.board_id,
+                                     trello_list.pos)
+            if trello_list.id in parsed_list_ids:
+                data = io.BytesIO()
+                _CardsPickler(data, protocol=pickle.HIGHEST_PROTOCOL).dump(trello_list.cards)
+                blob = data.getvalue()
+            elif previous is not None and previous.has_cards(trello_list):
+                blob = previous.read_cards_blob(trello_list.id)
+            else:
+                entries.append(CachedListEntry(list_header, None, None))
+                continue
+            entries.append(CachedListEntry(list_header, offset, len(blob)))
+            blobs.append(blob)
+            offset += len(blob)
+        header = pickle.dumps((fingerprint, entries), protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.makedirs(self._cache_dir, exist_ok=True)
+        file_path = self._file_path(board_id)
+        tmp_file = f"{file_path}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(PARSED_BOARD_CACHE_MAGIC)
+            f.write(_UINT32.pack(PARSED_BOARD_CACHE_VERSION))
+            f.write(_UINT32.pack(len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_file, file_path)
+        LOG.debug("Saved parsed board cache: %s", file_path)
+
+    def load(self, board_id: str, fingerprint: str) -> Optional[CachedBoard]:
+        """
+        Returns None if the board is not cached or the cached board has another fingerprint.
+        """
+        file_path = self._file_path(board_id)
+        if not os.path.exists(file_path):
+            return None
+        prefix_length = len(PARSED_BOARD_CACHE_MAGIC) + 2 * _UINT32.size
+        try:
+            with open(file_path, "rb") as f:
+                prefix = f.read(prefix_length)
+                if len(prefix) < prefix_length or not prefix.startswith(PARSED_BOARD_CACHE_MAGIC):
+                    LOG.warning("Ignoring invalid parsed board cache: %s", file_path)
+                    return None
+                version, = _UINT32.unpack_from(prefix, len(PARSED_BOARD_CACHE_MAGIC))
+                if version != PARSED_BOARD_CACHE_VERSION:
+                    return None
+                header_length, = _UINT32.unpack_from(prefix, len(PARSED_BOARD_CACHE_MAGIC) + _UINT32.size)
+                cached_fingerprint, entries = pickle.loads(f.read(header_length))
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError) as e:
+            LOG.warning("Ignoring unreadable parsed board cache: %s, error: %s", file_path, e)
+            return None
+        if cached_fingerprint != fingerprint:
+            return None
+        return CachedBoard(file_path, entries, prefix_length + header_length)
+
+
+class BoardDirectoryCache:
+    """
+    Persistent board name -> board ID mapping of the Trello account, so resolving a board name
+    does not list all boards of the account for every command.
+    The mapping is replaced as a whole by put_all, it expires after the TTL.
+    """
+    def __init__(self, file_path: str = None, ttl_seconds: int = BOARD_DIRECTORY_CACHE_TTL_SECONDS):
+        self._file_path = file_path if file_path else FilePath.BOARD_DIRECTORY_CACHE_FILE
+        self._ttl_seconds = ttl_seconds
+        self._updated_at: Optional[float] = None
+        self._boards: Optional[Dict[str, str]] = None
+
+    def _load(self):
+        if self._boards is not None or not os.path.exists(self._file_path):
+            return
+        try:
+            with open(self._file_path, "r") as f:
+                data = json.load(f)
+            self._updated_at = float(data["updated_at"])
+            self._boards = dict(data["boards"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            LOG.warning("Ignoring unreadable board directory cache: %s, error: %s", self._file_path, e)
+
+    def _is_expired(self) -> bool:
+        return self._updated_at is None or time.time() - self._updated_at > self._ttl_seconds
+
+    def _get_boards(self) -> Optional[Dict[str, str]]:
+        self._load()
+        if self._boards is None or self._is_expired():
+            return None
+        return self._boards
+
+    def get_all(self) -> Optional[Mapping[str, str]]:
+        """
+        Returns a read-only view of the mapping, None if the mapping is not cached or expired.
+        """
+        boards = self._get_boards()
+        return MappingProxyType(boards) if boards is not None else None
+
+    def get_id(self, board_name: str) -> Optional[str]:
+        """
+        Returns None if the board is not cached or the mapping expired.
+        """
+        boards = self._get_boards()
+        return boards.get(board_name) if boards is not None else None
+
+    def put_all(self, boards: Dict[str, str]):
+        self._updated_at = time.time()
+        self._boards = dict(boards)
+        os.makedirs(os.path.dirname(self._file_path), exist_ok=True)
+        tmp_file = f"{self._file_path}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump({"updated_at": self._updated_at, "boards": self._boards}, f)
+        os.replace(tmp_file, self._file_path)
+        LOG.debug("Saved board directory cache: %s", self._file_path)
+
@@ -0,0 +1,139 @@
+import logging
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Tuple, Set
+
+from trello_backup.display.console import CliLogger
+from trello_backup.trello.model import TrelloCard, TrelloCards, TrelloLists, TrelloChecklists, TrelloChecklistItem
+
+LOG = logging.getLogger(__name__)
+CLI_LOG = CliLogger(LOG)
+
+
+@dataclass
+class CardMove:
+    card: TrelloCard
+    from_list: str
+    to_list: str
+
+
+@dataclass
+class CardEdit:
+    old: TrelloCard
+    new: TrelloCard
+
+
+@dataclass
+class ChecklistItemChange:
+    card: TrelloCard
+    checklist: str
+    item: TrelloChecklistItem
+
+
+@dataclass
+class BoardDiff:
+    added: List[TrelloCard] = field(default_factory=list)
+    removed: List[TrelloCard] = field(default_factory=list)
+    moved: List[CardMove] = field(default_factory=list)
+    renamed: List[CardEdit] = field(default_factory=list)
+    description_edited: List[CardEdit] = field(default_factory=list)
+    closed: List[TrelloCard] = field(default_factory=list)
+    reopened: List[TrelloCard] = field(default_factory=list)
+    items_checked: List[ChecklistItemChange] = field(default_factory=list)
+    items_unchecked: List[ChecklistItemChange] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not any((self.added, self.removed, self.moved, self.renamed, self.description_edited,
+                        self.closed, self.reopened, self.items_checked, self.items_unchecked))
+
+
+class BoardDiffer:
+    """
+    Structural diff of two board JSONs.
+    Cards and checklists are joined by id. Only the cards whose JSON or checklists' JSON differ are parsed to models,
+    so the cost is a linear scan of the raw JSONs plus the parsing of the changed cards.
+    """
+    @staticmethod
+    def diff(old_board_json: Dict[str, Any], new_board_json: Dict[str, Any]) -> BoardDiff:
+        changed_ids = BoardDiffer._get_changed_card_ids(old_board_json, new_board_json)
+        old_cards = BoardDiffer._parse_cards(old_board_json, changed_ids)
+        new_cards = BoardDiffer._parse_cards(new_board_json, changed_ids)
+        result = BoardDiff()
+        for card_id, card in new_cards.items():
+            old_card = old_cards.get(card_id)
+            if old_card is None:
+                result.added.append(card)
+            else:
+                BoardDiffer._diff_card(old_card, card, result)
+        result.removed = [card for card_id, card in old_cards.items() if card_id not in new_cards]
+        return result
+
+    @staticmethod
+    def _get_changed_card_ids(old_board_json: Dict[str, Any], new_board_json: Dict[str, Any]) -> Set[str]:
+        old_cards = {c["id"]: c for c in old_board_json["cards"]}
+        old_checklists = {c["id"]: c for c in old_board_json["checklists"]}
+        new_checklists = {c["id"]: c for c in new_board_json["checklists"]}
+        changed_ids = set(old_cards.keys())
+        for card in new_board_json["cards"]:
+            card_id = card["id"]
+            if old_cards.get(card_id) == card and \
+                    all(old_checklists.get(cl_id) == new_checklists.get(cl_id) for cl_id in card["idChecklists"]):
+                changed_ids.discard(card_id)
+            else:
+                changed_ids.add(card_id)
+        return changed_ids
+
+    @staticmethod
+    def _parse_cards(board_json: Dict[str, Any], card_ids: Set[str]) -> Dict[str, TrelloCard]:
+        changed_board_json = dict(board_json)
+        changed_board_json["cards"] = [c for c in board_json["cards"] if c["id"] in card_ids]
+        trello_cards = TrelloCards(changed_board_json, TrelloLists(board_json), TrelloChecklists(board_json))
+        return {card.id: card for card in trello_cards.all}
+
+    @staticmethod
+    def _diff_card(old: TrelloCard, new: TrelloCard, result: BoardDiff):
+        if old.list.id != new.list.id:
+            result.moved.append(CardMove(new, old.list.name, new.list.name))
+        if old.name != new.name:
+            result.renamed.append(CardEdit(old, new))
+        if old.description != new.description:
+            result.description_edited.append(CardEdit(old, new))
+        if old.closed != new.closed:
+            (result.closed if new.closed else result.reopened).append(new)
+
+        old_items: Dict[str, TrelloChecklistItem] = {item.id: item for cl in old.checklists for item in cl.items}
+        if not old_items:
+            return
+        for checklist in new.checklists:
+            for item in checklist.items:
+                old_item = old_items.get(item.id)
+                if old_item is not None and old_item.checked != item.checked:
+                    change = ChecklistItemChange(new, checklist.name, item)
+                    (result.items_checked if item.checked else result.items_unchecked).append(change)
+
+
+class BoardDiffPrinter:
+    @staticmethod
+    def print_plain_text(board_name: str, from_name: str, to_name: str, diff: BoardDiff):
+        CLI_LOG.info(f"Changes of board '{board_name}' from {from_name} to {to_name}")
+        if diff.is_empty:
+            CLI_LOG.info("No changes")
+            return
+        sections: List[Tuple[str, List[str]]] = [
+            ("Cards added", [f"{c.name} ({c.list.name})" for c in diff.added]),
+            ("Cards removed", [f"{c.name} ({c.list.name})" for c in diff.removed]),
+            ("Cards moved", [f"{m.card.name}: {m.from_list} -> {m.to_list}" for m in diff.moved]),
+            ("Cards renamed", [f"{e.old.name} -> {e.new.name}" for e in diff.renamed]),
+            ("Descriptions edited", [e.new.name for e in diff.description_edited]),
+            ("Cards closed", [c.name for c in diff.closed]),
+            ("Cards reopened", [c.name for c in diff.reopened]),
+            ("Checklist items checked", [f"{ch.card.name} / {ch.checklist}: {ch.item.value}" for ch in diff.items_checked]),
+            ("Checklist items unchecked", [f"{ch.card.name} / {ch.checklist}: {ch.item.value}" for ch in diff.items_unchecked]),
+        ]
+        for title, lines in sections:
+            if not lines:
+                continue
+            CLI_LOG.info("=" * 60)
+            CLI_LOG.info(f"{title} ({len(lines)}):")
+            for line in lines:
+                CLI_LOG.info(f"  {line}")
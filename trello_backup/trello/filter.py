@@ -1,6 +1,7 @@
 import logging
+from functools import lru_cache
 from enum import Enum, Flag, auto
-from typing import List, Callable, Any, Dict
+from typing import List, Callable, Any, Dict, Optional
 from trello_backup.exception import TrelloException
 
 
@@ -36,49 +37,81 @@ class ListFilter(Enum):
 
 
 
+# Card property checks evaluated on parsed TrelloCard objects
+CARD_CHECKS: Dict[CardPropertyFilter, Callable[['TrelloCard'], bool]] = {
+    CardPropertyFilter.WITH_ATTACHMENT: lambda card: card.has_attachments,
+    CardPropertyFilter.WITH_DESCRIPTION: lambda card: card.has_description,
+    CardPropertyFilter.WITH_CHECKLIST: lambda card: card.has_checklist,
+    CardPropertyFilter.OPEN: lambda card: card.open,
+}
+
+# Card property checks evaluated on the raw card JSON, before any TrelloCard object is constructed
+CARD_JSON_CHECKS: Dict[CardPropertyFilter, Callable[[Dict[str, Any]], bool]] = {
+    CardPropertyFilter.WITH_ATTACHMENT: lambda card_json: len(card_json.get("attachments", [])) > 0,
+    CardPropertyFilter.WITH_DESCRIPTION: lambda card_json: len(card_json["desc"]) > 0,
+    CardPropertyFilter.WITH_CHECKLIST: lambda card_json: len(card_json["idChecklists"]) > 0,
+    CardPropertyFilter.OPEN: lambda card_json: not card_json["closed"],
+}
+
+
 class CardFilterer:
     @staticmethod
-    def filter_cards(trello_list: 'TrelloList', card_filters: CardFilters) -> List['TrelloCard']:
-        from trello_backup.trello.model import TrelloCard
-        card_prop_flags = card_filters.value
-        if CardPropertyFilter.ALL() == card_prop_flags:
-            return trello_list.cards
-
-        all_checks: Dict[CardPropertyFilter, Callable[['TrelloCard'], Any]] = {
-            CardPropertyFilter.WITH_ATTACHMENT: lambda card: card.has_attachments,
-            CardPropertyFilter.WITH_DESCRIPTION: lambda card: card.has_description,
-            CardPropertyFilter.WITH_CHECKLIST: lambda card: card.has_checklist,
-            CardPropertyFilter.OPEN: lambda card: card.open
-        }
+    @lru_cache(maxsize=None)
+    def compile(card_filters: CardFilters) -> Optional[Callable[['TrelloCard'], bool]]:
+        """
+        Compiles the card filters to a single predicate that works on TrelloCard objects.
+        Compiled predicates are cached per CardFilters value.
+        Returns None if the filters keep every card, so callers can skip the check entirely.
+        """
+        return CardFilterer._compile(card_filters, CARD_CHECKS)
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def compile_card_json_predicate(card_filters: CardFilters) -> Optional[Callable[[Dict[str, Any]], bool]]:
+        """
+        Same as compile, but the returned predicate works on raw card JSON.
+        """
+        return CardFilterer._compile(card_filters, CARD_JSON_CHECKS)
 
-        required_checks: Dict[CardPropertyFilter, Callable[['TrelloCard'], Any]] = {}
-        filters = [CardPropertyFilter.WITH_ATTACHMENT, CardPropertyFilter.WITH_DESCRIPTION, CardPropertyFilter.WITH_CHECKLIST, CardPropertyFilter.OPEN]
-        for filter in filters:
-            required_checks[filter] = all_checks[filter]
+    @staticmethod
+    def _compile(card_filters: CardFilters, all_checks: Dict[CardPropertyFilter, Callable[[Any], bool]]):
+        card_prop_flags = card_filters.value
+        if CardPropertyFilter.ALL() == card_prop_flags:
+            return None
 
         all_filters = set([f for f in CardPropertyFilter])
-        defined_filters = set(filters)
-        missing = all_filters.difference(defined_filters)
+        missing = all_filters.difference(all_checks.keys())
         if missing:
             raise TrelloException(f"Found undefined card checker for filters: {missing}")
 
-        filtered_cards = []
-        for card in trello_list.cards:
-            # Keep the card if ANY of the required checks pass
-            if any(check(card) for check in required_checks.values()):
-                filtered_cards.append(card)
-            else:
-                LOG.debug(f"Discarding card: {card.name}, filters: {card_prop_flags}")
+        checks = tuple(check for flag, check in all_checks.items() if flag in card_prop_flags)
+        if len(checks) == 1:
+            return checks[0]
+        # Keep the card if ANY of the required checks pass
+        return lambda card: any(check(card) for check in checks)
 
-        return filtered_cards
+    @staticmethod
+    def filter_cards(trello_list: 'TrelloList', card_filters: CardFilters) -> List['TrelloCard']:
+        predicate = CardFilterer.compile(card_filters)
+        if predicate is None:
+            return trello_list.cards
+        return [card for card in trello_list.cards if predicate(card)]
 
 
 class TrelloFilters:
-    def __init__(self, filter_list_names: List[str], list_filter: ListFilter, card_filters: CardFilters):
+    def __init__(self,
+                 filter_list_names: List[str],
+                 list_filter: ListFilter,
+                 card_filters: CardFilters,
+                 card_query: Optional['CardQuery'] = None):
         self.filter_list_names: List[str] = filter_list_names
         self.list_filter: ListFilter = list_filter
         self.card_filters: CardFilters = card_filters
+        self.card_query: Optional['CardQuery'] = card_query
+
+    @property
+    def card_predicate(self) -> Optional[Callable[['TrelloCard'], bool]]:
+        return CardFilterer.compile(self.card_filters)
 
     @staticmethod
     def create_default():
@@ -1,7 +1,8 @@
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Iterable, Set
+from typing import List, Dict, Optional, Iterable, Set, Tuple, Iterator, Sequence, Any
 
-from trello_backup.trello.filter import ListFilter
+from trello_backup.trello.filter import ListFilter, CardFilters
 
 
 # TODO Revisit this class?
@@ -36,28 +37,41 @@ class TrelloList:
     cards: List['TrelloCard'] = field(default_factory=list)
 
 class TrelloLists:
-    def __init__(self, board_json, trello_lists_param: Optional[List[TrelloList]] = None):
-        from trello_backup.trello.parser import TrelloObjectParser
+    """
+    Immutable, position-sorted and indexed collection of TrelloList objects.
+    Board JSON is parsed only once, filtered collections are cheap views over the same TrelloList objects.
+    """
+    def __init__(self,
+                 board_json,
+                 trello_lists_param: Optional[List[TrelloList]] = None,
+                 filtered: bool = False):
         self._board_json = board_json
-        self._filtered = False
-
-        trello_lists: List[TrelloList] = TrelloObjectParser.parse_trello_lists(board_json)
-
-        if trello_lists_param:
-            if len(trello_lists_param) < len(trello_lists):
-                self._filtered = True
+        if trello_lists_param is None:
+            from trello_backup.trello.parser import TrelloObjectParser
+            trello_lists: Iterable[TrelloList] = TrelloObjectParser.parse_trello_lists(board_json)
+            filtered = False
+        else:
             trello_lists = trello_lists_param
+        # Whether this collection does not contain all the lists of the board
+        self._filtered = filtered
 
-        self._by_id: Dict[str, TrelloList] = {l.id: l for l in trello_lists}
-        self._by_name: Dict[str, TrelloList] = {l.name: l for l in trello_lists}
+        self._all: Tuple[TrelloList, ...] = tuple(self._sort(trello_lists))
+        self._by_id: Dict[str, TrelloList] = {l.id: l for l in self._all}
+        self._by_name: Dict[str, TrelloList] = {l.name: l for l in self._all}
         # Filter open trello lists
-        self.open: List[TrelloList] = self._sort(filter(lambda tl: not tl.closed, trello_lists))
+        self.open: Tuple[TrelloList, ...] = tuple(l for l in self._all if not l.closed)
+
+    def __len__(self):
+        return len(self._all)
 
-    def get(self) -> List[TrelloList]:
-        return self._sort(self._by_name.values())
+    def __iter__(self) -> Iterator[TrelloList]:
+        return iter(self._all)
+
+    def get(self) -> Tuple[TrelloList, ...]:
+        return self._all
 
     def get_ids(self):
-        return set(self._by_id.keys())
+        return self._by_id.keys()
 
     def get_by_id(self, list_id):
         return self._by_id[list_id]
@@ -66,21 +80,22 @@ class TrelloLists:
     def _sort(lists: Iterable[TrelloList]) -> List[TrelloList]:
         return sorted(lists, key=lambda l: l.pos)
 
+    def _view(self, trello_lists: Iterable[TrelloList]) -> 'TrelloLists':
+        """
+        Creates a filtered view of this collection.
+        The input must be a subsequence of self._all so the ordering is preserved.
+        """
+        trello_lists = list(trello_lists)
+        filtered = self._filtered or len(trello_lists) < len(self._all)
+        return TrelloLists(self._board_json, trello_lists_param=trello_lists, filtered=filtered)
+
     # TODO ASAP filtering Move methods to new class: ListFilterer
     def filter_by_list_names(self, list_names: List[str]) -> 'TrelloLists':
         """
         Retrieves TrelloList objects corresponding to the provided list names.
         Creates a new TrelloLists to only contain the filtered items.
         """
-        found: List[TrelloList] = []
-        not_found: List[str] = []
-
-        # Iterate through the requested names to check and collect results
-        for name in list_names:
-            if name in self._by_name:
-                found.append(self._by_name[name])
-            else:
-                not_found.append(name)
+        not_found: List[str] = [name for name in list_names if name not in self._by_name]
 
         # Raise an error if any lists were missing
         if not_found:
@@ -88,14 +103,16 @@ class TrelloLists:
             raise ValueError(
                 f"The following lists were not found on the board: {missing_names}"
             )
-        return TrelloLists(self._board_json, trello_lists_param=self._sort(found))
+        wanted = set(list_names)
+        return self._view(l for l in self._all if l.name in wanted)
 
     # TODO ASAP filtering Move methods to new class: ListFilterer
     def filter_by_list_filter(self, list_filter: ListFilter):
         if list_filter == ListFilter.ALL:
-            return TrelloLists(self._board_json, trello_lists_param=list(self.get()))
+            # Immutable collection, no need to copy
+            return self
         elif list_filter == ListFilter.OPEN:
-            return TrelloLists(self._board_json, trello_lists_param=list(self.open))
+            return self._view(self.open)
 
 
 @dataclass
@@ -157,17 +174,29 @@ class TrelloChecklist:
 
 
 class TrelloChecklists:
+    """
+    Checklists of a board, indexed by id.
+    Checklist JSON is only parsed when a card referencing the checklist is parsed.
+    """
     def __init__(self, board_json):
-        from trello_backup.trello.parser import TrelloObjectParser
-        self._all: List[TrelloChecklist] = TrelloObjectParser.parse_trello_checklists(board_json)
-        # self._by_id: Dict[str, TrelloChecklist] = {c.id: c for c in self._all}
+        self._json_by_id: Dict[str, Dict[str, Any]] = {c["id"]: c for c in board_json["checklists"]}
+        self._by_id: Dict[str, TrelloChecklist] = {}
 
-    def get_by_ids(self, cl_ids: Set[str]):
+    def get_by_ids(self, cl_ids: Iterable[str]):
         """
         Returns sorted checklists, filtered for ids
         :return:
         """
-        return list(filter(lambda cli: cli.id in cl_ids, self._all))
+        checklists = [self._get_by_id(cl_id) for cl_id in cl_ids if cl_id in self._json_by_id]
+        return sorted(checklists, key=lambda cl: cl.pos)
+
+    def _get_by_id(self, cl_id: str) -> TrelloChecklist:
+        checklist = self._by_id.get(cl_id)
+        if checklist is None:
+            from trello_backup.trello.parser import TrelloObjectParser
+            checklist = TrelloObjectParser.parse_trello_checklist(self._json_by_id[cl_id])
+            self._by_id[cl_id] = checklist
+        return checklist
 
 
 @dataclass
@@ -206,11 +235,85 @@ class TrelloCard:
 
 
 class TrelloCards:
-    def __init__(self, board_json, trello_lists: TrelloLists, trello_checklists: TrelloChecklists):
+    """
+    Cards of a board, materialized lazily.
+    Only the positions of the card JSONs per list are indexed eagerly, TrelloCard objects of a list are created
+    when the cards of the list are requested.
+    """
+    def __init__(self,
+                 board_json,
+                 trello_lists: TrelloLists,
+                 trello_checklists: TrelloChecklists,
+                 card_filters: CardFilters = CardFilters.ALL):
         from trello_backup.trello.parser import TrelloObjectParser
-        self.all: List[TrelloCard] = TrelloObjectParser.parse_trello_cards(board_json, trello_lists, trello_checklists)
-        self.open: List[TrelloCard] = list(filter(lambda c: not c.closed, self.all))
-        self.by_short_url = {c.short_url: c for c in self.all}
+        self._cards_json: List[Dict[str, Any]] = board_json["cards"]
+        self._trello_lists = trello_lists
+        self._trello_checklists = trello_checklists
+        self._indices_by_list_id: Dict[str, List[int]] = TrelloObjectParser.index_trello_cards(board_json, trello_lists,
+                                                                                               card_filters=card_filters)
+        self._by_index: Dict[int, TrelloCard] = {}
+        self._materialized_list_ids: Set[str] = set()
+        self._indices_by_label: Optional[Dict[str, List[int]]] = None
+
+    def __len__(self) -> int:
+        return sum(len(indices) for indices in self._indices_by_list_id.values())
+
+    def _get_card(self, idx: int, list_id: str) -> TrelloCard:
+        card = self._by_index.get(idx)
+        if card is None:
+            from trello_backup.trello.parser import TrelloObjectParser
+            card = TrelloObjectParser.parse_trello_card(self._cards_json[idx], self._trello_lists.get_by_id(list_id),
+                                                        self._trello_checklists)
+            self._by_index[idx] = card
+        return card
+
+    def get_cards(self, trello_list: TrelloList) -> List[TrelloCard]:
+        """
+        Materializes the cards of the list, TrelloList.cards is filled with them on the first call.
+        """
+        cards = [self._get_card(idx, trello_list.id) for idx in self._indices_by_list_id.get(trello_list.id, [])]
+        if trello_list.id not in self._materialized_list_ids:
+            self._materialized_list_ids.add(trello_list.id)
+            trello_list.cards.extend(cards)
+        return cards
+
+    def _get_label_indices(self, labels: Iterable[str]) -> List[int]:
+        if self._indices_by_label is None:
+            # Built once from the card JSONs, no cards are materialized for it
+            self._indices_by_label = defaultdict(list)
+            for indices in self._indices_by_list_id.values():
+                for idx in indices:
+                    for label in self._cards_json[idx]["labels"]:
+                        self._indices_by_label[label["name"].lower()].append(idx)
+        return sorted({idx for label in labels for idx in self._indices_by_label.get(label, [])})
+
+    def count_by_labels(self, labels: Iterable[str]) -> int:
+        return len(self._get_label_indices(labels))
+
+    def get_by_labels(self, labels: Iterable[str]) -> List[TrelloCard]:
+        """
+        Returns the cards having any of the lowercase labels, in the order of the board JSON.
+        Only these cards are materialized.
+        """
+        return [self._get_card(idx, self._cards_json[idx]["idList"]) for idx in self._get_label_indices(labels)]
+
+    @property
+    def all(self) -> List[TrelloCard]:
+        """
+        Materializes the cards of every list, in the order of the board JSON.
+        """
+        pending = [l for l in self._trello_lists.get() if l.id not in self._materialized_list_ids]
+        if pending:
+            from trello_backup.display.progress import ProgressReporter
+            num_cards = sum(len(self._indices_by_list_id.get(l.id, [])) for l in pending)
+            with ProgressReporter("Processing cards", num_cards) as progress:
+                for trello_list in pending:
+                    progress.advance(trello_list.name, steps=len(self.get_cards(trello_list)))
+        return [self._by_index[idx] for idx in sorted(self._by_index)]
+
+    @property
+    def open(self) -> List[TrelloCard]:
+        return [c for c in self.all if not c.closed]
 
 
 @dataclass
@@ -218,8 +321,12 @@ class TrelloBoard:
     id: str
     json: str
     name: str
-    lists: List[TrelloList]
+    lists: Sequence[TrelloList]
 
     def __post_init__(self):
+        self.simple_name = TrelloBoard.get_simple_name(self.name)
+
+    @staticmethod
+    def get_simple_name(board_name: str) -> str:
         import re
-        self.simple_name = re.sub("[ /\ ]+", "-", self.name).lower()
+        return re.sub("[ /\ ]+", "-", board_name).lower()
@@ -1,8 +1,10 @@
-from typing import List
+from collections import defaultdict
+from typing import List, Dict, Iterator, Tuple
 
 from trello_backup.display.console import CliLogger
 from trello_backup.exception import TrelloException
 from trello_backup.trello.api import TrelloApi
+from trello_backup.trello.filter import CardFilters, CardFilterer
 from trello_backup.trello.model import TrelloList, TrelloLists, TrelloChecklists, TrelloComment, TrelloAttachment, \
     TrelloCard, TrelloChecklistItem, TrelloChecklist, TrelloCards
 
@@ -22,59 +24,71 @@ class TrelloObjectParser:
         return parsed_lists
 
     @staticmethod
-    def parse_trello_cards(board_json,
+    def index_trello_cards(board_json,
                            trello_lists: TrelloLists,
-                           trello_checklists: TrelloChecklists):
-        cards_json = board_json["cards"]
-        cards = []
-        list_ids = trello_lists.get_ids()
-        for idx, card in enumerate(cards_json):
-            # TODO Add progress bar for cards
-            CLI_LOG.info("Processing card: {} / {}".format(idx + 1, len(cards_json)))
-            attachments = []
-            if "attachments" in card and len(card["attachments"]) > 0:
-                for attachment_json in card["attachments"]:
-                    is_upload = attachment_json["isUpload"]
-                    attachment_api_url = None
-                    if is_upload:
-                        attachment_api_url = TrelloApi.reformat_attachment_url(card["id"], attachment_json["id"], attachment_json["fileName"])
-
-                    trello_attachment = TrelloAttachment(attachment_json["id"],
-                                                         attachment_json["date"],
-                                                         attachment_json["name"],
-                                                         attachment_json["url"],
-                                                         attachment_api_url,
-                                                         is_upload,
-                                                         attachment_json["fileName"],
-                                                         None)
-                    attachments.append(trello_attachment)
+                           card_filters: CardFilters = CardFilters.ALL) -> Dict[str, List[int]]:
+        """
+        Returns list ID -> positions of the card JSONs of the list in the board JSON, for the cards passing the filters.
+        No objects are created for the cards.
+        """
+        indices: Dict[str, List[int]] = defaultdict(list)
+        for list_id, idx in TrelloObjectParser._iter_card_indices(board_json, trello_lists, card_filters):
+            indices[list_id].append(idx)
+        return indices
 
-            if trello_lists._filtered and card["idList"] not in list_ids:
-                # Skip this card.
-                # If TrelloLists are filtered (does not contain all the lists), we allow the card to be not present for the lists.
-                continue
+    @staticmethod
+    def _iter_card_indices(board_json,
+                           trello_lists: TrelloLists,
+                           card_filters: CardFilters) -> Iterator[Tuple[str, int]]:
+        list_ids = trello_lists.get_ids()
+        skip_unknown_lists = trello_lists._filtered
+        card_predicate = CardFilterer.compile_card_json_predicate(card_filters)
+        for idx, card in enumerate(board_json["cards"]):
             list_id = card["idList"]
             if list_id not in list_ids:
+                if skip_unknown_lists:
+                    # Skip this card.
+                    # If TrelloLists are filtered (does not contain all the lists), we allow the card to be not present for the lists.
+                    continue
                 raise TrelloException(f"Cannot find list with id: {list_id}. All lists: {trello_lists}")
-            trello_list = trello_lists.get_by_id(list_id)
-            label_names = [l["name"] for l in card["labels"]]
-            checklist_ids = card["idChecklists"]
-            checklists = trello_checklists.get_by_ids(checklist_ids)
-            trello_card = TrelloCard(card["id"],
-                                     card["name"],
-                                     card["shortUrl"],
-                                     trello_list,
-                                     card["desc"],
-                                     attachments,
-                                     checklists,
-                                     label_names,
-                                     card["closed"],
-                                     [],
-                                     card["due"],
-                                     [])
-            cards.append(trello_card)
-            trello_list.cards.append(trello_card)
-        return cards
+            if card_predicate and not card_predicate(card):
+                continue
+            yield list_id, idx
+
+    @staticmethod
+    def parse_trello_card(card, trello_list: TrelloList, trello_checklists: TrelloChecklists) -> TrelloCard:
+        attachments = [TrelloObjectParser._parse_attachment(card, attachment_json)
+                       for attachment_json in card.get("attachments", [])]
+        label_names = [l["name"] for l in card["labels"]]
+        checklists = trello_checklists.get_by_ids(card["idChecklists"])
+        return TrelloCard(card["id"],
+                          card["name"],
+                          card["shortUrl"],
+                          trello_list,
+                          card["desc"],
+                          attachments,
+                          checklists,
+                          label_names,
+                          card["closed"],
+                          [],
+                          card["due"],
+                          [])
+
+    @staticmethod
+    def _parse_attachment(card, attachment_json) -> TrelloAttachment:
+        is_upload = attachment_json["isUpload"]
+        attachment_api_url = None
+        if is_upload:
+            attachment_api_url = TrelloApi.reformat_attachment_url(card["id"], attachment_json["id"], attachment_json["fileName"])
+
+        return TrelloAttachment(attachment_json["id"],
+                                attachment_json["date"],
+                                attachment_json["name"],
+                                attachment_json["url"],
+                                attachment_api_url,
+                                is_upload,
+                                attachment_json["fileName"],
+                                None)
 
     @staticmethod
     def parse_comments_for_card(card, actions_resp_parsed) -> List[TrelloComment]:
@@ -97,19 +111,18 @@ class TrelloObjectParser:
 
     @staticmethod
     def parse_trello_checklists(board_json):
-        checklists = board_json["checklists"]
-
-        trello_checklists = []
-        for checklist in checklists:
-            checkitems_json = checklist["checkItems"]
-            trello_checklist_items = []
-            for checkitem in checkitems_json:
-                trello_checklist_item = TrelloChecklistItem(checkitem["id"], checkitem["name"], checkitem["state"] == "complete", checkitem["pos"])
-                trello_checklist_items.append(trello_checklist_item)
-
-            # TODO ASAP refactor: Add checklist object to card object
-            trello_checklist_items = sorted(trello_checklist_items, key=lambda cli: cli.pos)
-            trello_checklist = TrelloChecklist(checklist["id"], checklist["name"], checklist["idBoard"], checklist["idCard"], checklist["pos"], trello_checklist_items)
-            trello_checklists.append(trello_checklist)
+        trello_checklists = [TrelloObjectParser.parse_trello_checklist(checklist) for checklist in board_json["checklists"]]
         trello_checklists = sorted(trello_checklists, key=lambda cli: cli.pos)
         return trello_checklists
+
+    @staticmethod
+    def parse_trello_checklist(checklist) -> TrelloChecklist:
+        checkitems_json = checklist["checkItems"]
+        trello_checklist_items = []
+        for checkitem in checkitems_json:
+            trello_checklist_item = TrelloChecklistItem(checkitem["id"], checkitem["name"], checkitem["state"] == "complete", checkitem["pos"])
+            trello_checklist_items.append(trello_checklist_item)
+
+        # TODO ASAP refactor: Add checklist object to card object
+        trello_checklist_items = sorted(trello_checklist_items, key=lambda cli: cli.pos)
+        return TrelloChecklist(checklist["id"], checklist["name"], checklist["idBoard"], checklist["idCard"], checklist["pos"], trello_checklist_items)
@@ -0,0 +1,174 @@
+import datetime
+import fnmatch
+import logging
+import shlex
+from dataclasses import dataclass, field
+from typing import Callable, List, Dict, Iterable, Optional, Tuple, FrozenSet
+
+from trello_backup.exception import TrelloQueryException
+from trello_backup.trello.model import TrelloCard, TrelloCards
+
+LOG = logging.getLogger(__name__)
+
+CardPredicate = Callable[[TrelloCard], bool]
+
+QUERY_OPTION_HELP = "Only select cards matching the query, e.g. 'label:urgent due:<2025-01-01 -is:closed'"
+
+
+@dataclass
+class CardQuery:
+    text: str
+    predicates: List[CardPredicate] = field(default_factory=list)
+    # Positive label terms, each term is a set of alternative labels. Used for the label index of TrelloCards.
+    label_terms: List[FrozenSet[str]] = field(default_factory=list)
+
+    def matches(self, card: TrelloCard) -> bool:
+        return all(predicate(card) for predicate in self.predicates)
+
+    def filter(self, cards: Iterable[TrelloCard]) -> List[TrelloCard]:
+        return [card for card in cards if self.matches(card)]
+
+    def select(self, trello_cards: TrelloCards) -> List[TrelloCard]:
+        """
+        Selects the matching cards of the board. With a label term, only the cards of the label
+        with the fewest cards are materialized and evaluated.
+        """
+        if not self.label_terms:
+            return self.filter(trello_cards.all)
+        labels = min(self.label_terms, key=trello_cards.count_by_labels)
+        return self.filter(trello_cards.get_by_labels(labels))
+
+
+class CardQueryParser:
+    DUE_DATE_FORMAT = "YYYY-MM-DD"
+
+    @staticmethod
+    def parse(query: str) -> CardQuery:
+        try:
+            tokens = shlex.split(query)
+        except ValueError as e:
+            raise TrelloQueryException(f"Invalid query: {query}. Error: {e}")
+
+        card_query = CardQuery(query)
+        for token in tokens:
+            negated = token.startswith("-") and len(token) > 1
+            term = token[1:] if negated else token
+            predicate = CardQueryParser._parse_term(term, card_query, negated)
+            if negated:
+                card_query.predicates.append(lambda card, p=predicate: not p(card))
+            else:
+                card_query.predicates.append(predicate)
+        LOG.debug("Parsed card query '%s' to %d predicates", query, len(card_query.predicates))
+        return card_query
+
+    @staticmethod
+    def _parse_term(term: str, card_query: CardQuery, negated: bool) -> CardPredicate:
+        key, sep, value = term.partition(":")
+        if not sep or key not in CardQueryParser._TERM_PARSERS:
+            text = term.lower()
+            return lambda card: CardQueryParser._text_matches(card, text)
+        if not value:
+            raise TrelloQueryException(f"Missing value for query term: {term}")
+
+        if key == "label" and not negated:
+            card_query.label_terms.append(CardQueryParser._split_labels(value))
+        return CardQueryParser._TERM_PARSERS[key](value)
+
+    @staticmethod
+    def _split_labels(value: str) -> FrozenSet[str]:
+        return frozenset(l.strip().lower() for l in value.split(",") if l.strip())
+
+    @staticmethod
+    def _parse_label(value: str) -> CardPredicate:
+        labels = CardQueryParser._split_labels(value)
+        return lambda card: any(l.lower() in labels for l in card.labels)
+
+    @staticmethod
+    def _parse_list(value: str) -> CardPredicate:
+        pattern = value.lower()
+        return lambda card: fnmatch.fnmatchcase(card.list.name.lower(), pattern)
+
+    @staticmethod
+    def _parse_is(value: str) -> CardPredicate:
+        if value == "open":
+            return lambda card: card.open
+        if value == "closed":
+            return lambda card: card.closed
+        raise TrelloQueryException(f"Unknown value for 'is': {value}. Possible values: open, closed")
+
+    @staticmethod
+    def _parse_has(value: str) -> CardPredicate:
+        checks = {
+            "checklist": lambda card: card.has_checklist,
+            "description": lambda card: card.has_description,
+            "attachment": lambda card: card.has_attachments,
+            "due": lambda card: bool(card.due_date),
+        }
+        if value not in checks:
+            raise TrelloQueryException(f"Unknown value for 'has': {value}. Possible values: {', '.join(checks.keys())}")
+        return checks[value]
+
+    @staticmethod
+    def _parse_due(value: str) -> CardPredicate:
+        if value == "none":
+            return lambda card: not card.due_date
+        if value == "any":
+            return lambda card: bool(card.due_date)
+
+        # Trello due dates are ISO-8601 strings, e.g. 2025-11-20T12:00:00.000Z
+        # The date part of these can be compared as strings.
+        start, end = CardQueryParser._parse_due_range(value)
+
+        def due_in_range(card):
+            if not card.due_date:
+                return False
+            due = card.due_date[:10]
+            if start is not None:
+                date, inclusive = start
+                if due < date or (due == date and not inclusive):
+                    return False
+            if end is not None:
+                date, inclusive = end
+                if due > date or (due == date and not inclusive):
+                    return False
+            return True
+        return due_in_range
+
+    @staticmethod
+    def _parse_due_range(value: str) -> Tuple[Optional[Tuple[str, bool]], Optional[Tuple[str, bool]]]:
+        """
+        Returns the (date, inclusive) pairs of the lower and upper bounds.
+        """
+        if ".." in value:
+            start, _, end = value.partition("..")
+            return (CardQueryParser._parse_date(start), True), (CardQueryParser._parse_date(end), True)
+        for op in ("<=", ">=", "<", ">"):
+            if value.startswith(op):
+                date = CardQueryParser._parse_date(value[len(op):])
+                inclusive = op.endswith("=")
+                if op.startswith("<"):
+                    return None, (date, inclusive)
+                return (date, inclusive), None
+        date = CardQueryParser._parse_date(value)
+        return (date, True), (date, True)
+
+    @staticmethod
+    def _parse_date(value: str) -> str:
+        try:
+            return datetime.date.fromisoformat(value).isoformat()
+        except ValueError:
+            raise TrelloQueryException(f"Invalid date: '{value}', expected format: {CardQueryParser.DUE_DATE_FORMAT}")
+
+    @staticmethod
+    def _text_matches(card: TrelloCard, text: str) -> bool:
+        if text in card.name.lower() or text in card.description.lower():
+            return True
+        return any(text in item.value.lower() for cl in card.checklists for item in cl.items)
+
+    _TERM_PARSERS: Dict[str, Callable[[str], CardPredicate]] = {
+        "label": _parse_label,
+        "list": _parse_list,
+        "is": _parse_is,
+        "has": _parse_has,
+        "due": _parse_due,
+    }
@@ -0,0 +1,145 @@
+import datetime
+import logging
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from trello_backup.constants import FilePath, SEARCH_RESULT_LIMIT
+from trello_backup.display.console import CliLogger
+from trello_backup.exception import TrelloException
+from trello_backup.trello.model import TrelloBoard, TrelloCard
+from trello_backup.utils import HashUtils
+
+LOG = logging.getLogger(__name__)
+CLI_LOG = CliLogger(LOG)
+
+# Increase this if the indexed columns change, so the index is rebuilt
+SEARCH_INDEX_VERSION = 1
+# BM25 weights of the indexed columns: card name, labels, description, checklists, comments
+_COLUMN_WEIGHTS = (10.0, 5.0, 2.0, 1.0, 1.0)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS boards (
+    board_id TEXT PRIMARY KEY,
+    board_name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    session TEXT,
+    updated TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS cards USING fts5(
+    board_id UNINDEXED,
+    board_name UNINDEXED,
+    list_name UNINDEXED,
+    card_id UNINDEXED,
+    short_url UNINDEXED,
+    name,
+    labels,
+    description,
+    checklists,
+    comments,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+PRAGMA user_version = {SEARCH_INDEX_VERSION};
+"""
+
+
+@dataclass
+class SearchHit:
+    board_name: str
+    list_name: str
+    card_name: str
+    short_url: str
+    snippet: str
+    session: Optional[str]
+
+
+class SearchIndex:
+    """
+    Persistent SQLite FTS5 index of the backed up cards with their labels, description,
+    checklist items (with the resolved URL titles) and comments. One row per card, ranked with BM25.
+    """
+    def __init__(self, file_path: str = None):
+        self._file_path = file_path if file_path else FilePath.SEARCH_INDEX_FILE
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self._file_path)), exist_ok=True)
+            self._conn = sqlite3.connect(self._file_path)
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SEARCH_INDEX_VERSION):
+                LOG.info("Rebuilding search index with version %d, previous version: %d", SEARCH_INDEX_VERSION, version)
+                self._conn.executescript("DROP TABLE IF EXISTS boards; DROP TABLE IF EXISTS cards;")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _card_row(board: TrelloBoard, card: TrelloCard) -> Tuple:
+        checklists = "\n".join(f"{item.value} {item.url_title}" if item.url_title else item.value
+                               for checklist in card.checklists for item in checklist.items)
+        comments = "\n".join(comment.contents for comment in card.comments)
+        return (board.id, board.name, card.list.name, card.id, card.short_url,
+                card.name, " ".join(card.labels), card.description, checklists, comments)
+
+    def index_board(self, board: TrelloBoard, session: Optional[str] = None) -> bool:
+        """
+        Replaces the indexed cards of the board. Returns False if the board did not change since it was last indexed.
+        """
+        rows = [self._card_row(board, card) for trello_list in board.lists for card in trello_list.cards]
+        fingerprint = HashUtils.fingerprint(rows)
+        conn = self._connect()
+        indexed = conn.execute("SELECT fingerprint FROM boards WHERE board_id = ?", (board.id,)).fetchone()
+        if indexed and indexed[0] == fingerprint:
+            LOG.debug("Search index of board '%s' is up to date", board.name)
+            return False
+        with conn:
+            conn.execute("DELETE FROM cards WHERE board_id = ?", (board.id,))
+            conn.executemany("INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO boards VALUES (?, ?, ?, ?, ?)",
+                         (board.id, board.name, fingerprint, session,
+                          datetime.datetime.now().isoformat(timespec="seconds")))
+        LOG.info("Indexed %d cards of board '%s' for search", len(rows), board.name)
+        return True
+
+    @staticmethod
+    def to_match_expression(query: str) -> str:
+        """
+        Converts a plain query to an FTS5 expression: terms are quoted and AND-ed, a trailing '*' is a prefix search.
+        """
+        terms = []
+        for term in query.split():
+            prefix = term.endswith("*")
+            term = term.rstrip("*")
+            if not term:
+                continue
+            quoted = '"' + term.replace('"', '""') + '"'
+            terms.append(f"{quoted}*" if prefix else quoted)
+        if not terms:
+            raise TrelloException(f"Empty search query: '{query}'")
+        return " ".join(terms)
+
+    def search(self, query: str, board_name: Optional[str] = None, limit: int = SEARCH_RESULT_LIMIT) -> List[SearchHit]:
+        sql = (f"SELECT cards.board_name, cards.list_name, cards.name, cards.short_url, "
+               f"snippet(cards, -1, '[', ']', '...', 12), boards.session "
+               f"FROM cards JOIN boards ON boards.board_id = cards.board_id "
+               f"WHERE cards MATCH ? {'AND cards.board_name = ? ' if board_name else ''}"
+               f"ORDER BY bm25(cards, 0, 0, 0, 0, 0, {', '.join(map(str, _COLUMN_WEIGHTS))}) LIMIT ?")
+        params = [self.to_match_expression(query)] + ([board_name] if board_name else []) + [limit]
+        return [SearchHit(*row) for row in self._connect().execute(sql, params)]
+
+
+class SearchResultPrinter:
+    @staticmethod
+    def print_plain_text(query: str, hits: List[SearchHit]):
+        CLI_LOG.info(f"Found {len(hits)} cards for '{query}'")
+        for hit in hits:
+            CLI_LOG.info("=" * 60)
+            CLI_LOG.info(f"CARD: {hit.card_name} ({hit.board_name} / {hit.list_name})")
+            CLI_LOG.info(f"URL: {hit.short_url}")
+            CLI_LOG.info(hit.snippet)
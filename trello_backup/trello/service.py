@@ -1,19 +1,22 @@
 import logging
 import re
-from typing import Dict, Any, List, Tuple, Optional
+from collections import defaultdict
+from typing import Dict, Any, List, Tuple, Optional, Iterator
 
 from pythoncommons.url_utils import UrlUtils
 
 from trello_backup.cli.prompt import TrelloPrompt
 from trello_backup.display.console import CliLogger
 from trello_backup.display.output import TrelloDataConverter, TrelloListAndCardsPrinter
-from trello_backup.trello.api import TrelloApiAbs, TrelloRepository
-from trello_backup.trello.cache import WebpageTitleCache
-from trello_backup.trello.filter import CardFilterer, TrelloFilters
+from trello_backup.display.progress import ProgressReporter
+from trello_backup.trello.api import TrelloApiAbs, TrelloRepository, BoardDetailsProfile
+from trello_backup.trello.cache import WebpageTitleCache, ParsedBoardCache, BoardDirectoryCache
+from trello_backup.trello.filter import TrelloFilters, CardFilters
 from trello_backup.trello.html import HtmlParser
 from trello_backup.trello.model import TrelloChecklist, TrelloBoard, TrelloLists, TrelloChecklists, TrelloCards, \
-    TrelloComment
+    TrelloComment, TrelloCard, TrelloList
 from trello_backup.trello.parser import TrelloObjectParser
+from trello_backup.trello.query import CardQuery
 
 LOG = logging.getLogger(__name__)
 CLI_LOG = CliLogger(LOG)
@@ -24,18 +27,35 @@ class TrelloOperations:
                  trello_repository: TrelloRepository,
                  cache: WebpageTitleCache,
                  title_service: 'TrelloTitleService',
-                 data_converter: TrelloDataConverter):
+                 data_converter: TrelloDataConverter,
+                 parsed_board_cache: Optional[ParsedBoardCache] = None,
+                 board_directory_cache: Optional[BoardDirectoryCache] = None):
         self._api: TrelloApiAbs = trello_repository.get_api()
         self._board_name_to_board_id: Dict[str, str] = {}
         self._board_id_to_board_json: Dict[str, Any] = {}
+        self._board_id_to_profile: Dict[str, BoardDetailsProfile] = {}
         self._cache = cache
+        self._parsed_board_cache = parsed_board_cache
+        self._board_directory_cache = board_directory_cache
         self._webpage_title_service = title_service
         self._data_converter = data_converter
 
-    def get_board_names_and_ids(self):
+    def refresh(self):
+        """
+        Drops the downloaded board JSONs, board IDs and parsed boards are kept.
+        """
+        self._board_id_to_board_json.clear()
+        self._board_id_to_profile.clear()
+        self._api.refresh()
+
+    def get_board_names_and_ids(self) -> Dict[str, str]:
+        """
+        Always lists the boards with the API, the result replaces the cached board directory.
+        """
         d = self._api.list_boards()
-        for board_name, board_id in d.items():
-            self._board_name_to_board_id[board_name] = board_id
+        self._board_name_to_board_id.update(d)
+        if self._board_directory_cache:
+            self._board_directory_cache.put_all(d)
         return d
 
     # TODO ASAP Refactor, unify interface: get_board + get_lists_and_cards
@@ -51,39 +71,129 @@ class TrelloOperations:
     def get_lists_and_cards(self,
                             board_name: str,
                             filters: TrelloFilters) -> Tuple[TrelloBoard, TrelloLists]:
-        board, trello_lists = self._get_trello_board_and_lists(board_name, filters)
+        if self._parsed_board_cache is not None:
+            return self._get_cached_board_and_lists(board_name, filters)
+        board, trello_lists = self._get_trello_board_and_lists(board_name, filters, profile=BoardDetailsProfile.CARDS)
         # TODO ASAP Refactor, does it make sense to return trello_lists
         return board, trello_lists
 
-
-    def _get_trello_board_and_lists(self,
+    def iter_lists_and_cards(self,
+                             board_name: str,
+                             filters: TrelloFilters) -> Iterator[TrelloList]:
+        """
+        Split-fetch mode of get_lists_and_cards: the lists of the board are downloaded first,
+        then the cards of the lists that pass the list filters are downloaded concurrently, list by list.
+        Each list is parsed and yielded with its cards as soon as it arrives, in the order of the lists.
+        With a card query the lists are only yielded after all cards are downloaded, as the query selects from all cards.
+        The parsed board cache is not used.
+        """
+        board_id = self._get_board_id(board_name)
+        trello_lists = self._filter_lists(TrelloLists(self._api.get_board_lists(board_id)), filters)
+        list_ids = [trello_list.id for trello_list in trello_lists.get()]
+        cards = []
+        for list_id, list_json in self._api.iter_cards_of_lists(board_id, list_ids):
+            trello_list = trello_lists.get_by_id(list_id)
+            list_cards = TrelloCards(list_json, trello_lists, TrelloChecklists(list_json),
+                                     card_filters=filters.card_filters).get_cards(trello_list)
+            self._webpage_title_service.process_list_checklist_titles(trello_list)
+            if filters.card_query:
+                cards.extend(list_cards)
+            else:
+                yield trello_list
+        if filters.card_query:
+            self._apply_card_query(filters.card_query, trello_lists, filters.card_query.filter(cards), len(cards))
+            yield from trello_lists.get()
+
+    def _get_cached_board_and_lists(self,
                                     name: str,
-                                    filters: TrelloFilters,
-                                    download_comments: bool = False) -> Tuple[TrelloBoard, TrelloLists]:
-        # TODO ASAP Print processing board, similar to "Processing card...)
+                                    filters: TrelloFilters) -> Tuple[TrelloBoard, TrelloLists]:
+        """
+        Same as _get_trello_board_and_lists, but the parsed lists are served from the parsed board cache.
+        The cache is keyed by the fingerprint of the API, which is cheap to get (e.g. the last activity of the board).
+        On a miss, only the lists that pass the list filters are parsed, their URL titles resolved and added to the cache.
+        """
         board_id = self._get_board_id(name)
-        board_json = self._get_board_json(board_id)
+        fingerprint = self._api.get_board_fingerprint(board_id)
+        if fingerprint is None:
+            # The fingerprint would need the whole board JSON, the cache would not save anything
+            return self._get_trello_board_and_lists(name, filters, profile=BoardDetailsProfile.CARDS)
+
+        cached_board = self._parsed_board_cache.load(board_id, fingerprint)
+        board_json = None
+        if cached_board is None:
+            board_json = self._get_board_json(board_id, profile=BoardDetailsProfile.CARDS)
+            all_lists = TrelloLists(board_json)
+        else:
+            all_lists = TrelloLists(None, trello_lists_param=cached_board.lists)
+        trello_lists = self._filter_lists(all_lists, filters)
+
+        try:
+            parsed_list_ids = {l.id for l in trello_lists.get() if cached_board is None or not cached_board.has_cards(l)}
+            if parsed_list_ids:
+                LOG.debug("Parsed board cache miss for %d lists of board: %s", len(parsed_list_ids), name)
+                if board_json is None:
+                    board_json = self._get_board_json(board_id, profile=BoardDetailsProfile.CARDS)
+                # All cards of the lists are cached, the card filters are applied below
+                trello_cards = TrelloCards(board_json, trello_lists, TrelloChecklists(board_json), card_filters=CardFilters.ALL)
+                for trello_list in trello_lists.get():
+                    if trello_list.id in parsed_list_ids:
+                        trello_cards.get_cards(trello_list)
+                        self._webpage_title_service.process_list_checklist_titles(trello_list)
+                self._parsed_board_cache.save(board_id, fingerprint, all_lists.get(), parsed_list_ids, previous=cached_board)
+
+            card_predicate = filters.card_predicate
+            cards = []
+            for trello_list in trello_lists.get():
+                list_cards = trello_list.cards if trello_list.id in parsed_list_ids else cached_board.load_cards(trello_list)
+                if card_predicate is not None:
+                    list_cards = [c for c in list_cards if card_predicate(c)]
+                trello_list.cards = list_cards
+                cards.extend(list_cards)
+        finally:
+            if cached_board is not None:
+                cached_board.close()
+        if filters.card_query:
+            # The cards are unpickled anyway, the query is evaluated on each of them
+            self._apply_card_query(filters.card_query, trello_lists, filters.card_query.filter(cards), len(cards))
+        board = TrelloBoard(board_id, board_json, name, trello_lists.get())
+        return board, trello_lists
 
-        # Parse JSON to objects
-        trello_lists = TrelloLists(board_json)
+    @staticmethod
+    def _filter_lists(trello_lists: TrelloLists, filters: TrelloFilters) -> TrelloLists:
         # TODO ASAP Filtering: This should be more transparently filtered
         if filters.filter_list_names:
             trello_lists = trello_lists.filter_by_list_names(filters.filter_list_names)
         if filters.list_filter:
             trello_lists = trello_lists.filter_by_list_filter(filters.list_filter)
+        return trello_lists
 
-        trello_checklists = TrelloChecklists(board_json)
-        # After this call, TrelloList will contain every card belonging to each list
+    def _get_trello_board_and_lists(self,
+                                    name: str,
+                                    filters: TrelloFilters,
+                                    download_comments: bool = False,
+                                    profile: BoardDetailsProfile = BoardDetailsProfile.FULL) -> Tuple[TrelloBoard, TrelloLists]:
+        # TODO ASAP Print processing board, similar to "Processing card...)
+        board_id = self._get_board_id(name)
+        board_json = self._get_board_json(board_id, profile=profile)
+
+        # Parse JSON to objects
+        trello_lists = self._filter_lists(TrelloLists(board_json), filters)
 
-        trello_cards = TrelloCards(board_json, trello_lists, trello_checklists)
+        trello_checklists = TrelloChecklists(board_json)
+        # After materializing the cards, TrelloList will contain every card belonging to each list that passes the card filters.
+        # Filtered out cards are skipped before any object is created for them.
+        trello_cards = TrelloCards(board_json, trello_lists, trello_checklists, card_filters=filters.card_filters)
+        if filters.card_query:
+            # Only the candidate cards of the query are materialized
+            cards = self._apply_card_query(filters.card_query, trello_lists, filters.card_query.select(trello_cards),
+                                           len(trello_cards))
+        else:
+            cards = trello_cards.all
         if download_comments:
-            self._fetch_comments_for_cards(download_comments, trello_cards)
+            self._fetch_comments_for_cards(download_comments, cards)
 
+        # Card filters are already applied by the parser, TrelloList.cards only contains the filtered cards
         board = TrelloBoard(board_id, board_json, name, trello_lists.get())
-        for list in board.lists:
-            filtered_cards = CardFilterer.filter_cards(list, filters.card_filters)
-            # Overwrite list.cards
-            list.cards = filtered_cards
 
         # Call to fill webpage title and URL
         self._webpage_title_service.process_board_checklist_titles(board)
@@ -92,25 +202,53 @@ class TrelloOperations:
         # TODO ASAP Refactor, does it make sense to return trello_lists
         return board, trello_lists
 
-    def _fetch_comments_for_cards(self, download_comments: bool, trello_cards: TrelloCards):
-        for card in trello_cards.all:
+    @staticmethod
+    def _apply_card_query(card_query: CardQuery, trello_lists: TrelloLists, selected: List[TrelloCard],
+                          num_cards: int) -> List[TrelloCard]:
+        cards_by_list_id: Dict[str, List[TrelloCard]] = defaultdict(list)
+        for card in selected:
+            cards_by_list_id[card.list.id].append(card)
+        # Overwrite list.cards
+        for trello_list in trello_lists.get():
+            trello_list.cards = cards_by_list_id.get(trello_list.id, [])
+        CLI_LOG.info("Card query '%s' matched %d of %d cards", card_query.text, len(selected), num_cards)
+        return selected
+
+    def _fetch_comments_for_cards(self, download_comments: bool, cards: List[TrelloCard]):
+        for card in cards:
             if download_comments:
                 actions_resp_parsed = self._api.get_actions_for_card(card.id)
                 comments: List[TrelloComment] = TrelloObjectParser.parse_comments_for_card(card, actions_resp_parsed)
                 card.comments = comments
 
     def _get_board_id(self, name):
+        if self._board_directory_cache:
+            return self._get_board_id_from_directory(name)
         board_id = self._board_name_to_board_id.get(name)
         if board_id is None:
             board_id = self._api.get_board_id(name)
             self._board_name_to_board_id[name] = board_id
         return board_id
 
-    def _get_board_json(self, board_id):
+    def _get_board_id_from_directory(self, name):
+        # The directory cache keeps the mapping in memory as well, it is checked first so the TTL applies to the daemon too
+        board_id = self._board_directory_cache.get_id(name)
+        if board_id is None:
+            # Expired, or a board created / renamed since the mapping was cached
+            boards = self.get_board_names_and_ids()
+            if name not in boards:
+                raise KeyError(f"Cannot find board with name: {name}. Available boards: {list(boards.keys())}")
+            board_id = boards[name]
+        return board_id
+
+    def _get_board_json(self, board_id, profile: BoardDetailsProfile = BoardDetailsProfile.FULL):
         board_json = self._board_id_to_board_json.get(board_id)
-        if board_json is None:
-            board_json = self._api.get_board_details(board_id)
+        # A board JSON downloaded with all fields serves any profile
+        cached_profile = self._board_id_to_profile.get(board_id, BoardDetailsProfile.FULL)
+        if board_json is None or not cached_profile.includes(profile):
+            board_json = self._api.get_board_details(board_id, profile=profile)
             self._board_id_to_board_json[board_id] = board_json
+            self._board_id_to_profile[board_id] = profile
         return board_json
 
     def cleanup_board(self,
@@ -180,9 +318,10 @@ class TrelloOperations:
         board_dict = {"cards": cards, "lists": lists, "checklists": checklists}
         trello_lists = TrelloLists(board_dict)
         trello_checklists = TrelloChecklists(board_dict)
+        # Materialize the cards, so every list contains its cards
         _ = TrelloCards(board_dict,
                         trello_lists,
-                        trello_checklists)
+                        trello_checklists).all
 
 
         trello_data = self._data_converter.convert_to_output_data(trello_lists)
@@ -207,14 +346,27 @@ class TrelloTitleService:
         # Ensure the cache is used with a context manager if possible, or managed externally
         # to ensure it saves/closes correctly.
 
-        for trello_list in board.lists:
-            for card in trello_list.cards:
-                for checklist in card.checklists:
-                    self._process_checklist_titles(checklist)
+        num_cards = sum(len(trello_list.cards) for trello_list in board.lists)
+        with ProgressReporter("Resolving checklist URL titles", num_cards) as progress:
+            for trello_list in board.lists:
+                for card in trello_list.cards:
+                    for checklist in card.checklists:
+                        self._process_checklist_titles(checklist)
+                    progress.advance(card.name)
 
         # After processing, ensure the cache is saved
         self._cache.save()
 
+    def process_list_checklist_titles(self, trello_list: 'TrelloList'):
+        """
+        Same as process_board_checklist_titles for a single list, without progress reporting.
+        Used when the lists are processed one by one as they are downloaded.
+        """
+        for card in trello_list.cards:
+            for checklist in card.checklists:
+                self._process_checklist_titles(checklist)
+        self._cache.save()
+
     def _process_checklist_titles(self, checklist: 'TrelloChecklist'):
         for item in checklist.items:
             try:
@@ -1,17 +1,16 @@
 import datetime
+import hashlib
 import os
+import shutil
 import sys
 from logging.handlers import TimedRotatingFileHandler
-from copy import copy
 from os.path import expanduser
 from typing import Any
 
 from pythoncommons.constants import ExecutionMode
-from pythoncommons.logging_setup import SimpleLoggingSetupConfig, SimpleLoggingSetup, DEFAULT_FORMAT
-from pythoncommons.project_utils import ProjectUtils, ProjectRootDeterminationStrategy
 
 from trello_backup.display.console import CliLogger
-from trello_backup.constants import PROJECT_NAME
+from trello_backup.constants import PROJECT_NAME, LOG_FORMAT
 
 import logging
 LOG = logging.getLogger(__name__)
@@ -59,7 +58,7 @@ class LoggingUtils:
                                 debug: bool = False,
                                 dry_run: bool = False):
         level = logging.DEBUG if debug else logging.INFO
-        fmt = DEFAULT_FORMAT
+        fmt = LOG_FORMAT
         if dry_run:
             fmt = f"[DRY-RUN] {fmt}"
         logging.basicConfig(format=fmt, level=level)
@@ -76,13 +75,16 @@ class LoggingUtils:
     @staticmethod
     def configure_file_logging(ctx, level, session_dir):
         root_logger = logging.getLogger()
-        handlers = copy(root_logger.handlers)
         file_handler = LoggingUtils._create_file_handler(session_dir, level, fname="trello-session")
+        # The daemon configures file logging for each command, only the session log of the latest command is kept
+        handlers = [h for h in root_logger.handlers
+                    if not (isinstance(h, logging.FileHandler)
+                            and os.path.basename(h.baseFilename) == os.path.basename(file_handler.baseFilename))]
         file_handler.formatter = None
         LOG.info("Logging to file: %s", file_handler.baseFilename)
         handlers.append(file_handler)
 
-        fmt = DEFAULT_FORMAT
+        fmt = LOG_FORMAT
         if ctx.dry_run:
             fmt = f"[DRY-RUN] {fmt}"
         logging.basicConfig(force=True, format=fmt, level=level, handlers=handlers)
@@ -91,6 +93,8 @@ class LoggingUtils:
     def project_setup(ctx, execution_mode: ExecutionMode = ExecutionMode.PRODUCTION,
                       add_console_handler=False,
                       sanity_check_handlers=False):
+        from pythoncommons.logging_setup import SimpleLoggingSetupConfig, SimpleLoggingSetup
+        from pythoncommons.project_utils import ProjectUtils, ProjectRootDeterminationStrategy
         strategy = None
         if execution_mode == ExecutionMode.PRODUCTION:
             strategy = ProjectRootDeterminationStrategy.SYS_PATH
@@ -103,7 +107,7 @@ class LoggingUtils:
         ProjectUtils.FORCE_SITE_PACKAGES_IN_PATH_NAME = False
         _ = ProjectUtils.get_output_basedir(PROJECT_NAME, basedir=expanduser("~"))
 
-        fmt = DEFAULT_FORMAT
+        fmt = LOG_FORMAT
         if ctx.dry_run:
             fmt = f"[DRY-RUN] {fmt}"
         logging_config: SimpleLoggingSetupConfig = SimpleLoggingSetup.init_logger(
@@ -175,4 +179,33 @@ class ObjectUtils:
     def value_check_file_path(path: str):
         if os.path.exists(path):
             return True
-        raise ValueError(f"File does not exist: {path}")
\ No newline at end of file
+        raise ValueError(f"File does not exist: {path}")
+
+class FsUtils:
+    @staticmethod
+    def link_or_copy(src: str, dst: str):
+        """
+        Makes an existing file available under a new path, hard linking it if possible.
+        """
+        if os.path.abspath(src) == os.path.abspath(dst):
+            return
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        if os.path.exists(dst):
+            os.remove(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+
+class HashUtils:
+    @staticmethod
+    def fingerprint(*parts) -> str:
+        """
+        SHA-256 of the repr of the parts, the parts should have a deterministic repr (e.g. dataclasses, dicts, lists).
+        """
+        h = hashlib.sha256()
+        for part in parts:
+            h.update(repr(part).encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()